@@ -0,0 +1,523 @@
+import calendar
+import logging
+import logging.handlers
+import os
+import re
+import secrets
+import threading
+import time
+import weakref
+from collections.abc import Iterator
+from pathlib import Path
+
+import click
+
+try:
+    import fcntl
+except ImportError:  # Windows: appends are still whole records, but not locked
+    fcntl = None
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LOG_FILE = Path("logs") / "audit.log"
+DEFAULT_MAX_BYTES = 50 * 1024**2
+DEFAULT_BACKUP_COUNT = 10
+# Buffered records are written once they reach this size, when a record is a
+# warning or worse, or when the oldest has waited this many seconds
+DEFAULT_BUFFER_SIZE = 64 * 1024
+DEFAULT_FLUSH_INTERVAL = 1.0
+# Sidecar files next to the shared log: an exclusive lock taken around every write
+# and rotation, and an index of the byte ranges each run wrote to the live log
+LOCK_SUFFIX = ".lock"
+RUN_INDEX_SUFFIX = ".runs"
+RUN_TIMESTAMP_FORMAT = "%Y%m%dT%H%M%SZ"
+# Start of each record written with the audit log format, capturing the run ID
+RECORD_PATTERN = re.compile(r"^\d{4}-\d\d-\d\d \d\d:\d\d:\d\d UTC - (\S+) - ")
+
+
+def compress_file(source: str, destination: str) -> None:
+    """
+    Gzip `source` to `destination`, then delete `source`.
+    """
+    # Imported here so they are only loaded once a segment is rotated
+    import gzip
+    import shutil
+
+    with open(source, "rb") as in_file, gzip.open(destination, "wb") as out_file:
+        shutil.copyfileobj(in_file, out_file)
+    os.remove(source)
+
+
+class GzipRotatorMixin:
+    """
+    Mixin for rotating file handlers that gzips rotated log segments in a background
+    thread, so logging is not blocked while a large segment is compressed.
+
+    The live log file is renamed out of the way immediately on rollover, then
+    compressed to `<name>.gz`. Only one compression runs at a time: a rollover waits
+    for the previous segment to finish compressing before starting another.
+    """
+
+    _compression_thread = None
+
+    def setup_gzip_rotation(self) -> None:
+        self.namer = self.gzip_namer
+        self.rotator = self.gzip_rotator
+
+    @staticmethod
+    def gzip_namer(name: str) -> str:
+        return f"{name}.gz"
+
+    def doRollover(self) -> None:
+        # Finish the previous segment before rotated segments are renamed
+        self.wait_for_compression()
+        super().doRollover()
+
+    def gzip_rotator(self, source: str, destination: str) -> None:
+        pending = f"{destination.removesuffix('.gz')}.{time.time_ns()}.pending"
+        os.rename(source, pending)
+        self._compression_thread = threading.Thread(
+            target=compress_file,
+            args=(pending, destination),
+            name="sweeper-log-compression",
+            daemon=False,
+        )
+        self._compression_thread.start()
+
+    def wait_for_compression(self) -> None:
+        if self._compression_thread is not None:
+            self._compression_thread.join()
+            self._compression_thread = None
+
+    def close(self) -> None:
+        super().close()
+        self.wait_for_compression()
+
+
+class GzipRotatingFileHandler(GzipRotatorMixin, logging.handlers.RotatingFileHandler):
+    """
+    Log file handler rotating once the file reaches `maxBytes`, keeping
+    `backupCount` gzipped segments.
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.setup_gzip_rotation()
+
+
+class GzipTimedRotatingFileHandler(
+    GzipRotatorMixin, logging.handlers.TimedRotatingFileHandler
+):
+    """
+    Log file handler rotating at a time interval (e.g. "midnight"), keeping
+    `backupCount` gzipped segments.
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.setup_gzip_rotation()
+
+
+def get_run_id() -> str:
+    """
+    Return an ID for this run: its UTC start time, process ID and a random suffix,
+    e.g. 20250730T224505Z-4242-9f1c.
+    """
+    timestamp = time.strftime(RUN_TIMESTAMP_FORMAT, time.gmtime())
+    return f"{timestamp}-{os.getpid()}-{secrets.token_hex(2)}"
+
+
+def get_run_start(run_id: str) -> int:
+    """
+    Return the UTC start time of a run, in seconds since the epoch, from its ID.
+    """
+    try:
+        return calendar.timegm(
+            time.strptime(run_id.split("-")[0], RUN_TIMESTAMP_FORMAT)
+        )
+    except ValueError:
+        raise ValueError(f"'{run_id}' is not a valid run ID.")
+
+
+def get_run_log_file(directory: Path, run_id: str | None = None) -> Path:
+    """
+    Return a log file path unique to this run, named by its run ID.
+    """
+    return Path(directory) / f"audit-{run_id or get_run_id()}.log"
+
+
+class RunIdFilter(logging.Filter):
+    """
+    Tag every record with the ID of the run that logged it, as `record.run_id`.
+    """
+
+    def __init__(self, run_id: str) -> None:
+        super().__init__()
+        self.run_id = run_id
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.run_id = self.run_id
+        return True
+
+
+class AuditLogLock:
+    """
+    Exclusive lock shared by every process writing to a log file. It is held on a
+    `<log>.lock` file next to the log rather than the log itself, so it is the same
+    lock before and after the log is rotated.
+    """
+
+    def __init__(self, log_file: str) -> None:
+        self.path = f"{log_file}{LOCK_SUFFIX}"
+        self._fd = None
+
+    def __enter__(self) -> "AuditLogLock":
+        if self._fd is None:
+            self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        if fcntl is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        if fcntl is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def close(self) -> None:
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+
+# Open buffered handlers, held weakly so that handlers can still be collected once
+# they're no longer used
+BUFFERED_HANDLERS = weakref.WeakSet()
+
+
+def discard_buffers_after_fork() -> None:
+    """
+    Discard the records buffered by every open `BufferedAuditHandler` in a forked
+    child, which must not write out records its parent will write too.
+    """
+    for handler in list(BUFFERED_HANDLERS):
+        handler._discard_buffer()
+
+
+# Registered once for every handler, as hooks can't be unregistered
+if hasattr(os, "register_at_fork"):  # Not available on Windows, which can't fork
+    os.register_at_fork(after_in_child=discard_buffers_after_fork)
+
+
+class BufferedAuditHandler(logging.Handler):
+    """
+    Buffer formatted records in memory and append them to a log file shared with
+    other processes as whole blocks, so records from concurrent runs never
+    interleave.
+
+    Each block is written under `AuditLogLock`, which also covers rotation: the
+    `target` handler is only asked to roll over while the lock is held, and a
+    handler that finds the log rotated by another process reopens it first. The
+    byte range of each block is appended to a `<log>.runs` index, so one run's
+    records can be read back without scanning the log (see `iter_run_records`).
+
+    Arguments:
+        - target (FileHandler):   Rotating file handler for the shared log, e.g.
+                                  `GzipRotatingFileHandler`. Only its stream and
+                                  rotation are used: records are formatted by this
+                                  handler.
+        - run_id (str):           ID of this run, from `get_run_id`
+        - buffer_size (int):      Write the buffer once it holds this many bytes
+        - flush_interval (float): Write the buffer once its oldest record has
+                                  waited this many seconds
+    """
+
+    def __init__(
+        self,
+        target: logging.FileHandler,
+        run_id: str,
+        buffer_size: int = DEFAULT_BUFFER_SIZE,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+    ) -> None:
+        super().__init__()
+        self.target = target
+        self.run_id = run_id
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
+        self.baseFilename = target.baseFilename
+        self.index_file = f"{target.baseFilename}{RUN_INDEX_SUFFIX}"
+        self._log_lock = AuditLogLock(target.baseFilename)
+        self._discard_buffer()
+        BUFFERED_HANDLERS.add(self)
+
+    def _discard_buffer(self) -> None:
+        self._buffer = []
+        self._buffered = 0
+        self._buffered_since = None
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            text = f"{self.format(record)}\n"
+        except Exception:
+            self.handleError(record)
+            return
+        self._buffer.append(text)
+        self._buffered += len(text)
+        if self._buffered_since is None:
+            self._buffered_since = time.monotonic()
+        if (
+            self._buffered >= self.buffer_size
+            or record.levelno >= logging.WARNING
+            or time.monotonic() - self._buffered_since >= self.flush_interval
+        ):
+            self._write_buffer()
+
+    def flush(self) -> None:
+        self.acquire()
+        try:
+            self._write_buffer()
+        finally:
+            self.release()
+
+    def _reopen_if_rotated(self) -> None:
+        stream = self.target.stream
+        try:
+            current = os.stat(self.baseFilename)
+        except FileNotFoundError:
+            current = None
+        if (
+            stream is not None
+            and current is not None
+            and os.path.samestat(current, os.fstat(stream.fileno()))
+        ):
+            return
+        if stream is not None:
+            stream.close()
+        self.target.stream = self.target._open()
+        if isinstance(self.target, logging.handlers.TimedRotatingFileHandler):
+            # The process that rotated the log already rolled this interval over
+            self.target.rolloverAt = self.target.computeRollover(time.time())
+
+    def _write_buffer(self) -> None:
+        if not self._buffer:
+            return
+        block = logging.makeLogRecord({"msg": "".join(self._buffer)})
+        self._discard_buffer()
+        try:
+            with self._log_lock:
+                self._reopen_if_rotated()
+                if self.target.shouldRollover(block):
+                    self.target.doRollover()
+                    # Finish compressing before another process can rotate again
+                    self.target.wait_for_compression()
+                    open(self.index_file, "w").close()
+                stream = self.target.stream
+                stream.flush()
+                start = os.fstat(stream.fileno()).st_size
+                stream.write(block.msg)
+                stream.flush()
+                length = os.fstat(stream.fileno()).st_size - start
+                with open(self.index_file, "a") as index_file:
+                    index_file.write(f"{self.run_id}\t{start}\t{length}\n")
+        except Exception:
+            self.handleError(block)
+
+    def close(self) -> None:
+        self.acquire()
+        try:
+            self._write_buffer()
+            self.target.close()
+            self._log_lock.close()
+        finally:
+            self.release()
+        BUFFERED_HANDLERS.discard(self)
+        super().close()
+
+
+def get_log_handler(
+    log_file: Path = DEFAULT_LOG_FILE,
+    max_bytes: int = DEFAULT_MAX_BYTES,
+    backup_count: int = DEFAULT_BACKUP_COUNT,
+    rotate_when: str | None = None,
+    per_run: bool = False,
+    run_id: str | None = None,
+) -> logging.Handler:
+    """
+    Build the audit log file handler, tagging each record with the run ID.
+
+    The shared log is written through `BufferedAuditHandler`, so concurrent runs
+    can append to it safely.
+
+    Arguments:
+        - log_file (Path):    Path to the audit log file
+        - max_bytes (int):    Rotate the log once it reaches this size. 0 disables
+                              size-based rotation. Ignored if `rotate_when` is set.
+        - backup_count (int): Number of rotated, gzipped segments to keep
+        - rotate_when (str):  If set, rotate at this interval instead of by size, e.g.
+                              "midnight" or "H". See `TimedRotatingFileHandler`.
+        - per_run (bool):     If True, write to a new file for this run only, in a
+                              runs directory next to `log_file`, without rotation
+        - run_id (str):       ID of this run. Default is a new ID from `get_run_id`.
+    """
+    run_id = run_id or get_run_id()
+    if per_run:
+        log_file = get_run_log_file(Path(log_file).parent / "runs", run_id)
+    Path(log_file).parent.mkdir(parents=True, exist_ok=True)
+
+    if per_run:
+        handler = logging.FileHandler(filename=log_file)
+    elif rotate_when:
+        handler = BufferedAuditHandler(
+            GzipTimedRotatingFileHandler(
+                filename=log_file, when=rotate_when, backupCount=backup_count, utc=True
+            ),
+            run_id=run_id,
+        )
+    else:
+        handler = BufferedAuditHandler(
+            GzipRotatingFileHandler(
+                filename=log_file, maxBytes=max_bytes, backupCount=backup_count
+            ),
+            run_id=run_id,
+        )
+    handler.addFilter(RunIdFilter(run_id))
+    return handler
+
+
+def read_run_index(log_file: Path, run_id: str) -> list[tuple[int, int]]:
+    """
+    Return the (offset, length) byte ranges a run wrote to the live log, from its
+    `<log>.runs` index.
+    """
+    ranges = []
+    try:
+        with open(f"{log_file}{RUN_INDEX_SUFFIX}") as index_file:
+            for line in index_file:
+                entry_run_id, offset, length = line.rstrip("\n").split("\t")
+                if entry_run_id == run_id:
+                    ranges.append((int(offset), int(length)))
+    except FileNotFoundError:
+        pass
+    return ranges
+
+
+def list_runs(log_file: Path) -> dict[str, int]:
+    """
+    Return the IDs of the runs in the live log, from its `<log>.runs` index, with
+    the number of bytes each wrote, in the order they first wrote to it.
+    """
+    runs = {}
+    try:
+        with open(f"{log_file}{RUN_INDEX_SUFFIX}") as index_file:
+            for line in index_file:
+                run_id, _, length = line.rstrip("\n").split("\t")
+                runs[run_id] = runs.get(run_id, 0) + int(length)
+    except FileNotFoundError:
+        pass
+    return runs
+
+
+def get_rotated_segments(log_file: Path) -> list[Path]:
+    """
+    Return the rotated segments of a log file, oldest first.
+    """
+    log_file = Path(log_file)
+    segments = [
+        path
+        for path in log_file.parent.glob(f"{log_file.name}.*")
+        if path.suffix not in {LOCK_SUFFIX, RUN_INDEX_SUFFIX, ".pending"}
+    ]
+    return sorted(segments, key=lambda path: path.stat().st_mtime)
+
+
+def iter_segment_records(segment: Path, run_id: str) -> Iterator[str]:
+    """
+    Scan a rotated log segment, yielding the records logged by a run. Records
+    spanning several lines (e.g. a results table) are yielded whole.
+    """
+    import gzip
+
+    opener = gzip.open if segment.suffix == ".gz" else open
+    with opener(segment, "rt", encoding="utf-8", errors="replace") as in_file:
+        matched = False
+        for line in in_file:
+            match = RECORD_PATTERN.match(line)
+            if match:
+                matched = match.group(1) == run_id
+            if matched:
+                yield line
+
+
+def iter_run_records(log_file: Path, run_id: str) -> Iterator[str]:
+    """
+    Yield the audit log lines written by one run, in the order they were written.
+
+    A run's own file from `--log-per-run` is read if there is one. Otherwise, the
+    run's blocks in the live log are read directly at the offsets in the
+    `<log>.runs` index. Rotated segments are only scanned if they were rotated
+    after the run started.
+
+    Arguments:
+        - log_file (Path):  Path to the shared audit log, e.g. logs/audit.log
+        - run_id (str):     ID of the run, as logged with each record
+    """
+    log_file = Path(log_file)
+    run_log_file = get_run_log_file(log_file.parent / "runs", run_id)
+    if run_log_file.exists():
+        with open(run_log_file, encoding="utf-8", errors="replace") as in_file:
+            yield from in_file
+        return
+
+    # Segments are never rotated before the run started, less a second for clock
+    # resolution
+    start = get_run_start(run_id) - 1
+    for segment in get_rotated_segments(log_file):
+        if segment.stat().st_mtime >= start:
+            yield from iter_segment_records(segment, run_id)
+
+    ranges = read_run_index(log_file, run_id)
+    if ranges:
+        with open(log_file, "rb") as in_file:
+            for offset, length in ranges:
+                in_file.seek(offset)
+                text = in_file.read(length).decode("utf-8", errors="replace")
+                yield from text.splitlines(keepends=True)
+
+
+@click.command(
+    name="audit",
+    epilog="""EXAMPLES
+
+List the runs in the live audit log:
+
+sweeper audit
+
+Show the audit log records of one run:
+
+sweeper audit 20250730T224505Z-4242-9f1c
+""",
+)
+@click.argument("run_id", required=False)
+def audit_command(*, run_id: str | None = None) -> None:
+    """
+    Show a run's audit log records, or list the runs logged.
+    """
+    logger.debug("START: Running audit")
+    log_file = Path(click.get_current_context().find_root().params["log_file"])
+    # Write this run's own records first, so they are listed too
+    for handler in logging.getLogger().handlers:
+        handler.flush()
+
+    if run_id is None:
+        for listed_run_id, size in list_runs(log_file).items():
+            click.echo(f"{listed_run_id}  {size} bytes")
+        return
+
+    try:
+        found = False
+        for line in iter_run_records(log_file, run_id):
+            found = True
+            click.echo(line, nl=False)
+    except ValueError as error:
+        raise click.UsageError(str(error))
+    if not found:
+        raise click.ClickException(f"No audit log records found for run {run_id}")
@@ -0,0 +1,360 @@
+import asyncio
+import json
+import logging
+import threading
+from collections import deque
+from itertools import islice
+
+
+logger = logging.getLogger(__name__)
+
+# Number of recent events kept for viewers joining or reconnecting mid-draw.
+# Viewers that fall further behind than this skip ahead to the oldest kept event.
+DEFAULT_HISTORY = 1000
+# Seconds a viewer's socket may refuse writes before the viewer is dropped
+DEFAULT_WRITE_TIMEOUT = 10.0
+# Seconds to wait for viewers to receive the last events when the draw ends
+DEFAULT_CLOSE_TIMEOUT = 2.0
+# Seconds between keep-alive comments, so idle connections aren't closed by proxies
+KEEPALIVE_INTERVAL = 15.0
+MAX_REQUEST_HEADERS = 100
+
+VIEWER_PAGE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>Sweeper live draw</title>
+<style>
+  body { font-family: system-ui, sans-serif; margin: 0; padding: 2rem;
+         background: #111; color: #eee; text-align: center; }
+  #status { color: #999; }
+  #drawing { font-size: 2rem; min-height: 2.5rem; margin-top: 2rem; }
+  #reveal { font-size: 3rem; font-weight: bold; min-height: 4rem; margin: 1rem 0 2rem; }
+  ol { display: inline-block; text-align: left; font-size: 1.2rem; color: #bbb; }
+</style>
+</head>
+<body>
+<h1>Live draw</h1>
+<div id="status">Connecting...</div>
+<div id="drawing"></div>
+<div id="reveal"></div>
+<ol id="rounds" reversed></ol>
+<script>
+const status = document.getElementById("status");
+const drawing = document.getElementById("drawing");
+const reveal = document.getElementById("reveal");
+const rounds = document.getElementById("rounds");
+const source = new EventSource("events");
+
+function describe(round) {
+  return round.draw_order === "picks"
+    ? `${round.pick} ... drawn by ... ${round.entrant}`
+    : `${round.entrant} ... draws ... ${round.pick}`;
+}
+source.onopen = () => { status.textContent = "Connected"; };
+source.onerror = () => { status.textContent = "Reconnecting..."; };
+source.addEventListener("start", (event) => {
+  const start = JSON.parse(event.data);
+  status.textContent = `Drawing ${start.total} rounds`;
+  rounds.replaceChildren();
+});
+source.addEventListener("drawing", (event) => {
+  const round = JSON.parse(event.data);
+  const label = round.draw_order === "picks" ? "Pick" : "Entrant";
+  drawing.textContent = `${label} ${round.round}: ${round.drawer}`;
+  reveal.textContent = "Drawing...";
+});
+source.addEventListener("round", (event) => {
+  const round = JSON.parse(event.data);
+  drawing.textContent = "";
+  reveal.textContent = describe(round);
+  const item = document.createElement("li");
+  item.textContent = describe(round);
+  rounds.prepend(item);
+});
+source.addEventListener("complete", (event) => {
+  const complete = JSON.parse(event.data);
+  status.textContent = `Draw complete: ${complete.rounds} rounds`;
+  drawing.textContent = "";
+  source.close();
+});
+</script>
+</body>
+</html>
+"""
+
+
+def format_event(event_id: int, event: str, data: dict) -> bytes:
+    """
+    Encode an event in the Server-Sent Events wire format.
+    """
+    return f"id: {event_id}\nevent: {event}\ndata: {json.dumps(data)}\n\n".encode()
+
+
+def format_response(status: str, content_type: str, body: bytes) -> bytes:
+    headers = (
+        f"HTTP/1.1 {status}\r\n"
+        f"Content-Type: {content_type}\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        "Connection: close\r\n\r\n"
+    )
+    return headers.encode() + body
+
+
+class DrawBroadcast:
+    """
+    Broadcast a draw live to browser viewers with Server-Sent Events.
+
+    An asyncio server runs on a background thread, serving a minimal viewer page at
+    "/" and the event stream at "/events". The draw publishes events from its own
+    thread without ever waiting for viewers: each event is added to a bounded
+    history, and each viewer is sent the history from its own position, waiting
+    for its socket to drain before sending more. A slow viewer only falls behind,
+    skipping ahead if it falls out of the history, and is dropped if its socket
+    stops draining. Viewers that join late or reconnect (browsers resume with the
+    Last-Event-ID header) catch up from the history.
+
+    Example:
+        with DrawBroadcast("0.0.0.0", 8000) as broadcast:
+            broadcast.publish("round", {"entrant": "Harold", "pick": "Bengals"})
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        history: int = DEFAULT_HISTORY,
+        write_timeout: float = DEFAULT_WRITE_TIMEOUT,
+    ) -> None:
+        """
+        Arguments:
+            - host (str):            Host to listen on, e.g. 0.0.0.0 for all
+                                     interfaces
+            - port (int):            Port to listen on, or 0 for any free port
+            - history (int):         Number of recent events kept for viewers to
+                                     catch up from
+            - write_timeout (float): Seconds a viewer may block writes before it
+                                     is dropped
+        """
+        self.host = host
+        self.port = port
+        self.write_timeout = write_timeout
+        self.events = deque(maxlen=history)
+        # ID the next published event will get
+        self.next_id = 1
+        self.viewers = 0
+        self.closed = False
+        # Set on the server thread once every event published before close() has
+        # been added, so viewers don't stop before the last of them
+        self._stopping = False
+        self._loop = None
+        self._server = None
+        self._changed = None
+        self._thread = None
+        self._connections = set()
+
+    def __enter__(self) -> "DrawBroadcast":
+        if self._thread is None:
+            self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}/"
+
+    def start(self) -> None:
+        """
+        Start the server on a background thread, returning once it is listening.
+        Raises OSError if the address can't be bound.
+        """
+        ready = threading.Event()
+        errors = []
+
+        def run() -> None:
+            self._loop = asyncio.new_event_loop()
+            try:
+                self._loop.run_until_complete(self._start_server())
+            except OSError as error:
+                errors.append(error)
+                self._loop.close()
+                self._loop = None
+                ready.set()
+                return
+            ready.set()
+            try:
+                self._loop.run_forever()
+            finally:
+                self._loop.close()
+
+        self._thread = threading.Thread(
+            target=run, name="sweeper-broadcast", daemon=True
+        )
+        self._thread.start()
+        ready.wait()
+        if errors:
+            raise errors[0]
+        logger.info(f"Broadcasting draw at {self.url}")
+
+    async def _start_server(self) -> None:
+        self._changed = asyncio.Event()
+        self._server = await asyncio.start_server(
+            self._handle_connection, self.host, self.port
+        )
+        # Report the port chosen if 0 was passed
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    def publish(self, event: str, data: dict) -> None:
+        """
+        Send an event to every viewer. Safe to call from any thread, and never
+        blocks on viewers.
+        """
+        if self.closed:
+            return
+        self._loop.call_soon_threadsafe(self._add_event, event, data)
+
+    def publish_start(self, total: int, draw_order: str) -> None:
+        self.publish("start", {"total": total, "draw_order": draw_order})
+
+    def publish_drawing(self, index: int, drawer: str, draw_order: str) -> None:
+        """
+        Announce whose turn it is to draw, before the round is revealed.
+        """
+        self.publish(
+            "drawing", {"round": index + 1, "drawer": drawer, "draw_order": draw_order}
+        )
+
+    def publish_round(
+        self, index: int, entrant: str, pick: str, draw_order: str
+    ) -> None:
+        self.publish(
+            "round",
+            {
+                "round": index + 1,
+                "entrant": entrant,
+                "pick": pick,
+                "draw_order": draw_order,
+            },
+        )
+
+    def publish_complete(self, rounds: int, undrawn: int) -> None:
+        self.publish("complete", {"rounds": rounds, "undrawn": undrawn})
+
+    def _add_event(self, event: str, data: dict) -> None:
+        self.events.append((self.next_id, format_event(self.next_id, event, data)))
+        self.next_id += 1
+        # Wake every viewer waiting for events, and give them a new event to wait on
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    def close(self, timeout: float = DEFAULT_CLOSE_TIMEOUT) -> None:
+        """
+        Give viewers up to `timeout` seconds to receive the remaining events, then
+        stop the server.
+        """
+        if self.closed or self._loop is None:
+            return
+        self.closed = True
+        future = asyncio.run_coroutine_threadsafe(self._shutdown(timeout), self._loop)
+        future.result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        logger.debug("Broadcast server stopped")
+
+    async def _shutdown(self, timeout: float) -> None:
+        self._server.close()
+        self._stopping = True
+        self._changed.set()
+        if self._connections:
+            await asyncio.wait(list(self._connections), timeout=timeout)
+        for task in self._connections:
+            task.cancel()
+        await asyncio.gather(*self._connections, return_exceptions=True)
+
+    async def _handle_connection(self, reader, writer) -> None:
+        task = asyncio.current_task()
+        self._connections.add(task)
+        try:
+            request = await asyncio.wait_for(
+                read_request(reader), timeout=self.write_timeout
+            )
+            if request is None:
+                return
+            path, headers = request
+            if path == "/":
+                writer.write(
+                    format_response(
+                        "200 OK", "text/html; charset=utf-8", VIEWER_PAGE.encode()
+                    )
+                )
+                await writer.drain()
+            elif path == "/events":
+                await self._stream_events(writer, headers.get("last-event-id"))
+            else:
+                writer.write(
+                    format_response("404 Not Found", "text/plain", b"Not found")
+                )
+                await writer.drain()
+        except (asyncio.TimeoutError, ConnectionError) as error:
+            logger.debug(f"Dropping viewer: {error!r}")
+        finally:
+            self._connections.discard(task)
+            writer.close()
+
+    async def _stream_events(self, writer, last_event_id: str | None) -> None:
+        writer.write(
+            b"HTTP/1.1 200 OK\r\n"
+            b"Content-Type: text/event-stream\r\n"
+            b"Cache-Control: no-cache\r\n"
+            b"Connection: keep-alive\r\n\r\n"
+        )
+        position = int(last_event_id) + 1 if (last_event_id or "").isdigit() else 1
+        self.viewers += 1
+        logger.debug(f"Viewer connected from event {position} ({self.viewers} viewers)")
+        try:
+            while True:
+                changed = self._changed
+                while position < self.next_id:
+                    # A viewer that fell out of the history skips ahead to what is
+                    # left of it
+                    oldest = self.events[0][0]
+                    position = max(position, oldest)
+                    pending = islice(self.events, position - oldest, None)
+                    writer.write(b"".join(message for _, message in pending))
+                    position = self.next_id
+                    # Wait for the socket to take more, so a slow viewer holds at
+                    # most one history of events in memory
+                    await asyncio.wait_for(writer.drain(), timeout=self.write_timeout)
+                if self._stopping and position >= self.next_id:
+                    return
+                try:
+                    await asyncio.wait_for(changed.wait(), timeout=KEEPALIVE_INTERVAL)
+                except asyncio.TimeoutError:
+                    writer.write(b": keep-alive\n\n")
+                    await asyncio.wait_for(writer.drain(), timeout=self.write_timeout)
+        finally:
+            self.viewers -= 1
+
+
+async def read_request(reader) -> tuple[str, dict[str, str]] | None:
+    """
+    Read an HTTP request line and headers, returning the path and lowercased
+    headers, or None if the request is empty or malformed.
+    """
+    request_line = (await reader.readline()).decode("latin-1").split()
+    if len(request_line) != 3:
+        return None
+    method, target, _ = request_line
+    headers = {}
+    for _ in range(MAX_REQUEST_HEADERS):
+        line = (await reader.readline()).decode("latin-1").strip()
+        if not line:
+            break
+        name, _, value = line.partition(":")
+        headers[name.strip().lower()] = value.strip()
+    if method != "GET":
+        return None
+    return target.split("?", 1)[0], headers
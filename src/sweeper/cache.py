@@ -0,0 +1,144 @@
+import hashlib
+import json
+import logging
+import mmap
+import os
+import threading
+from pathlib import Path
+
+from sweeper.column import StringColumn
+
+
+logger = logging.getLogger(__name__)
+
+CACHE_SUFFIX = ".col"
+HASH_CHUNK_SIZE = 1024 * 1024
+DEFAULT_MAX_SIZE = 1024**3
+
+
+def hash_file(filepath: Path) -> str:
+    """
+    Return a hex digest of the contents of a file, read in chunks.
+    """
+    digest = hashlib.blake2b(digest_size=20)
+    with open(filepath, "rb") as in_file:
+        while chunk := in_file.read(HASH_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class InputCache:
+    """
+    On-disk cache of parsed and validated input columns.
+
+    Each entry is a serialised `StringColumn` keyed by the input file's path, size,
+    modification time and content hash, plus the column and normalisation options
+    used to load it. A cache hit skips parsing entirely: the entry is memory-mapped
+    and read without copying. Entries are evicted least recently used first once
+    the cache grows past `max_size` bytes.
+
+    Columns returned by `get` stay readable until the cache is closed, e.g. by
+    using it as a context manager:
+
+        with InputCache(".sweeper-cache") as cache:
+            entrants = cache.get(key)
+    """
+
+    def __init__(self, directory: Path, max_size: int = DEFAULT_MAX_SIZE) -> None:
+        self.directory = Path(directory)
+        self.max_size = max_size
+        self.directory.mkdir(parents=True, exist_ok=True)
+        # Columns returned by `get` and the memory maps behind them
+        self._mapped = []
+
+    def __enter__(self) -> "InputCache":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Release the columns returned by `get` and close their memory maps.
+        """
+        while self._mapped:
+            column, buffer = self._mapped.pop()
+            column.release()
+            buffer.close()
+
+    def key(self, filepath: Path, column: str | None = None, **options) -> str:
+        """
+        Build the cache key for a file fingerprint, column and loading options.
+        """
+        filepath = Path(filepath).resolve()
+        stat = filepath.stat()
+        fingerprint = [
+            str(filepath),
+            stat.st_size,
+            stat.st_mtime_ns,
+            hash_file(filepath),
+            column,
+            sorted(options.items()),
+        ]
+        return hashlib.sha256(json.dumps(fingerprint).encode("utf-8")).hexdigest()
+
+    def path(self, key: str) -> Path:
+        return self.directory / f"{key}{CACHE_SUFFIX}"
+
+    def get(self, key: str) -> StringColumn | None:
+        """
+        Return the cached column for `key`, or None on a cache miss.
+        """
+        path = self.path(key)
+        try:
+            with open(path, "rb") as cache_file:
+                buffer = mmap.mmap(cache_file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (FileNotFoundError, ValueError):
+            # ValueError is raised when mapping an empty file
+            logger.debug(f"Cache miss for {key}")
+            return None
+
+        try:
+            column = StringColumn.from_buffer(buffer)
+        except ValueError:
+            logger.warning(f"Ignoring corrupt cache entry {path}")
+            buffer.close()
+            return None
+        self._mapped.append((column, buffer))
+
+        # Mark as recently used for LRU eviction
+        os.utime(path)
+        logger.debug(f"Cache hit for {key}: {column!r}")
+        return column
+
+    def put(self, key: str, column: StringColumn) -> None:
+        """
+        Store a column under `key`, then evict old entries if over the size cap.
+        """
+        path = self.path(key)
+        temp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(temp_path, "wb") as cache_file:
+            cache_file.write(column.to_bytes())
+        os.replace(temp_path, path)
+        logger.debug(f"Cached {column!r} as {key}")
+        self.evict()
+
+    def evict(self) -> None:
+        """
+        Delete least recently used entries until the cache fits within `max_size`.
+        """
+        entries = []
+        for path in self.directory.glob(f"*{CACHE_SUFFIX}"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, path))
+
+        total_size = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total_size <= self.max_size:
+                break
+            logger.debug(f"Evicting cache entry {path}")
+            path.unlink(missing_ok=True)
+            total_size -= size
@@ -0,0 +1,175 @@
+import struct
+from array import array
+from collections.abc import Iterable, Iterator, Sequence
+
+
+MAGIC = b"SWPCOL1\x00"
+# Magic, entry count, byte length of string data
+HEADER = struct.Struct(f"<{len(MAGIC)}sQQ")
+
+
+class StringColumn(Sequence):
+    """
+    Compact, immutable column of strings.
+
+    Strings are stored back to back in a single UTF-8 buffer, with an array of
+    `len(column) + 1` offsets marking where each one starts and ends. This uses far
+    less memory than a list of `str` objects for large inputs, and can be written
+    to and read from bytes without parsing.
+    """
+
+    __slots__ = ("_data", "_offsets")
+
+    def __init__(self, data: bytes | memoryview, offsets: array | memoryview) -> None:
+        self._data = data
+        self._offsets = offsets
+
+    @classmethod
+    def from_strings(cls, strings: Iterable[str]) -> "StringColumn":
+        """
+        Build a column from an iterable of strings.
+        """
+        builder = StringColumnBuilder()
+        for string in strings:
+            builder.append(string)
+        return builder.build()
+
+    @classmethod
+    def concat(cls, columns: Iterable["StringColumn"]) -> "StringColumn":
+        """
+        Join columns end to end into a single column, in the order given.
+        """
+        data = bytearray()
+        offsets = array("Q", [0])
+        for column in columns:
+            start, end = column._offsets[0], column._offsets[-1]
+            shift = len(data) - start
+            data += column._data[start:end]
+            offsets.extend(map(shift.__add__, column._offsets[1:]))
+        return cls(bytes(data), offsets)
+
+    @classmethod
+    def from_buffer(cls, buffer) -> "StringColumn":
+        """
+        Build a column from bytes produced by `to_bytes`, without copying. `buffer`
+        can be any object supporting the buffer protocol, such as an `mmap`.
+        """
+        view = memoryview(buffer)
+        magic, count, data_length = HEADER.unpack_from(view)
+        if magic != MAGIC:
+            raise ValueError("Buffer does not contain a serialised StringColumn.")
+
+        offsets_start = HEADER.size
+        data_start = offsets_start + (count + 1) * 8
+        offsets = view[offsets_start:data_start].cast("Q")
+        data = view[data_start : data_start + data_length]
+        return cls(data, offsets)
+
+    def release(self) -> None:
+        """
+        Release the buffer viewed by a column built with `from_buffer`, so that an
+        `mmap` behind it can be closed. The column can't be read afterwards.
+        """
+        for view in (self._data, self._offsets):
+            if isinstance(view, memoryview):
+                view.release()
+
+    def to_bytes(self) -> bytes:
+        """
+        Serialise the column to bytes that can be loaded with `from_buffer`.
+        """
+        offsets = array("Q", self._offsets)
+        return b"".join(
+            [
+                HEADER.pack(MAGIC, len(offsets) - 1, offsets[-1]),
+                offsets.tobytes(),
+                bytes(self._data[: offsets[-1]]),
+            ]
+        )
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("StringColumn index out of range")
+        return str(self._data[self._offsets[index] : self._offsets[index + 1]], "utf-8")
+
+    def __iter__(self) -> Iterator[str]:
+        data = self._data
+        offsets = self._offsets
+        start = offsets[0]
+        for index in range(1, len(offsets)):
+            end = offsets[index]
+            yield str(data[start:end], "utf-8")
+            start = end
+
+    def __repr__(self) -> str:
+        return f"StringColumn({len(self)} entries, {self.nbytes} bytes)"
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Size of the string data and offsets in bytes.
+        """
+        return len(self._data) + len(self._offsets) * 8
+
+
+class StringColumnBuilder:
+    """
+    Append-only builder for a StringColumn, so values can be stored compactly as
+    they are read instead of being collected in a list first.
+    """
+
+    __slots__ = ("_data", "_offsets")
+
+    def __init__(self) -> None:
+        self._data = bytearray()
+        self._offsets = array("Q", [0])
+
+    def append(self, string: str) -> None:
+        self._data += string.encode("utf-8")
+        self._offsets.append(len(self._data))
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def build(self) -> StringColumn:
+        return StringColumn(bytes(self._data), self._offsets)
+
+
+class ColumnTable:
+    """
+    Named StringColumns aligned row by row, with rows looked up by a key column.
+
+    Used to carry extra columns from an input file (e.g. email or department) through
+    to the results without keeping a dictionary per row.
+    """
+
+    __slots__ = ("names", "columns", "_keys", "_rows")
+
+    def __init__(self, keys: Sequence[str], columns: dict[str, Sequence[str]]) -> None:
+        self.names = list(columns)
+        self.columns = columns
+        self._keys = keys
+        self._rows = None
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def row(self, key: str) -> dict[str, str]:
+        """
+        Return the values for the row with the given key, as a dictionary of column
+        names to values. Missing keys return an empty value for each column.
+        """
+        if self._rows is None:
+            # Build the key index on first lookup
+            self._rows = {key: index for index, key in enumerate(self._keys)}
+        index = self._rows.get(key)
+        if index is None:
+            return {name: "" for name in self.names}
+        return {name: self.columns[name][index] for name in self.names}
@@ -0,0 +1,282 @@
+import hashlib
+import json
+import logging
+from collections.abc import Iterable, Mapping
+from pathlib import Path
+
+import click
+
+from sweeper.io import iter_result_from_file
+from sweeper.options import PathOrURI, input_options
+from sweeper.sqlite import is_sqlite_uri
+from sweeper.sweepstake import DRAW_ALGORITHM, Sweepstake
+from sweeper.validate import get_input_cache, load_validated_inputs
+
+
+logger = logging.getLogger(__name__)
+
+COMMITMENT_VERSION = 2
+# Version 1 commitments predate draw algorithms, and were all drawn with algorithm 1
+COMMITMENT_VERSIONS = [1, 2]
+COMMITMENT_SUFFIX = ".commitment.json"
+
+
+def update_digest(digest, value: str) -> None:
+    """
+    Add a length-prefixed string to a digest, so entries can't run together.
+    """
+    data = value.encode("utf-8")
+    digest.update(len(data).to_bytes(8, "big"))
+    digest.update(data)
+
+
+def hash_entries(entries: Iterable[str]) -> tuple[str, int]:
+    """
+    Return a tuple of (SHA-256 hex digest, count) for a sequence of entries.
+    """
+    digest = hashlib.sha256()
+    count = 0
+    for entry in entries:
+        update_digest(digest, entry)
+        count += 1
+    return digest.hexdigest(), count
+
+
+def hash_result(result: Iterable[tuple[str, str]]) -> tuple[str, int]:
+    """
+    Return a tuple of (SHA-256 hex digest, count) for (entrant, pick) pairs, in
+    draw order.
+    """
+    digest = hashlib.sha256()
+    count = 0
+    for entrant, pick in result:
+        update_digest(digest, entrant)
+        update_digest(digest, pick)
+        count += 1
+    return digest.hexdigest(), count
+
+
+def build_commitment(
+    *,
+    entrants: Iterable[str],
+    picks: Iterable[str],
+    draw_order: str,
+    seed: int | None,
+    result: Mapping[str, str],
+    derangement: str | None = None,
+    draw_algorithm: int = DRAW_ALGORITHM,
+) -> dict:
+    """
+    Build a compact, fixed-size record of a draw: hashes of the normalised inputs,
+    the draw order, the draw algorithm, the seed and a digest of the result. The
+    result can later be checked against it with `verify_commitment`, and re-derived
+    from the inputs and seed if the seed is known. Derangement draws also record
+    their derangement, so they can be re-derived the same way.
+    """
+    return commitment_from_digests(
+        entrants=hash_entries(entrants),
+        picks=hash_entries(picks),
+        draw_order=draw_order,
+        seed=seed,
+        result=hash_result(result.items()),
+        derangement=derangement,
+        draw_algorithm=draw_algorithm,
+    )
+
+
+def commitment_from_digests(
+    *,
+    entrants: tuple[str, int],
+    picks: tuple[str, int],
+    draw_order: str,
+    seed: int | None,
+    result: tuple[str, int],
+    derangement: str | None = None,
+    draw_algorithm: int = DRAW_ALGORITHM,
+) -> dict:
+    """
+    Build a draw commitment from (SHA-256 hex digest, count) tuples already
+    computed for the inputs and result, e.g. while streaming them.
+    """
+    entrants_sha256, entrants_count = entrants
+    picks_sha256, picks_count = picks
+    result_sha256, result_count = result
+    commitment = {
+        "version": COMMITMENT_VERSION,
+        "entrants_sha256": entrants_sha256,
+        "entrants_count": entrants_count,
+        "picks_sha256": picks_sha256,
+        "picks_count": picks_count,
+        "draw_order": draw_order,
+        "draw_algorithm": draw_algorithm,
+        "seed": seed,
+        "result_sha256": result_sha256,
+        "result_count": result_count,
+    }
+    if derangement:
+        commitment["derangement"] = derangement
+    return commitment
+
+
+def commit_results_file(commitment: dict, results_file: Path | str) -> dict:
+    """
+    Return a copy of a draw commitment whose result digest covers every result now
+    in `results_file`, e.g. after the draw's results were appended to earlier
+    ones. The combined results can't be recomputed from a single seed, so no seed
+    is recorded.
+    """
+    result_sha256, result_count = hash_result(iter_result_from_file(results_file))
+    return {
+        **commitment,
+        "seed": None,
+        "result_sha256": result_sha256,
+        "result_count": result_count,
+    }
+
+
+def get_commitment_path(output_file: Path) -> Path:
+    """
+    Return the default commitment file path for a results file.
+    """
+    output_file = Path(output_file)
+    return output_file.with_name(f"{output_file.name}{COMMITMENT_SUFFIX}")
+
+
+def write_commitment(commitment: dict, path: Path) -> None:
+    """
+    Write a draw commitment to a JSON file.
+    """
+    with open(path, "w") as jsonfile:
+        json.dump(commitment, jsonfile, indent=4)
+
+
+def load_commitment(path: Path) -> dict:
+    """
+    Load a draw commitment from a JSON file.
+    """
+    with open(path, "r") as jsonfile:
+        commitment = json.load(jsonfile)
+    if commitment.get("version") not in COMMITMENT_VERSIONS:
+        raise ValueError(f"Unsupported commitment version {commitment.get('version')}")
+    return commitment
+
+
+def verify_commitment(
+    commitment: dict,
+    results_file: Path,
+    entrants: list | None = None,
+    picks: list | None = None,
+) -> list[str]:
+    """
+    Check a results file against a draw commitment in a single streaming pass.
+
+    If the inputs are passed, their hashes are checked too, and if the commitment
+    holds a seed, the draw is recomputed from the inputs and seed and compared with
+    the results file. Returns a list of failed checks, empty if all passed.
+    """
+    failures = []
+    result_sha256, result_count = hash_result(iter_result_from_file(results_file))
+    if result_count != commitment["result_count"]:
+        failures.append(
+            f"Results file has {result_count} results, "
+            f"commitment has {commitment['result_count']}"
+        )
+    if result_sha256 != commitment["result_sha256"]:
+        failures.append("Results file does not match the committed result digest")
+
+    for label, entries in [("entrants", entrants), ("picks", picks)]:
+        if entries is None:
+            continue
+        sha256, _ = hash_entries(entries)
+        if sha256 != commitment[f"{label}_sha256"]:
+            failures.append(f"{label.capitalize()} do not match the committed hash")
+
+    if entrants is not None and picks is not None and commitment["seed"] is not None:
+        sweepstake = Sweepstake(
+            entrants,
+            picks,
+            draw_order=commitment["draw_order"],
+            validate=False,
+            derangement=commitment.get("derangement"),
+            draw_algorithm=commitment.get("draw_algorithm", 1),
+        )
+        recomputed = sweepstake.draw(seed=commitment["seed"])
+        if hash_result(recomputed)[0] != commitment["result_sha256"]:
+            failures.append("Result recomputed from the inputs and seed does not match")
+
+    return failures
+
+
+@click.command(
+    name="verify",
+    epilog="""EXAMPLES
+
+Check a results file has not been changed since it was drawn:
+
+sweeper verify results.csv
+
+Also check the inputs, and recompute the draw from them and the committed seed:
+
+sweeper verify results.csv --entrants entrants.txt --picks picks.txt
+""",
+)
+@click.argument(
+    "results_file", type=PathOrURI(exists=True, readable=True, dir_okay=False)
+)
+@click.option(
+    "--commitment",
+    "commitment_file",
+    type=click.Path(exists=True, readable=True, dir_okay=False),
+    help=f"Path to the draw commitment. Defaults to the results file path with "
+    f"{COMMITMENT_SUFFIX} appended. Required if the results are in a SQLite table",
+)
+@input_options(required=False)
+def verify_command(
+    *,
+    results_file: Path,
+    commitment_file: Path | None = None,
+    entrants: Path | None = None,
+    entrants_column: str | None = None,
+    picks: Path | None = None,
+    picks_column: str | None = None,
+    casefold: bool = False,
+    cache_dir: Path | None = None,
+    cache_max_size: int | None = None,
+    workers: int | None = None,
+) -> None:
+    """
+    Verify a results file against its draw commitment.
+    """
+    logger.debug("START: Running verify")
+    if commitment_file is None:
+        if is_sqlite_uri(results_file):
+            raise click.UsageError("--commitment is required for SQLite results")
+        commitment_file = get_commitment_path(results_file)
+    if not Path(commitment_file).exists():
+        raise click.ClickException(f"Commitment file {commitment_file} not found")
+    commitment = load_commitment(commitment_file)
+
+    entrants_list = picks_list = None
+    if entrants is not None and picks is not None:
+        try:
+            entrants_list, picks_list, _ = load_validated_inputs(
+                entrants=entrants,
+                entrants_column=entrants_column,
+                picks=picks,
+                picks_column=picks_column,
+                casefold=casefold,
+                cache=get_input_cache(cache_dir, cache_max_size),
+                workers=workers,
+            )
+        except (ValueError, IndexError) as error:
+            raise click.ClickException(str(error))
+    elif entrants is not None or picks is not None:
+        raise click.UsageError("--entrants and --picks must be passed together")
+
+    failures = verify_commitment(commitment, results_file, entrants_list, picks_list)
+    for failure in failures:
+        logger.error(f"Verification failed: {failure}")
+    if failures:
+        raise click.ClickException("Verification failed:\n" + "\n".join(failures))
+    logger.debug(f"Verified {results_file} against {commitment_file}")
+    click.echo(f"Verified {commitment['result_count']} results in {results_file}")
@@ -0,0 +1,146 @@
+import logging
+from array import array
+from collections.abc import Iterator, Sequence
+
+
+logger = logging.getLogger(__name__)
+
+DERANGEMENTS = ["any", "single-cycle"]
+# D(n) / n! converges to 1/e to double precision well before this
+DERANGEMENT_RATIO_TERMS = 32
+
+
+def check_derangement(derangement: str | None) -> None:
+    """
+    Raise a ValueError if `derangement` is not None or a supported derangement.
+    """
+    if derangement is not None and derangement not in DERANGEMENTS:
+        message = (
+            f"derangement must be one of 'any' or 'single-cycle', got {derangement}"
+        )
+        logger.error(message)
+        raise ValueError(message)
+
+
+def check_derangeable(entrants: Sequence[str], picks: Sequence[str]) -> None:
+    """
+    Raise a ValueError unless entrants and picks are the same names, in any order,
+    so no entrant can draw themselves. Entries must already be unique.
+    """
+    if len(entrants) != len(picks) or set(entrants) != set(picks):
+        message = "Entrants and picks must be the same names for a derangement"
+        logger.error(message)
+        raise ValueError(message)
+    if len(entrants) < 2:
+        message = "A derangement needs at least 2 entrants"
+        logger.error(message)
+        raise ValueError(message)
+
+
+def get_derangement_ratios(n: int) -> list[float]:
+    """
+    Return D(k) / k! for k from 0 to `n` (or the first DERANGEMENT_RATIO_TERMS),
+    where D(k) is the number of derangements of k items.
+    """
+    ratios = [1.0, 0.0]
+    term = 1.0
+    for k in range(2, min(n, DERANGEMENT_RATIO_TERMS) + 1):
+        # D(k) / k! = sum of (-1)^i / i! for i from 0 to k
+        term /= k
+        ratios.append(ratios[-1] + (term if k % 2 == 0 else -term))
+    return ratios
+
+
+def random_derangement(n: int, rng) -> array:
+    """
+    Return a uniformly random derangement of `range(n)` as an array, where item
+    `i` maps to `derangement[i]` and no item maps to itself.
+
+    Uses the algorithm of Martínez, Panholzer and Prodinger ("Generating random
+    derangements", 2008): a Fisher-Yates style pass from the end that closes a
+    2-cycle with exactly the probability it has in a uniform derangement, so no
+    draw is ever rejected and retried. It takes about 2n random numbers in
+    expectation.
+    """
+    ratios = get_derangement_ratios(n)
+
+    def ratio(k: int) -> float:
+        return ratios[k] if k < len(ratios) else ratios[-1]
+
+    values = array("L", range(n))
+    marked = bytearray(n)
+    unmarked = n
+    for i in range(n - 1, -1, -1):
+        if unmarked < 2:
+            break
+        if marked[i]:
+            continue
+        j = rng.randrange(i)
+        while marked[j]:
+            j = rng.randrange(i)
+        values[i], values[j] = values[j], values[i]
+        # The chance that i and j form a 2-cycle: (u - 1) D(u - 2) / D(u)
+        if rng.random() * unmarked * ratio(unmarked) < ratio(unmarked - 2):
+            marked[j] = 1
+            unmarked -= 1
+        unmarked -= 1
+    return values
+
+
+def random_cycle(n: int, rng) -> array:
+    """
+    Return a uniformly random cyclic permutation of `range(n)` as an array, using
+    Sattolo's algorithm: following `cycle[i]` from any item visits every item
+    before returning to it. Every cyclic permutation of 2 or more items is a
+    derangement.
+    """
+    values = array("L", range(n))
+    for i in range(n - 1, 0, -1):
+        j = rng.randrange(i)
+        values[i], values[j] = values[j], values[i]
+    return values
+
+
+def iter_derangement_rounds(
+    drawers: Sequence[str],
+    *,
+    draw_order: str,
+    rng,
+    derangement: str = "any",
+    log_rounds: bool = True,
+) -> Iterator[tuple[int, str, str]]:
+    """
+    Draw a derangement, yielding (index, entrant, pick) tuples in draw order.
+
+    Entrants and picks are the same names, so `drawers` are the entrants (drawing
+    in order of entrants) or the picks (drawing in order of picks), and each
+    drawer is matched with another drawer's name. The whole derangement is drawn
+    before the first round is yielded.
+
+    Arguments:
+        - drawers (Sequence): Names in draw order
+        - draw_order (str):   "entrants", "picks" or "shuffle"
+        - rng:                Random number generator, e.g. a seeded
+                              `random.Random`
+        - derangement (str):  "any" for a uniformly random derangement, or
+                              "single-cycle" for a uniformly random single cycle,
+                              e.g. for a gift exchange chain
+        - log_rounds (bool):  If True, each round is written to the audit log
+    """
+    check_derangement(derangement)
+    if derangement == "single-cycle":
+        permutation = random_cycle(len(drawers), rng)
+    else:
+        permutation = random_derangement(len(drawers), rng)
+
+    for index, drawer in enumerate(drawers):
+        drawn = drawers[permutation[index]]
+        if draw_order in ["entrants", "shuffle"]:
+            entrant, pick = drawer, drawn
+            if log_rounds:
+                logger.debug(f"Assigned pick {pick} to entrant {entrant}")
+        else:
+            entrant, pick = drawn, drawer
+            if log_rounds:
+                logger.debug(f"Pick {pick} drawn by entrant {entrant}")
+        yield index, entrant, pick
@@ -1,26 +1,122 @@
+import json
 import logging
 import random
+import secrets
 import sys
 import time
-from copy import deepcopy
+from collections.abc import Iterable
+from contextlib import nullcontext, redirect_stdout
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 import click
 from prettytable import PrettyTable
 
+from sweeper.commitment import (
+    build_commitment,
+    commit_results_file,
+    get_commitment_path,
+    write_commitment,
+)
+from sweeper.derangement import (
+    check_derangeable,
+    check_derangement,
+    iter_derangement_rounds,
+)
+from sweeper.index import check_indexable, write_index
 from sweeper.io import (
-    get_lines_from_file,
+    STDIO_PATH,
+    FileFormat,
+    as_path,
+    describe_formats,
+    get_format,
+    get_format_key,
     get_path_suffix,
-    load_csv,
+    is_stdio,
+    is_uri,
+    load_taken_from_file,
     write_result_to_csv,
-    write_result_to_json,
 )
-from sweeper.option_required_if import OptionRequiredIf
+from sweeper.journal import DrawJournal
+from sweeper.memory import (
+    MemoryBudget,
+    estimate_draw_memory,
+    estimate_result_memory,
+    format_size,
+)
+from sweeper.options import ByteSize, HostPort, PathOrURI, input_options
+from sweeper.presentation import (
+    DEFAULT_RECENT_WINDOW,
+    ProgressPresenter,
+    present_round,
+)
+from sweeper.rng import RNG_NAMES, get_rng
+from sweeper.sweepstake import (
+    DRAW_ALGORITHM,
+    Sweepstake,
+    check_draw_order,
+    iter_draw_rounds,
+    remove_drawn,
+)
+from sweeper.validate import (
+    check_enough_picks,
+    check_unique,
+    count_validated_entries,
+    get_input_cache,
+    load_validated_inputs,
+)
+
+
+if TYPE_CHECKING:
+    from sweeper.broadcast import DrawBroadcast
 
 
 logger = logging.getLogger(__name__)
 
 
+def get_delta_inputs(
+    entrants: Iterable[str],
+    picks: Iterable[str],
+    taken_entrants: set[str],
+    taken_picks: set[str],
+) -> tuple[list, list]:
+    """
+    Return the entrants not already in an existing result and the picks they can
+    still draw, for drawing late entrants without redrawing everyone else. Entrants
+    and picks are filtered as they are iterated, keeping their original order.
+    """
+    new_entrants = [entrant for entrant in entrants if entrant not in taken_entrants]
+    undrawn_picks = [pick for pick in picks if pick not in taken_picks]
+    logger.debug(
+        f"Existing result has {len(taken_entrants)} entrants - drawing "
+        f"{len(new_entrants)} new entrants from {len(undrawn_picks)} undrawn picks"
+    )
+    check_enough_picks(len(new_entrants), len(undrawn_picks))
+    return new_entrants, undrawn_picks
+
+
+def compute_result(
+    entrants: list,
+    picks: list,
+    draw_order: str = "entrants",
+    rng=None,
+    derangement: str | None = None,
+) -> dict:
+    """
+    Compute a draw without presenting, printing or logging each round. Given the
+    same inputs, draw order, derangement and RNG state, the result is the same as
+    `draw()`.
+    """
+    sweepstake = Sweepstake(
+        entrants,
+        picks,
+        draw_order=draw_order,
+        validate=False,
+        derangement=derangement,
+    )
+    return sweepstake.draw(rng=rng if rng is not None else random).to_dict()
+
+
 def draw(
     entrants: list,
     picks: list,
@@ -28,6 +124,14 @@ def draw(
     delay: float = 1.0,
     quiet: bool = False,
     debug: bool = False,
+    validate: bool = True,
+    rng=None,
+    journal: DrawJournal | None = None,
+    log_rounds: bool = True,
+    show_table: bool = True,
+    presenter: ProgressPresenter | None = None,
+    broadcast: "DrawBroadcast | None" = None,
+    derangement: str | None = None,
 ) -> dict:
     """
     Map one pick to each entrant. Return a dictionary mapping entrants to picks.
@@ -46,109 +150,269 @@ def draw(
         - debug (bool):     If True, picks are assigned in deterministic order (essentially
                             they are zipped together) instead of being chosen randomly.
                             Default is False.
+        - validate (bool):  If True, check entrants and picks are unique and there are
+                            enough picks. Pass False if the inputs have already been
+                            validated, e.g. by `load_validated_inputs`. Default is True.
+        - rng:              Random number generator to draw with, e.g. a seeded
+                            `random.Random`. Default is the `random` module.
+        - journal (DrawJournal): If passed, each round is recorded to the journal as it
+                            is presented. If the journal was loaded from an existing
+                            file, the draw resumes from its last committed round.
+        - log_rounds (bool): If True, the inputs, each round and the results table are
+                            written to the audit log. If False, only their sizes are
+                            logged, e.g. when a draw commitment is logged instead.
+                            Default is True.
+        - show_table (bool): If True, build and print a table of the results. Pass
+                            False to save memory on large draws, e.g. when the
+                            results are streamed to a file instead. Default is True.
+        - presenter (ProgressPresenter): If passed and `quiet` is False, rounds are
+                            shown on a progress bar instead of being revealed one
+                            at a time, and `delay` only applies after the draw.
+        - broadcast (DrawBroadcast): If passed, each round is also sent to live
+                            viewers as it is revealed, or as it is drawn if the
+                            rounds are not revealed one at a time.
+        - derangement (str): If set, entrants and picks must be the same names, and
+                            nobody draws themselves: "any" draws a uniformly
+                            random derangement, "single-cycle" a uniformly random
+                            single cycle (e.g. a gift exchange chain). Can't be
+                            used with a journal.
     """
     logger.debug(f"Running draw with debug={debug}")
-    logger.debug(f"({len(entrants)}) {entrants=}")
-    logger.debug(f"({len(picks)}) {picks=}")
+    if log_rounds:
+        logger.debug(f"({len(entrants)}) {entrants=}")
+        logger.debug(f"({len(picks)}) {picks=}")
+    else:
+        logger.debug(f"{len(entrants)} entrants, {len(picks)} picks")
     logger.debug(f"{draw_order=}")
     logger.debug(f"{delay=}")
     logger.debug(f"{quiet=}")
+    logger.debug(f"{derangement=}")
 
-    if len(set(entrants)) < len(entrants):
-        message = f"Entrants must be unique but found duplicates: {entrants}"
-        logger.error(message)
-        raise ValueError(message)
+    if validate:
+        check_unique(enumerate(entrants, start=1), label="Entrants")
+        check_unique(enumerate(picks, start=1), label="Picks")
+        check_enough_picks(len(entrants), len(picks))
+        if derangement:
+            check_derangeable(entrants, picks)
 
-    if len(set(picks)) < len(picks):
-        message = f"Picks must be unique but found duplicates: {picks}"
+    check_draw_order(draw_order)
+    check_derangement(derangement)
+    if derangement and journal is not None:
+        message = "A derangement can't be recorded to a journal"
         logger.error(message)
         raise ValueError(message)
 
-    if len(picks) < len(entrants):
-        message = f"There are not enough picks ({len(picks)}) to give all entrants ({len(entrants)}) a pick"
-        logger.error(message)
-        raise ValueError(message)
+    if rng is None:
+        rng = random
 
-    if draw_order not in ["entrants", "picks", "shuffle"]:
-        message = f"draw_order must be one of 'entrants', 'picks', or 'shuffle', got {draw_order}"
-        logger.error(message)
-        raise ValueError(message)
+    entrants_copy = list(entrants)
+    picks_copy = list(picks)
 
-    entrants_copy = deepcopy(entrants)
-    picks_copy = deepcopy(picks)
+    resuming = journal is not None and journal.started
+    draw_algorithm = journal.draw_algorithm if resuming else DRAW_ALGORITHM
+    if resuming:
+        logger.debug(
+            f"Resuming draw from journal after {len(journal.assignments)} rounds"
+        )
+        # The journal header holds the entrants in the order they were drawn
+        entrants_copy = list(journal.header["entrants"])
+        if journal.rng_state is not None:
+            rng.setstate(journal.rng_state)
+    elif draw_order == "shuffle":
+        rng.shuffle(entrants_copy)
+
+    if journal is not None and not resuming:
+        journal.start(
+            entrants=entrants_copy,
+            picks=picks_copy,
+            draw_order=draw_order,
+            rng=rng,
+            draw_algorithm=draw_algorithm,
+        )
+    elif resuming and not journal.complete:
+        journal.open()
 
-    if draw_order == "shuffle":
-        random.shuffle(entrants_copy)
+    # Draw in order of entrants: each entrant draws from the pool of picks.
+    # Draw in order of picks: each pick draws from the pool of entrants.
+    if draw_order in ["entrants", "shuffle"]:
+        drawers, pool = entrants_copy, picks_copy
+    else:
+        drawers, pool = picks_copy, entrants_copy
 
     result = {}
-    table = PrettyTable(["Entrant", "Pick"])
+    table = PrettyTable(["Entrant", "Pick"]) if show_table else None
 
-    # Draw in order of entrants
-    if draw_order in ["entrants", "shuffle"]:
-        for index, entrant in enumerate(entrants_copy):
-            logger.debug(f"Drawing for entrant {index + 1}: {entrant}")
-            if debug:
-                # If debug mode is on, assign picks in order
-                pick = picks_copy[index]
-            else:
-                # Remove a random pick from the list
-                pick = picks_copy.pop(random.randint(0, len(picks_copy) - 1))
-
-            result[entrant] = pick
-            logger.debug(f"Assigned pick {pick} to entrant {entrant}")
-            table.add_row([entrant, pick])
-    # Draw in order of picks
-    elif draw_order == "picks":
-        for index, pick in enumerate(picks_copy):
-            logger.debug(f"Drawing for pick {index + 1}: {pick}")
-            if debug:
-                # If debug mode is on, assign entrants in order
-                entrant = entrants_copy[index]
-            else:
-                # Remove a random entrant from the list
-                entrant = entrants_copy.pop(random.randint(0, len(entrants_copy) - 1))
-
-            result[entrant] = pick
-            logger.debug(f"Pick {pick} drawn by entrant {entrant}")
+    committed = journal.assignments if resuming else []
+    if broadcast is not None:
+        broadcast.publish_start(min(len(drawers), len(pool)), draw_order)
+    for index, (entrant, pick) in enumerate(committed):
+        result[entrant] = pick
+        if table is not None:
             table.add_row([entrant, pick])
+        if broadcast is not None:
+            broadcast.publish_round(index, entrant, pick, draw_order)
+    if committed:
+        # Rebuild the pool as the committed rounds left it
+        drawn = [pick if pool is picks_copy else entrant for entrant, pick in committed]
+        remove_drawn(pool, drawn, draw_algorithm=draw_algorithm, debug=debug)
+
+    if derangement:
+        rounds = iter_derangement_rounds(
+            drawers,
+            draw_order=draw_order,
+            rng=rng,
+            derangement=derangement,
+            log_rounds=log_rounds,
+        )
+        # Every pick is drawn
+        pool.clear()
     else:
-        message = f"draw_order must be one of 'entrants', 'picks', or 'shuffle', got {draw_order}"
-        logger.error(message)
-        raise ValueError(message)
+        rounds = iter_draw_rounds(
+            drawers,
+            pool,
+            draw_order=draw_order,
+            rng=rng,
+            debug=debug,
+            start=len(committed),
+            log_rounds=log_rounds,
+            draw_algorithm=draw_algorithm,
+        )
+    for index, entrant, pick in rounds:
+        result[entrant] = pick
+        if table is not None:
+            table.add_row([entrant, pick])
+
+        if quiet:
+            # Nothing to present until the final result
+            pass
+        elif presenter is not None:
+            presenter.update(index, entrant, pick)
+        else:
+            # Sent to viewers step by step as it is revealed
+            present_round(index, entrant, pick, draw_order, delay, broadcast)
+        if broadcast is not None and (quiet or presenter is not None):
+            broadcast.publish_round(index, entrant, pick, draw_order)
+        if journal is not None:
+            journal.record(entrant, pick, rng)
+
+    if presenter is not None and not quiet:
+        presenter.close()
+    if journal is not None and not journal.complete:
+        journal.close(rng)
 
-    undrawn_picks = [pick for pick in picks_copy if pick not in result.values()]
-    logger.debug(f"Results table\n{table}")
-    logger.debug(f"Undrawn picks ({len(undrawn_picks)}): {undrawn_picks}")
+    if draw_order in ["entrants", "shuffle"]:
+        undrawn_picks = pool
+    else:
+        undrawn_picks = drawers[len(result) :]
+    if log_rounds and table is not None:
+        logger.debug(f"Results table\n{table}")
+        logger.debug(f"Undrawn picks ({len(undrawn_picks)}): {undrawn_picks}")
+    else:
+        logger.debug(f"{len(result)} rounds drawn, {len(undrawn_picks)} picks undrawn")
     logger.debug("Draw complete")
 
+    if broadcast is not None:
+        broadcast.publish_complete(len(result), len(undrawn_picks))
     if not quiet:
-        # Print results to terminal
-        if draw_order in ["entrants", "shuffle"]:
-            for index, (entrant, pick) in enumerate(result.items()):
-                print(f"Entrant {index + 1}: {entrant}")
-                time.sleep(delay)
-                print("\nDrawing...\n")
-                time.sleep(delay)
-                print(f"{entrant} ... draws ... {pick}\n")
-                time.sleep(delay * 2)
-                print("------------------------------------\n")
-        elif draw_order == "picks":
-            for index, (entrant, pick) in enumerate(result.items()):
-                print(f"Pick {index + 1}: {pick}")
-                time.sleep(delay)
-                print("\nDrawing...\n")
-                time.sleep(delay)
-                print(f"{pick} ... drawn by ... {entrant}\n")
-                time.sleep(delay * 2)
-                print("------------------------------------\n")
         print(f"Undrawn picks ({len(undrawn_picks)}): {undrawn_picks}\n")
         time.sleep(delay)
 
     print("\nDraw complete.\n")
-    print(f"Results:\n{table}")
+    if table is not None:
+        print(f"Results:\n{table}")
     return result
 
 
+def report_peak_memory(budget: MemoryBudget, output_file: Path | None) -> None:
+    """
+    Log the peak memory of the draw, and print it if a memory budget was set.
+    """
+    budget.record("writing")
+    peak = format_size(budget.peak)
+    logger.info(f"Peak memory: {peak}")
+    if budget.max_memory is not None:
+        # Keep stdout for the results if they are being written there
+        click.echo(
+            f"Peak memory: {peak} (budget {format_size(budget.max_memory)})",
+            err=is_stdio(output_file),
+        )
+
+
+def get_output_format(output_file: Path | str, output_suffix: str) -> FileFormat:
+    """
+    Return the registered format to write results to `output_file` in, or raise
+    ValueError if there is none that can write results.
+    """
+    suffix = None if is_uri(output_file) else output_suffix
+    file_format = get_format(output_file, suffix=suffix)
+    if file_format is None or not file_format.writes_results:
+        message = (
+            f"Output file must be a {describe_formats('writes_results')} file, "
+            f"got {suffix if suffix is not None else get_format_key(output_file)}"
+        )
+        logger.error(message)
+        raise ValueError(message)
+    return file_format
+
+
+def run_external_draw(
+    *,
+    entrants: Path | str,
+    entrants_column: str | None,
+    picks: Path | str,
+    picks_column: str | None,
+    draw_order: str,
+    casefold: bool,
+    rng,
+    budget: MemoryBudget,
+    output_file: Path | str | None,
+    output_suffix: str | None,
+    commitment_file: Path | None,
+) -> None:
+    """
+    Run an out-of-core draw, streaming results to the output file (or stdout as CSV)
+    as they are drawn, and write its commitment.
+    """
+    # Imported here so `sweeper --help` and in-memory draws don't load it
+    from sweeper.external import DEFAULT_EXTERNAL_MEMORY, ExternalDraw
+
+    max_memory = budget.max_memory or DEFAULT_EXTERNAL_MEMORY
+    with ExternalDraw(
+        entrants,
+        entrants_column,
+        picks,
+        picks_column,
+        rng=rng,
+        draw_order=draw_order,
+        max_memory=max_memory,
+        casefold=casefold,
+    ) as external_draw:
+        budget.record("loading")
+        if output_file is None:
+            write_result_to_csv(result=external_draw, path=STDIO_PATH)
+        else:
+            result_format = get_output_format(output_file, output_suffix)
+            result_format.write_result(external_draw, output_file)
+        budget.record("drawing")
+
+    # Drawn with a different algorithm to Sweepstake, so the seed can't be used to
+    # recompute the draw when verifying it
+    commitment = external_draw.get_commitment(seed=None)
+    logger.info(f"Draw commitment: {json.dumps(commitment)}")
+    if (
+        commitment_file is None
+        and output_file
+        and not is_stdio(output_file)
+        and not is_uri(output_file)
+    ):
+        commitment_file = get_commitment_path(output_file)
+    if commitment_file:
+        logger.debug(f"Writing draw commitment to {commitment_file}")
+        write_commitment(commitment, commitment_file)
+    click.echo(f"Drew {external_draw.result_count} results out of core", err=True)
+    report_peak_memory(budget, output_file)
+
+
 @click.command(
     epilog="""EXAMPLES
 
@@ -171,39 +435,73 @@ sweeper draw --entrants entrants.txt --picks picks.txt --output-file results.csv
 Draw in order of picks (i.e. 'pick 1 goes to...'):
 
 sweeper draw --entrants entrants.txt --picks picks.txt --draw-order picks
+
+Cache parsed inputs to speed up repeated draws against the same files:
+
+sweeper draw --entrants entrants.csv --entrants-column name --picks picks.txt --cache-dir .sweeper-cache
+
+Read entrants and picks from the same CSV file, carrying extra columns into the results:
+
+sweeper draw --entrants staff.csv --entrants-column name --picks staff.csv --picks-column team --metadata-columns email,department --output-file results.csv
+
+Read entrants from a SQLite table and write results to another table:
+
+sweeper draw --entrants "sqlite:///roster.db?table=staff&column=name" --picks picks.txt --output-file "sqlite:///roster.db?table=results"
+
+Read entrants from stdin and write compressed results:
+
+export-staff | sweeper draw --entrants - --picks picks.txt --output-file results.csv.gz
+
+Draw late entrants against an existing results file, appending their results:
+
+sweeper draw --entrants entrants.txt --picks picks.txt --append-to results.csv
+
+Record the draw to a journal, then resume it if it is interrupted:
+
+sweeper draw --entrants entrants.txt --picks picks.txt --journal draw.journal
+
+sweeper draw --resume draw.journal
+
+Draw with a fixed seed and record a commitment that can be checked later:
+
+sweeper draw --entrants entrants.txt --picks picks.txt --seed 42 --output-file results.csv
+
+sweeper verify results.csv --entrants entrants.txt --picks picks.txt
+
+Show a progress bar instead of revealing each round, for large draws:
+
+sweeper draw --entrants entrants.txt --picks picks.txt --delay 0 --presentation progress
+
+Broadcast the draw to viewers' browsers at http://HOST:8000/:
+
+sweeper draw --entrants entrants.txt --picks picks.txt --broadcast 0.0.0.0:8000
+
+Keep memory use within 512 MiB on a shared batch node, streaming results instead of
+building a results table if needed:
+
+sweeper draw --entrants entrants.txt --picks picks.txt --quiet --max-memory 512M --output-file results.csv
+
+Compute the draw ahead of a live session, then reveal it:
+
+sweeper draw --entrants entrants.txt --picks picks.txt --sealed draw.sealed
+
+sweeper reveal draw.sealed
+
+Draw a gift exchange where nobody draws themselves, as one chain:
+
+sweeper draw --entrants staff.txt --picks staff.txt --derangement --single-cycle
+
+Check the inputs are valid without running the draw:
+
+sweeper draw --entrants entrants.txt --picks picks.txt --dry-run
 """
 )
+@input_options(required=False)
 @click.option(
-    "-e",
-    "--entrants",
-    required=True,
-    type=click.Path(exists=True, readable=True, dir_okay=False),
-    help="Path to file containing list of entrants",
-)
-@click.option(
-    "--entrants-column",
-    cls=OptionRequiredIf,
-    required_if_option="entrants",
-    required_if_value=".csv",
-    required_if_value_transform=get_path_suffix,
-    type=str,
-    help="Column name or index to use from entrants file, if a CSV file.",
-)
-@click.option(
-    "-p",
-    "--picks",
-    required=True,
-    type=click.Path(exists=True, readable=True, dir_okay=False),
-    help="Path to file containing list of picks",
-)
-@click.option(
-    "--picks-column",
-    cls=OptionRequiredIf,
-    required_if_option="picks",
-    required_if_value=".csv",
-    required_if_value_transform=get_path_suffix,
+    "--metadata-columns",
     type=str,
-    help="Column name or index to use from picks file, if a CSV file.",
+    help="Comma-separated column names or indexes from the entrants CSV file to "
+    "carry through to the output file, e.g. email,department",
 )
 @click.option(
     "--draw-order",
@@ -215,6 +513,21 @@ sweeper draw --entrants entrants.txt --picks picks.txt --draw-order picks
     "picks list ('pick 1 goes to...'), "
     "or in order of entrants, but shuffled ('entrant 3 gets...')",
 )
+@click.option(
+    "--derangement",
+    is_flag=True,
+    default=False,
+    help="If set, entrants and picks must be the same names, and nobody draws "
+    "themselves. The draw is a uniformly random derangement, drawn directly "
+    "rather than by redrawing",
+)
+@click.option(
+    "--single-cycle",
+    is_flag=True,
+    default=False,
+    help="With --derangement, draw a single cycle: following who each entrant "
+    "drew visits everyone before returning to them, e.g. for a gift exchange chain",
+)
 @click.option(
     "--delay",
     default=1.0,
@@ -222,6 +535,29 @@ sweeper draw --entrants entrants.txt --picks picks.txt --draw-order picks
     type=float,
     help="Delay between draw rounds in seconds",
 )
+@click.option(
+    "--presentation",
+    type=click.Choice(["reveal", "progress"], case_sensitive=False),
+    default="reveal",
+    show_default=True,
+    help="How to present the draw. 'reveal' reveals each round in turn, pausing "
+    "for --delay. 'progress' shows a progress bar with throughput, ETA and the most "
+    "recent assignments, for large draws",
+)
+@click.option(
+    "--recent",
+    type=click.IntRange(min=0),
+    default=DEFAULT_RECENT_WINDOW,
+    show_default=True,
+    help="Number of recent assignments to show with --presentation progress",
+)
+@click.option(
+    "--broadcast",
+    "broadcast_address",
+    type=HostPort(),
+    help="Address to broadcast the draw on, e.g. 0.0.0.0:8000. Viewers open "
+    "http://HOST:PORT/ in a browser to watch each round as it is revealed",
+)
 @click.option(
     "-q",
     "--quiet",
@@ -231,20 +567,145 @@ sweeper draw --entrants entrants.txt --picks picks.txt --draw-order picks
 )
 @click.option(
     "--output-file",
+    type=PathOrURI(exists=False, writable=True, dir_okay=False, allow_dash=True),
+    help="File path to write results to. CSV or JSON supported, optionally "
+    "compressed with gzip, bzip2 or xz (e.g. results.csv.gz). Pass - to write to "
+    "stdout, or a SQLite URI (e.g. sqlite:///results.db?table=results) to write "
+    "to a table, replacing it if it exists. If not passed, results are printed to "
+    "terminal and no file is written",
+)
+@click.option(
+    "--output-format",
+    type=click.Choice(["csv", "json"], case_sensitive=False),
+    help="Format to write results in. Defaults to the --output-file suffix, or CSV "
+    "when writing to stdout",
+)
+@click.option(
+    "--append-to",
+    type=PathOrURI(exists=False, writable=True, dir_okay=False),
+    help="Existing CSV or JSON results file or SQLite URI to add late entrants to. "
+    "Only entrants not already in the file are drawn, from the picks not already taken, and "
+    "their results are appended to the file",
+)
+@click.option(
+    "--journal",
+    "journal_path",
+    type=click.Path(exists=False, writable=True, dir_okay=False),
+    help="File path to record the draw to as it runs, so it can be resumed with "
+    "--resume if interrupted",
+)
+@click.option(
+    "--resume",
+    "resume_path",
+    type=click.Path(exists=True, readable=True, dir_okay=False),
+    help="Resume an interrupted draw from its journal file. Inputs and draw order "
+    "are read from the journal, so --entrants and --picks are not needed",
+)
+@click.option(
+    "--seed",
+    type=int,
+    help="Seed for the random number generator. If not passed, a random seed is "
+    "generated. The seed is recorded in the draw commitment so the draw can be "
+    "reproduced and verified",
+)
+@click.option(
+    "--rng",
+    "rng_name",
+    type=click.Choice(RNG_NAMES, case_sensitive=False),
+    default="default",
+    show_default=True,
+    help="Random number generator to draw with. default is Python's Mersenne "
+    "Twister, seeded so the draw can be reproduced. secure reads the operating "
+    "system's cryptographically secure generator in large blocks. Secure draws "
+    "can't be seeded or reproduced, but their commitment can still be verified",
+)
+@click.option(
+    "--commitment-file",
     type=click.Path(exists=False, writable=True, dir_okay=False),
-    help="File path to write results to. CSV or JSON supported. "
-    "If not passed, results are printed to terminal and no file is written",
+    help="File path to write the draw commitment to. Defaults to the output file "
+    "path with .commitment.json appended, if --output-file is a file",
+)
+@click.option(
+    "--audit-rounds",
+    is_flag=True,
+    default=False,
+    help="If set, write the inputs and every round to the audit log as well as the "
+    "draw commitment. Slow for large draws",
+)
+@click.option(
+    "--max-memory",
+    type=ByteSize(),
+    help="Memory budget, e.g. 512M. Uniqueness checks spill to disk beyond it. If "
+    "the draw is projected to exceed it from the input file sizes, it is drawn as "
+    "with --out-of-core. Where that isn't possible (e.g. with --journal), the "
+    "results table is not built and results are streamed instead. Peak memory is "
+    "reported at the end of the draw",
+)
+@click.option(
+    "--index",
+    "write_index_file",
+    is_flag=True,
+    default=False,
+    help="If set, write a sidecar index next to the CSV --output-file (with .index "
+    "appended) so results can be looked up with sweeper lookup without reading "
+    "the whole file",
+)
+@click.option(
+    "--out-of-core",
+    is_flag=True,
+    default=False,
+    help="If set, draw without holding the inputs or results in memory, for "
+    "inputs too large to fit. Entrants and picks are shuffled on disk within "
+    "--max-memory (default 256M) and results are streamed to --output-file, or "
+    "stdout as CSV. Rounds are not revealed",
+)
+@click.option(
+    "--sealed",
+    "sealed_path",
+    type=click.Path(exists=False, writable=True, dir_okay=False),
+    help="File path to seal the draw in. The draw is computed straight away "
+    "without revealing or printing any rounds, and can be revealed later with "
+    "sweeper reveal",
+)
+@click.option(
+    "--dry-run",
+    is_flag=True,
+    default=False,
+    help="If set, validate the inputs and exit without running the draw",
 )
 def draw_command(
     *,
-    entrants: Path,
+    entrants: Path | None = None,
     entrants_column: str | int | None = None,
-    picks: Path,
+    picks: Path | None = None,
     picks_column: str | int | None = None,
+    casefold: bool = False,
+    cache_dir: Path | None = None,
+    cache_max_size: int | None = None,
+    workers: int | None = None,
+    metadata_columns: str | None = None,
     draw_order: str = "entrants",
+    derangement: bool = False,
+    single_cycle: bool = False,
     delay: float = 1.0,
+    presentation: str = "reveal",
+    recent: int = DEFAULT_RECENT_WINDOW,
+    broadcast_address: tuple[str, int] | None = None,
     quiet: bool = False,
     output_file: Path | None = None,
+    output_format: str | None = None,
+    append_to: Path | None = None,
+    journal_path: Path | None = None,
+    resume_path: Path | None = None,
+    seed: int | None = None,
+    rng_name: str = "default",
+    commitment_file: Path | None = None,
+    audit_rounds: bool = False,
+    max_memory: int | None = None,
+    write_index_file: bool = False,
+    out_of_core: bool = False,
+    sealed_path: Path | None = None,
+    dry_run: bool = False,
 ) -> dict:
     """
     Start a sweepstake draw. Allocate one pick per entrant.
@@ -252,71 +713,330 @@ def draw_command(
     logger.debug("START: Running draw")
     logger.debug(f"Running command: {sys.argv[1:]}")
 
-    picks = Path(picks)
-    entrants = Path(entrants)
     if output_file:
-        output_file = Path(output_file)
+        output_file = as_path(output_file)
+        if output_format is None and is_stdio(output_file):
+            output_format = "csv"
+        output_suffix = (
+            f".{output_format.lower()}"
+            if output_format
+            else get_path_suffix(output_file)
+        )
+        # Fail before drawing rather than after
+        get_output_format(output_file, output_suffix)
+
+    if append_to:
+        if output_file:
+            raise click.UsageError("--output-file cannot be used with --append-to")
+        append_to = as_path(append_to)
+        append_format = get_format(append_to)
+        if append_format is None or not append_format.appends_results:
+            raise click.UsageError(
+                f"--append-to must be a {describe_formats('appends_results')} file, "
+                f"got {get_format_key(append_to)}"
+            )
 
-    if entrants.suffix == ".csv":
+    if metadata_columns:
+        if append_to:
+            raise click.UsageError("--metadata-columns cannot be used with --append-to")
+        metadata_columns = [column.strip() for column in metadata_columns.split(",")]
+
+    if write_index_file:
+        if output_file is None or is_uri(output_file) or output_suffix != ".csv":
+            raise click.UsageError("--index needs a CSV --output-file")
         try:
-            logger.debug(f"Entrants file suffix is .csv")
-            entrants_column = int(entrants_column)
-            logger.debug(f"entrants_column is an integer - loading csv by column index")
-            entrants_list = load_csv(filepath=entrants, column_index=entrants_column)
-        except ValueError:
-            logger.debug(f"entrants_column is a string - loading csv by column name")
-            entrants_list = load_csv(filepath=entrants, column_name=entrants_column)
-    elif entrants.suffix == ".txt":
-        logger.debug(f"Entrants file suffix is .txt")
-        entrants_list = get_lines_from_file(filepath=entrants)
+            check_indexable(output_file)
+        except ValueError as error:
+            raise click.UsageError(f"--index: {error}")
+
+    if single_cycle and not derangement:
+        raise click.UsageError("--single-cycle needs --derangement")
+    if derangement:
+        for name, value in [
+            ("--resume", resume_path),
+            ("--journal", journal_path),
+            ("--append-to", append_to),
+            ("--out-of-core", out_of_core),
+        ]:
+            if value:
+                raise click.UsageError(f"{name} cannot be used with --derangement")
+    derangement = ("single-cycle" if single_cycle else "any") if derangement else None
+
+    # Options that need the inputs held in memory, so can't be drawn out of core
+    in_memory_options = [
+        name
+        for name, value in [
+            ("--resume", resume_path),
+            ("--journal", journal_path),
+            ("--append-to", append_to),
+            ("--metadata-columns", metadata_columns),
+            ("--broadcast", broadcast_address),
+            ("--sealed", sealed_path),
+            ("--derangement", derangement),
+        ]
+        if value
+    ]
+    if out_of_core:
+        if in_memory_options:
+            raise click.UsageError(
+                f"{in_memory_options[0]} cannot be used with --out-of-core"
+            )
+        if entrants is None or picks is None:
+            raise click.UsageError("--entrants and --picks are required")
+
+    budget = MemoryBudget(max_memory)
+    if (
+        max_memory is not None
+        and not out_of_core
+        and not in_memory_options
+        and entrants is not None
+        and picks is not None
+    ):
+        projected = estimate_draw_memory([entrants, picks])
+        if projected is not None and budget.exceeds(projected):
+            logger.info("Draw projected to exceed --max-memory - drawing out of core")
+            click.echo(
+                "Draw projected to exceed --max-memory, drawing out of core", err=True
+            )
+            out_of_core = True
+    journal = None
+    metadata = None
+    if resume_path:
+        if journal_path:
+            raise click.UsageError("--journal cannot be used with --resume")
+        logger.debug(f"Resuming draw from journal {resume_path}")
+        journal = DrawJournal.load(resume_path)
+        seed = journal.seed
+        rng_name = journal.rng_name
+        entrants_list = journal.header["entrants"]
+        picks_list = journal.header["picks"]
+        draw_order = journal.header["draw_order"]
+    elif out_of_core:
+        # Inputs are read while drawing, so there are no lists to load
+        entrants_list = picks_list = None
     else:
-        logger.error(
-            f"Entrants file must be a .csv or .txt file, got {entrants.suffix}"
+        if entrants is None or picks is None:
+            raise click.UsageError(
+                "--entrants and --picks are required unless --resume is passed"
+            )
+        entrants_list, picks_list, metadata = load_validated_inputs(
+            entrants=as_path(entrants),
+            entrants_column=entrants_column,
+            picks=as_path(picks),
+            picks_column=picks_column,
+            metadata_columns=metadata_columns,
+            casefold=casefold,
+            cache=get_input_cache(cache_dir, cache_max_size),
+            max_memory=max_memory,
+            workers=workers,
         )
-        raise ValueError(
-            f"Entrants file must be a .csv or .txt file, got {entrants.suffix}"
+
+    if append_to and not resume_path:
+        logger.debug(f"Loading existing results from {append_to}")
+        taken_entrants, taken_picks = load_taken_from_file(append_to)
+        entrants_list, picks_list = get_delta_inputs(
+            entrants_list, picks_list, taken_entrants, taken_picks
         )
+        # Only the new entrants and undrawn picks are needed from here on
+        del taken_entrants, taken_picks
+
+    if derangement:
+        check_derangeable(entrants_list, picks_list)
 
-    if picks.suffix == ".csv":
-        logger.debug(f"Picks file suffix is .csv")
+    budget.record("loading")
+
+    if dry_run and out_of_core:
+        from sweeper.external import DEFAULT_EXTERNAL_MEMORY
+
+        max_memory = max_memory or DEFAULT_EXTERNAL_MEMORY
+        entrants_count, picks_count = [
+            count_validated_entries(
+                as_path(path),
+                column,
+                label=label,
+                casefold=casefold,
+                max_memory=max_memory,
+            )
+            for path, column, label in [
+                (entrants, entrants_column, "Entrants"),
+                (picks, picks_column, "Picks"),
+            ]
+        ]
+        check_enough_picks(entrants_count, picks_count)
+        click.echo(f"Validation passed: {entrants_count} entrants, {picks_count} picks")
+        return None
+    if dry_run:
+        logger.debug("Dry run - skipping draw")
+        click.echo(
+            f"Validation passed: {len(entrants_list)} entrants, {len(picks_list)} picks"
+        )
+        return None
+
+    rng_name = rng_name.lower()
+    if rng_name == "secure":
+        if seed is not None and not resume_path:
+            raise click.UsageError("--seed cannot be used with --rng secure")
+    elif seed is None and not resume_path:
+        seed = secrets.randbits(64)
+    logger.debug(f"{seed=}, {rng_name=}")
+    rng = get_rng(rng_name, seed)
+
+    if out_of_core:
+        logger.debug("Running out-of-core draw")
+        run_external_draw(
+            entrants=as_path(entrants),
+            entrants_column=entrants_column,
+            picks=as_path(picks),
+            picks_column=picks_column,
+            draw_order=draw_order,
+            casefold=casefold,
+            rng=rng,
+            budget=budget,
+            output_file=output_file,
+            output_suffix=output_suffix if output_file else None,
+            commitment_file=commitment_file,
+        )
+        if write_index_file:
+            write_index(output_file)
+        return None
+
+    if journal_path:
+        logger.debug(f"Recording draw to journal {journal_path}")
+        journal = DrawJournal(journal_path, seed=seed, rng_name=rng_name)
+
+    low_memory = budget.exceeds(
+        estimate_result_memory(len(entrants_list), len(picks_list))
+    )
+    if low_memory:
+        logger.info("Draw projected to exceed --max-memory - streaming results")
+
+    if sealed_path:
+        if broadcast_address:
+            raise click.UsageError("--broadcast cannot be used with --sealed")
+        # Nothing is revealed until sweeper reveal, so draw without pausing
+        quiet, delay, presentation = True, 0, "reveal"
+        logger.debug(f"Sealing draw in {sealed_path}")
+
+    presenter = None
+    if presentation == "progress":
+        presenter = ProgressPresenter(
+            total=min(len(entrants_list), len(picks_list)),
+            draw_order=draw_order,
+            window=recent,
+        )
+
+    broadcast = None
+    if broadcast_address:
+        from sweeper.broadcast import DrawBroadcast
+
+        broadcast = DrawBroadcast(*broadcast_address)
         try:
-            picks_column = int(picks_column)
-            logger.debug(f"picks_column is an integer - loading csv by column index")
-            picks_list = load_csv(filepath=picks, column_index=picks_column)
-        except ValueError:
-            logger.debug(f"picks_column is a string - loading csv by column name")
-            picks_list = load_csv(filepath=picks, column_name=picks_column)
-    elif picks.suffix == ".txt":
-        logger.debug(f"Picks file suffix is .txt")
-        picks_list = get_lines_from_file(filepath=picks)
-    else:
-        logger.error(f"Picks file must be a .csv or .txt file, got {picks.suffix}")
-        raise ValueError(f"Picks file must be a .csv or .txt file, got {picks.suffix}")
+            broadcast.start()
+        except OSError as error:
+            raise click.ClickException(
+                f"Can't broadcast on {broadcast_address[0]}:{broadcast_address[1]}: "
+                f"{error.strerror or error}"
+            )
+        click.echo(f"Broadcasting draw at {broadcast.url}", err=True)
 
     logger.debug("Calling draw function")
-    results = draw(
+    # Keep stdout for the results if they are being written there
+    with (
+        redirect_stdout(sys.stderr) if is_stdio(output_file) else nullcontext(),
+        broadcast if broadcast is not None else nullcontext(),
+    ):
+        results = draw(
+            entrants=entrants_list,
+            picks=picks_list,
+            draw_order=draw_order,
+            delay=delay,
+            quiet=quiet,
+            validate=False,
+            rng=rng,
+            journal=journal,
+            log_rounds=audit_rounds,
+            show_table=not low_memory and not sealed_path,
+            presenter=presenter,
+            broadcast=broadcast,
+            derangement=derangement,
+        )
+    budget.record("drawing")
+
+    if resume_path and draw_order == "shuffle":
+        # The journal holds the entrants after shuffling, so the seed can't be
+        # used to reproduce the draw from them
+        seed = None
+    commitment = build_commitment(
         entrants=entrants_list,
         picks=picks_list,
         draw_order=draw_order,
-        delay=delay,
-        quiet=quiet,
+        seed=seed,
+        result=results,
+        derangement=derangement,
+        draw_algorithm=DRAW_ALGORITHM if journal is None else journal.draw_algorithm,
     )
+    logger.info(f"Draw commitment: {json.dumps(commitment)}")
+    if (
+        commitment_file is None
+        and output_file
+        and not is_stdio(output_file)
+        and not is_uri(output_file)
+    ):
+        commitment_file = get_commitment_path(output_file)
+    if commitment_file and not append_to:
+        logger.debug(f"Writing draw commitment to {commitment_file}")
+        write_commitment(commitment, commitment_file)
+
+    if sealed_path:
+        from sweeper.sealed import write_sealed
 
-    if output_file is None:
+        write_sealed(
+            sealed_path,
+            results,
+            draw_order=draw_order,
+            commitment=commitment,
+            undrawn=len(picks_list) - len(results),
+        )
+        click.echo(
+            f"Sealed {len(results)} rounds in {sealed_path}. Reveal them with: "
+            f"sweeper reveal {sealed_path}",
+            err=is_stdio(output_file),
+        )
+        if output_file is None and not append_to:
+            # Keep the result hidden until it is revealed
+            report_peak_memory(budget, output_file)
+            return None
+
+    if append_to:
+        logger.debug(f"Appending {len(results)} results to {append_to}")
+        append_format.append_result(results, append_to)
+        if commitment_file is None and not is_uri(append_to):
+            commitment_file = get_commitment_path(append_to)
+        if commitment_file:
+            # Commit to the whole file, so it still verifies with the earlier results
+            file_commitment = commit_results_file(commitment, append_to)
+            logger.info(f"Results file commitment: {json.dumps(file_commitment)}")
+            logger.debug(f"Writing results file commitment to {commitment_file}")
+            write_commitment(file_commitment, commitment_file)
+        report_peak_memory(budget, output_file)
+        return None
+
+    if output_file is None and not low_memory:
         logger.debug("No output file specified - printing results")
+        report_peak_memory(budget, output_file)
         return results
-    elif output_file.suffix == ".csv":
-        logger.debug(f"Output file passed with .csv suffix - writing to file")
-        write_result_to_csv(result=results, path=output_file)
-    elif output_file.suffix == ".json":
-        logger.debug(f"Output file passed with .json suffix - writing to file")
-        write_result_to_json(result=results, path=output_file)
+    elif output_file is None:
+        logger.debug("No output file specified - streaming results to stdout")
+        write_result_to_csv(result=results, path=STDIO_PATH)
     else:
-        logger.error(
-            f"Output file must be a .csv or .json file, got {output_file.suffix}"
-        )
-        raise ValueError(
-            f"Output file must be a .csv or .json file, got {output_file.suffix}"
+        result_format = get_output_format(output_file, output_suffix)
+        logger.debug(
+            f"Writing results to {output_file} as {type(result_format).__name__}"
         )
+        result_format.write_result(results, output_file, metadata=metadata)
+        if write_index_file:
+            logger.debug(f"Writing index for {output_file}")
+            write_index(output_file)
 
+    report_peak_memory(budget, output_file)
     return None
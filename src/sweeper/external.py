@@ -0,0 +1,334 @@
+import hashlib
+import logging
+import os
+import shutil
+import struct
+import sys
+import tempfile
+from collections.abc import Iterator
+from pathlib import Path
+
+from sweeper.commitment import commitment_from_digests, update_digest
+from sweeper.io import iter_entries_from_file
+from sweeper.validate import (
+    SPILL_ENTRY_OVERHEAD,
+    check_enough_picks,
+    get_duplicate_tracker,
+    normalise_entries,
+)
+
+
+logger = logging.getLogger(__name__)
+
+# Default memory budget for out-of-core draws if --max-memory is not passed
+DEFAULT_EXTERNAL_MEMORY = 256 * 1024**2
+# Number of buckets entries are scattered into once they exceed the memory budget,
+# and the number of times an oversized bucket is scattered again
+DEFAULT_BUCKETS = 64
+MAX_SCATTER_DEPTH = 4
+# Entry record header: length of the UTF-8 encoded entry
+ENTRY_RECORD = struct.Struct("<I")
+
+
+class EntryFile:
+    """
+    Append-only file of entries, read back in the order written.
+    """
+
+    __slots__ = ("path", "count", "size", "_file")
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self.count = 0
+        # Estimated memory needed to hold every entry in a list
+        self.size = 0
+        self._file = open(self.path, "wb")
+
+    def write(self, entry: str) -> None:
+        data = entry.encode("utf-8")
+        self._file.write(ENTRY_RECORD.pack(len(data)))
+        self._file.write(data)
+        self.count += 1
+        self.size += sys.getsizeof(entry) + SPILL_ENTRY_OVERHEAD
+
+    def close(self) -> None:
+        self._file.close()
+
+    def __iter__(self) -> Iterator[str]:
+        self.close()
+        with open(self.path, "rb") as in_file:
+            while header := in_file.read(ENTRY_RECORD.size):
+                (size,) = ENTRY_RECORD.unpack(header)
+                yield in_file.read(size).decode("utf-8")
+
+
+class ExternalShuffle:
+    """
+    Shuffle a stream of entries too large to hold in memory.
+
+    Entries are buffered in memory until their estimated size exceeds `max_memory`.
+    After that, each entry is scattered to one of `buckets` files on disk, chosen
+    uniformly at random. Iterating shuffles each bucket in memory and yields the
+    buckets one after another, scattering any bucket still too large again. Random
+    scattering followed by shuffling each bucket gives a uniformly random
+    permutation (the Rao-Sandelius shuffle).
+
+    If `rng` is None, entries are yielded in the order added instead, still
+    without holding them in memory.
+    """
+
+    __slots__ = (
+        "rng",
+        "max_memory",
+        "buckets",
+        "directory",
+        "count",
+        "_depth",
+        "_buffer",
+        "_buffer_size",
+        "_files",
+    )
+
+    def __init__(
+        self,
+        rng,
+        max_memory: int,
+        directory: str,
+        buckets: int = DEFAULT_BUCKETS,
+        _depth: int = 0,
+    ) -> None:
+        """
+        Arguments:
+            - rng:               Random number generator, or None to keep order
+            - max_memory (int):  Memory budget in bytes for holding entries
+            - directory (str):   Directory to create bucket files in
+            - buckets (int):     Number of bucket files to scatter entries into
+        """
+        self.rng = rng
+        self.max_memory = max_memory
+        self.directory = directory
+        self.buckets = buckets if rng is not None else 1
+        self.count = 0
+        self._depth = _depth
+        self._buffer = []
+        self._buffer_size = 0
+        self._files = None
+
+    def add(self, entry: str) -> None:
+        self.count += 1
+        if self._files is not None:
+            self._scatter(entry)
+            return
+        self._buffer.append(entry)
+        self._buffer_size += sys.getsizeof(entry) + SPILL_ENTRY_OVERHEAD
+        if self._buffer_size > self.max_memory:
+            logger.debug(
+                f"Entries exceeded {self.max_memory} bytes - scattering to "
+                f"{self.buckets} buckets in {self.directory}"
+            )
+            self._files = {}
+            for buffered in self._buffer:
+                self._scatter(buffered)
+            self._buffer = []
+            self._buffer_size = 0
+
+    def _scatter(self, entry: str) -> None:
+        index = self.rng.randrange(self.buckets) if self.buckets > 1 else 0
+        bucket = self._files.get(index)
+        if bucket is None:
+            handle, path = tempfile.mkstemp(dir=self.directory, suffix=".bucket")
+            os.close(handle)
+            bucket = self._files[index] = EntryFile(path)
+        bucket.write(entry)
+
+    def __iter__(self) -> Iterator[str]:
+        if self._files is None:
+            if self.rng is not None:
+                self.rng.shuffle(self._buffer)
+            yield from self._buffer
+            self._buffer = []
+            return
+        for index in sorted(self._files):
+            bucket = self._files.pop(index)
+            if self.rng is None:
+                yield from bucket
+            elif bucket.size <= self.max_memory or self._depth >= MAX_SCATTER_DEPTH:
+                entries = list(bucket)
+                self.rng.shuffle(entries)
+                yield from entries
+            else:
+                logger.debug(f"Scattering oversized bucket {bucket.path} again")
+                shuffle = ExternalShuffle(
+                    self.rng,
+                    self.max_memory,
+                    self.directory,
+                    buckets=self.buckets,
+                    _depth=self._depth + 1,
+                )
+                for entry in bucket:
+                    shuffle.add(entry)
+                bucket.path.unlink()
+                yield from shuffle
+                continue
+            bucket.path.unlink()
+
+
+class ExternalInput:
+    """
+    An input read once for an out-of-core draw: normalised, checked for duplicates
+    within a memory budget and hashed, then held on disk in shuffled (or original)
+    order.
+    """
+
+    __slots__ = ("entries", "sha256", "count")
+
+    def __init__(
+        self,
+        filepath: Path | str,
+        column: str | None,
+        label: str,
+        *,
+        rng,
+        max_memory: int,
+        directory: str,
+        casefold: bool = False,
+    ) -> None:
+        self.entries = ExternalShuffle(rng, max_memory, directory)
+        digest = hashlib.sha256()
+        tracker = get_duplicate_tracker(casefold=casefold, max_memory=max_memory)
+        try:
+            numbered_entries = iter_entries_from_file(filepath, column, label=label)
+            for line_number, entry in normalise_entries(numbered_entries):
+                tracker.add(line_number, entry)
+                update_digest(digest, entry)
+                self.entries.add(entry)
+            tracker.check(label)
+        finally:
+            tracker.close()
+        self.sha256 = digest.hexdigest()
+        self.count = self.entries.count
+        logger.debug(f"Loaded {self.count} {label.lower()} from {filepath} to disk")
+
+
+class ExternalDraw:
+    """
+    A draw for inputs that don't fit in memory.
+
+    Entrants and picks are each read once and held on disk: the side drawn from is
+    shuffled with `ExternalShuffle`, as are the entrants if `draw_order` is
+    "shuffle". Iterating zips the two streams into (entrant, pick) tuples in draw
+    order, so results can be written as they are drawn. Each entrant gets a
+    uniformly random pick, as with `sweeper.draw.draw`, with memory bounded by
+    `max_memory` however large the inputs.
+
+    Use as a context manager so the temporary files are removed.
+
+    Example:
+        with ExternalDraw("tickets.txt", None, "prizes.txt", None, rng=rng) as draw:
+            write_result_to_csv(draw, "results.csv")
+    """
+
+    def __init__(
+        self,
+        entrants: Path | str,
+        entrants_column: str | None,
+        picks: Path | str,
+        picks_column: str | None,
+        *,
+        rng,
+        draw_order: str = "entrants",
+        max_memory: int = DEFAULT_EXTERNAL_MEMORY,
+        casefold: bool = False,
+        directory: Path | None = None,
+    ) -> None:
+        """
+        Arguments:
+            - entrants (Path):    File to read entrants from
+            - entrants_column (str): Column of the entrants file to read, if CSV
+            - picks (Path):       File to read picks from
+            - picks_column (str): Column of the picks file to read, if CSV
+            - rng:                Random number generator to draw with
+            - draw_order (str):   "entrants", "picks" or "shuffle". See
+                                  `sweeper.draw.draw`. Default is "entrants".
+            - max_memory (int):   Memory budget in bytes. Each of the duplicate
+                                  checks and the two inputs on disk uses up to a
+                                  quarter of it.
+            - casefold (bool):    If True, entries differing only by case are
+                                  duplicates
+            - directory (Path):   Directory to create temporary files in. Defaults
+                                  to the system temporary directory.
+        """
+        self.draw_order = draw_order
+        self.result_digest = hashlib.sha256()
+        self.result_count = 0
+        self._directory = tempfile.mkdtemp(prefix="sweeper-draw-", dir=directory)
+        budget = max_memory // 4
+        try:
+            self.entrants = ExternalInput(
+                entrants,
+                entrants_column,
+                label="Entrants",
+                rng=rng if draw_order != "entrants" else None,
+                max_memory=budget,
+                directory=self._directory,
+                casefold=casefold,
+            )
+            self.picks = ExternalInput(
+                picks,
+                picks_column,
+                label="Picks",
+                rng=rng if draw_order != "picks" else None,
+                max_memory=budget,
+                directory=self._directory,
+                casefold=casefold,
+            )
+            check_enough_picks(self.entrants.count, self.picks.count)
+        except BaseException:
+            self.close()
+            raise
+
+    def __enter__(self) -> "ExternalDraw":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return min(self.entrants.count, self.picks.count)
+
+    def __iter__(self) -> Iterator[tuple[str, str]]:
+        """
+        Yield (entrant, pick) tuples in draw order, hashing the result as it goes
+        for the draw commitment. Can only be iterated once.
+        """
+        for entrant, pick in zip(self.entrants.entries, self.picks.entries):
+            update_digest(self.result_digest, entrant)
+            update_digest(self.result_digest, pick)
+            self.result_count += 1
+            yield entrant, pick
+
+    def get_commitment(self, seed: int | None = None) -> dict:
+        """
+        Return the draw commitment once the draw has been iterated. It matches the
+        commitment `build_commitment` would give for the same inputs and result.
+        """
+        return commitment_from_digests(
+            entrants=(self.entrants.sha256, self.entrants.count),
+            picks=(self.picks.sha256, self.picks.count),
+            draw_order=self.draw_order,
+            seed=seed,
+            result=(self.result_digest.hexdigest(), self.result_count),
+        )
+
+    def items(self) -> Iterator[tuple[str, str]]:
+        """
+        Yield (entrant, pick) tuples in draw order, so the draw can be passed to the
+        writers in `sweeper.io` in place of a result dictionary.
+        """
+        return iter(self)
+
+    def close(self) -> None:
+        """
+        Remove the temporary files.
+        """
+        shutil.rmtree(self._directory, ignore_errors=True)
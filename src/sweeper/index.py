@@ -0,0 +1,327 @@
+import csv
+import hashlib
+import logging
+import mmap
+import os
+import struct
+import sys
+from array import array
+from collections.abc import Iterator
+from pathlib import Path
+
+import click
+
+from sweeper.io import get_compression_suffix, is_stdio
+
+
+logger = logging.getLogger(__name__)
+
+INDEX_SUFFIX = ".index"
+INDEX_MAGIC = b"SWEEPIDX"
+INDEX_VERSION = 1
+# Magic, version, results file size and modification time, and the number of
+# records in each of the entrant and pick tables
+INDEX_HEADER = struct.Struct("<8sIxxxxQQQQ")
+# Table record: hash of the value and byte offset of its row in the results file
+INDEX_RECORD = struct.Struct("<QQ")
+INDEX_COLUMNS = ["entrant", "pick"]
+
+
+def get_index_path(results_file: Path) -> Path:
+    """
+    Return the sidecar index path for a results file.
+    """
+    results_file = Path(results_file)
+    return results_file.with_name(f"{results_file.name}{INDEX_SUFFIX}")
+
+
+def hash_key(value: str) -> int:
+    """
+    Return a stable 64-bit hash of a value, the same in every process.
+    """
+    digest = hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+def check_indexable(results_file: Path | str) -> None:
+    """
+    Raise ValueError if a sidecar index can't be built for `results_file`: rows
+    are found by byte offset, so it must be an uncompressed CSV file.
+    """
+    if is_stdio(results_file) or Path(results_file).suffix != ".csv":
+        raise ValueError("Results can only be indexed in an uncompressed .csv file")
+    if get_compression_suffix(results_file):
+        raise ValueError("Compressed results files can't be indexed")
+
+
+class OffsetLines:
+    """
+    Iterate over the decoded lines of a binary file, tracking the byte offset of
+    the next line to be read.
+    """
+
+    __slots__ = ("_file", "position")
+
+    def __init__(self, binary_file) -> None:
+        self._file = binary_file
+        self.position = binary_file.tell()
+
+    def __iter__(self) -> "OffsetLines":
+        return self
+
+    def __next__(self) -> str:
+        line = self._file.readline()
+        if not line:
+            raise StopIteration
+        self.position += len(line)
+        return line.decode("utf-8")
+
+
+def iter_row_offsets(results_file: Path) -> Iterator[tuple[int, list[str]]]:
+    """
+    Yield (byte offset, row) for each row of a CSV results file after the header.
+    Rows with quoted newlines span several lines and are yielded once, with the
+    offset of their first line.
+    """
+    with open(results_file, "rb") as binary_file:
+        lines = OffsetLines(binary_file)
+        reader = csv.reader(lines)
+        next(reader, None)
+        while True:
+            offset = lines.position
+            row = next(reader, None)
+            if row is None:
+                return
+            yield offset, row
+
+
+def get_column_positions(header: list[str]) -> list[int]:
+    """
+    Return the positions of the entrant and pick columns in a results file header.
+    """
+    try:
+        return [header.index(column) for column in INDEX_COLUMNS]
+    except ValueError:
+        raise ValueError("Results file must have 'entrant' and 'pick' columns")
+
+
+def write_index(results_file: Path, index_path: Path | None = None) -> Path:
+    """
+    Write a sidecar index for a CSV results file, mapping hashes of each entrant
+    and pick to the byte offset of their row, sorted by hash.
+
+    Only a packed (hash, offset) integer per row per table is held in memory to
+    sort, not the rows themselves. Returns the index path.
+    """
+    check_indexable(results_file)
+    results_file = Path(results_file)
+    index_path = Path(index_path or get_index_path(results_file))
+    with open(results_file, newline="") as csv_file:
+        positions = get_column_positions(next(csv.reader(csv_file), []))
+
+    tables = [[], []]
+    for offset, row in iter_row_offsets(results_file):
+        for table, position in zip(tables, positions):
+            # Hash in the high bits, so sorting the packed ints sorts by hash
+            table.append(hash_key(row[position]) << 64 | offset)
+    stat = results_file.stat()
+
+    temp_path = index_path.with_name(f"{index_path.name}.{os.getpid()}.tmp")
+    with open(temp_path, "wb") as index_file:
+        index_file.write(
+            INDEX_HEADER.pack(
+                INDEX_MAGIC,
+                INDEX_VERSION,
+                stat.st_size,
+                stat.st_mtime_ns,
+                len(tables[0]),
+                len(tables[1]),
+            )
+        )
+        for table in tables:
+            table.sort()
+            records = array("Q")
+            for packed in table:
+                records.append(packed >> 64)
+                records.append(packed & 0xFFFFFFFFFFFFFFFF)
+            if sys.byteorder != "little":
+                records.byteswap()
+            records.tofile(index_file)
+            # Free each table once written
+            table.clear()
+    os.replace(temp_path, index_path)
+    logger.debug(f"Wrote index {index_path} for {results_file}")
+    return index_path
+
+
+class ResultIndex:
+    """
+    Sidecar index of a CSV results file, memory-mapped for lookups.
+
+    Each lookup binary searches a table of (hash, offset) records for the value's
+    hash, then reads and parses only the matching row of the results file. The
+    index is checked against the results file's size and modification time, so a
+    stale index is never used.
+
+    Example:
+        with ResultIndex("results.csv") as index:
+            row = index.lookup_entrant("Harold")
+    """
+
+    def __init__(self, results_file: Path, index_path: Path | None = None) -> None:
+        self.results_file = Path(results_file)
+        self.index_path = Path(index_path or get_index_path(self.results_file))
+        if not self.index_path.exists():
+            raise FileNotFoundError(f"No index found at {self.index_path}")
+        with open(self.index_path, "rb") as index_file:
+            self._mmap = mmap.mmap(index_file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            (magic, version, size, mtime_ns, *counts) = INDEX_HEADER.unpack_from(
+                self._mmap
+            )
+            if magic != INDEX_MAGIC or version != INDEX_VERSION:
+                raise ValueError(f"{self.index_path} is not a supported index file")
+            stat = self.results_file.stat()
+            if (size, mtime_ns) != (stat.st_size, stat.st_mtime_ns):
+                raise ValueError(
+                    f"Index {self.index_path} is out of date for {self.results_file}"
+                )
+        except BaseException:
+            self._mmap.close()
+            raise
+        self._tables = []
+        start = INDEX_HEADER.size
+        for count in counts:
+            self._tables.append((start, count))
+            start += count * INDEX_RECORD.size
+        self._results = open(self.results_file, "rb")
+        self._header = next(csv.reader([self._results.readline().decode("utf-8")]))
+        self._positions = get_column_positions(self._header)
+
+    def __enter__(self) -> "ResultIndex":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._mmap.close()
+        self._results.close()
+
+    def _find_offsets(self, table: int, key: int) -> Iterator[int]:
+        start, count = self._tables[table]
+        low, high = 0, count
+        while low < high:
+            middle = (low + high) // 2
+            (record_key, _) = INDEX_RECORD.unpack_from(
+                self._mmap, start + middle * INDEX_RECORD.size
+            )
+            if record_key < key:
+                low = middle + 1
+            else:
+                high = middle
+        # Several values may share a hash, so check every record with it
+        while low < count:
+            record_key, offset = INDEX_RECORD.unpack_from(
+                self._mmap, start + low * INDEX_RECORD.size
+            )
+            if record_key != key:
+                return
+            yield offset
+            low += 1
+
+    def _read_row(self, offset: int) -> list[str]:
+        self._results.seek(offset)
+        return next(csv.reader(OffsetLines(self._results)))
+
+    def _lookup(self, table: int, value: str) -> dict[str, str] | None:
+        for offset in self._find_offsets(table, hash_key(value)):
+            row = self._read_row(offset)
+            if row[self._positions[table]] == value:
+                return dict(zip(self._header, row))
+        return None
+
+    def lookup_entrant(self, entrant: str) -> dict[str, str] | None:
+        """
+        Return the results row for `entrant` as a dictionary, or None if they are
+        not in the results.
+        """
+        return self._lookup(0, entrant)
+
+    def lookup_pick(self, pick: str) -> dict[str, str] | None:
+        """
+        Return the results row for `pick` as a dictionary, or None if it was not
+        drawn.
+        """
+        return self._lookup(1, pick)
+
+
+def format_row(row: dict[str, str]) -> str:
+    """
+    Format a results row for display, e.g. "Harold: Bengals (team=Red)".
+    """
+    text = f"{row['entrant']}: {row['pick']}"
+    extra = [
+        f"{name}={value}" for name, value in row.items() if name not in INDEX_COLUMNS
+    ]
+    if extra:
+        text += f" ({', '.join(extra)})"
+    return text
+
+
+@click.command(
+    name="lookup",
+    epilog="""EXAMPLES
+
+Find the pick drawn by an entrant, using the index written by draw --index:
+
+sweeper lookup results.csv --entrant Harold
+
+Find who drew a pick, building the index first:
+
+sweeper lookup results.csv --pick Bengals --build-index
+""",
+)
+@click.argument(
+    "results_file", type=click.Path(exists=True, readable=True, dir_okay=False)
+)
+@click.option("--entrant", help="Entrant to find the pick of")
+@click.option("--pick", help="Pick to find the entrant of")
+@click.option(
+    "--build-index",
+    is_flag=True,
+    default=False,
+    help=f"If set, build (or rebuild) the index at the results file path with "
+    f"{INDEX_SUFFIX} appended before looking up",
+)
+def lookup_command(
+    *,
+    results_file: Path,
+    entrant: str | None = None,
+    pick: str | None = None,
+    build_index: bool = False,
+) -> None:
+    """
+    Look up a result using a results file's sidecar index.
+    """
+    logger.debug("START: Running lookup")
+    if (entrant is None) == (pick is None):
+        raise click.UsageError("Pass exactly one of --entrant or --pick")
+    try:
+        if build_index:
+            write_index(results_file)
+        with ResultIndex(results_file) as index:
+            if entrant is not None:
+                row = index.lookup_entrant(entrant)
+            else:
+                row = index.lookup_pick(pick)
+    except FileNotFoundError as error:
+        raise click.ClickException(
+            f"{error}. Write one with draw --index or pass --build-index"
+        )
+    except ValueError as error:
+        raise click.ClickException(str(error))
+    if row is None:
+        label, value = ("Entrant", entrant) if entrant is not None else ("Pick", pick)
+        raise click.ClickException(f"{label} {value!r} not found in {results_file}")
+    click.echo(format_row(row))
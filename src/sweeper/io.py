@@ -1,19 +1,516 @@
 import csv
+import importlib
 import json
+import logging
+import re
+import sys
+from abc import ABC, abstractmethod
+from collections.abc import Iterator, Mapping
+from contextlib import nullcontext
+from functools import cache
 from pathlib import Path
 
+from sweeper.column import ColumnTable
+
+
+logger = logging.getLogger(__name__)
+
+# Path meaning stdin for inputs or stdout for outputs
+STDIO_PATH = "-"
+
+# Compressed file suffixes and the module providing a streaming `open` for each
+COMPRESSION_MODULES = {".gz": "gzip", ".bz2": "bz2", ".xz": "lzma"}
+
+# Formats by file suffix or URI scheme, as "module:class" so each backend is only
+# imported when a path using it is read or written. See `register_format`.
+FORMATS = {
+    ".txt": "sweeper.io:TextFormat",
+    ".csv": "sweeper.io:CsvFormat",
+    ".json": "sweeper.io:JsonFormat",
+    ".jsonl": "sweeper.io:JsonLinesFormat",
+    "sqlite://": "sweeper.sqlite:SqliteFormat",
+}
+# Entry point group other packages can register formats under. Each entry point is
+# named for a suffix (e.g. ".parquet") or URI scheme (e.g. "postgresql://"), and
+# points to a FileFormat subclass.
+FORMAT_ENTRY_POINT_GROUP = "sweeper.formats"
+
+# Characters read at a time when streaming a JSON document
+JSON_CHUNK_SIZE = 64 * 1024
+JSON_WHITESPACE = re.compile(r"[ \t\n\r]*")
+# The separator after an array element, and any whitespace around it
+JSON_SEPARATOR = re.compile(r"[ \t\n\r]*([,\]])[ \t\n\r]*")
+# The end of a JSON string, or an escape inside it
+JSON_STRING_STOP = re.compile(r'["\\]')
+
+
+def is_stdio(path: Path | str | None) -> bool:
+    """
+    Return True if the path means stdin or stdout.
+    """
+    return path is not None and str(path) == STDIO_PATH
+
+
+def is_uri(path: Path | str | None) -> bool:
+    """
+    Return True if the path is a URI, e.g. "sqlite:///roster.db?table=staff".
+    """
+    return path is not None and "://" in str(path)
+
+
+def as_path(path: Path | str) -> Path | str:
+    """
+    Return a file path as a Path. URIs and "-" are returned unchanged, as Path
+    would collapse the slashes in a URI.
+    """
+    if is_uri(path) or is_stdio(path):
+        return str(path)
+    return Path(path)
+
+
+def get_compression_suffix(path: Path) -> str:
+    """
+    Return the compression suffix of a path (e.g. ".gz"), or "" if uncompressed.
+    """
+    suffix = Path(path).suffix
+    return suffix if suffix in COMPRESSION_MODULES else ""
+
+
+def open_text(path: Path, mode: str = "r", newline: str | None = None):
+    """
+    Open a file in text mode, streaming through gzip, bz2 or lzma if the path has
+    a .gz, .bz2 or .xz suffix. A path of "-" returns stdin for reading or stdout
+    for writing, which are not closed when the context manager exits.
+    """
+    if is_stdio(path):
+        return nullcontext(sys.stdout if "r" not in mode else sys.stdin)
+
+    compression_suffix = get_compression_suffix(path)
+    if compression_suffix:
+        module = importlib.import_module(COMPRESSION_MODULES[compression_suffix])
+        return module.open(path, f"{mode[0]}t", newline=newline)
+    return open(path, mode, newline=newline)
+
 
 def get_lines_from_file(filepath: Path) -> list:
     """
     Return contents of a text file as a list of each line in the file.
     """
-    if isinstance(filepath, str):
-        filepath = Path(filepath)
-    with open(filepath, "r") as in_file:
+    with open_text(filepath, "r") as in_file:
         lines = in_file.read().splitlines()
     return lines
 
 
+def iter_lines_from_file(filepath: Path) -> Iterator[tuple[int, str]]:
+    """
+    Stream a text file, yielding (line_number, line) tuples. Line numbers start at 1
+    and line endings are removed.
+    """
+    with open_text(filepath, "r") as in_file:
+        for line_number, line in enumerate(in_file, start=1):
+            yield line_number, line.rstrip("\r\n")
+
+
+def parse_column(column: str | int | None) -> str | int | None:
+    """
+    Return a column option as an index if it is a number, else as a name.
+    """
+    try:
+        return int(column)
+    except (TypeError, ValueError):
+        return column
+
+
+def iter_csv_columns(
+    *, filepath: Path, columns: list[str | int], header: list | None = None
+) -> Iterator[tuple[int, list[str]]]:
+    """
+    Stream a CSV file, yielding (line_number, values) tuples where `values` holds
+    the value of each requested column, in the order requested. Columns can be
+    given by name (str) or index (int). The CSV file must have a header row.
+
+    If `header` is passed, the file's header row is copied into it once read.
+    """
+    with open_text(filepath, "r", newline="") as in_file:
+        reader = csv.reader(in_file)
+        header_row = next(reader, None)
+        if header_row is None:
+            raise ValueError(f"CSV file {filepath} is empty.")
+        if header is not None:
+            header[:] = header_row
+
+        indexes = []
+        for column in columns:
+            if isinstance(column, int):
+                indexes.append(column)
+                continue
+            try:
+                indexes.append(header_row.index(column))
+            except ValueError:
+                raise ValueError(f"Column '{column}' not found in file header.")
+
+        for row in reader:
+            if not row:
+                continue
+            try:
+                yield reader.line_num, [row[index] for index in indexes]
+            except IndexError:
+                raise IndexError(
+                    f"Column index {max(indexes)} out of range on line {reader.line_num}."
+                )
+
+
+def iter_csv_column(
+    *, filepath: Path, column_name: str | None = None, column_index: int | None = None
+) -> Iterator[tuple[int, str]]:
+    """
+    Stream a CSV file, yielding (line_number, value) tuples for a single column.
+    You can specify the column to load either by name or by index. The CSV file
+    must have a header row.
+    """
+    if column_name is None and column_index is None:
+        raise ValueError("You must pass either column_name or column_index.")
+
+    if column_name is not None and column_index is not None:
+        raise ValueError("You must pass either column_name or column_index, not both.")
+
+    column = column_name if column_name is not None else column_index
+    for line_number, (value,) in iter_csv_columns(filepath=filepath, columns=[column]):
+        yield line_number, value
+
+
+def parse_json_path(column: str | int | None) -> tuple[list[str], list[str]]:
+    """
+    Split a JSON path expression into the keys leading to the array of entries, and
+    the path to the entry within each element.
+
+    "[*]" marks the array, e.g. "staff[*].name" reads the "name" of each element
+    of the "staff" array. Without it, the document is a top-level array and the
+    whole path is within each element, e.g. "name" for [{"name": ...}, ...], or
+    "1" for the second item of each [id, name] array. A leading "$" is ignored.
+    """
+    if column is None:
+        return [], []
+    path = str(column).strip().removeprefix("$")
+    if "[*]" in path:
+        array_path, _, element_path = path.partition("[*]")
+    else:
+        array_path, element_path = "", path
+    return (
+        [key for key in array_path.split(".") if key],
+        [key for key in element_path.split(".") if key],
+    )
+
+
+def get_json_entry(
+    value, element_path: list[str], filepath: Path, line_number: int
+) -> str:
+    """
+    Return the entry at `element_path` in a decoded JSON value, as a string.
+    Numbers and booleans are returned as they are written in JSON, and null as an
+    empty string, so it is skipped like a blank line.
+    """
+    for key in element_path:
+        if isinstance(value, dict) and key in value:
+            value = value[key]
+        elif (
+            isinstance(value, list)
+            and key.lstrip("-").isdigit()
+            and -len(value) <= int(key) < len(value)
+        ):
+            value = value[int(key)]
+        else:
+            raise ValueError(
+                f"Path '{'.'.join(element_path)}' not found on line {line_number} of "
+                f"{filepath}."
+            )
+    if value is None:
+        return ""
+    if isinstance(value, str):
+        return value
+    if isinstance(value, (dict, list)):
+        raise ValueError(
+            f"Value on line {line_number} of {filepath} is not a string or number."
+        )
+    return json.dumps(value)
+
+
+class JsonArrayReader:
+    """
+    Incremental reader for the elements of one array in a JSON document, such as
+    the top-level array or the array under "staff" in {"staff": [...]}.
+
+    The document is read in chunks and each element decoded on its own, so memory
+    use depends on the size of an element rather than the document. Values before
+    the array that aren't on the way to it are skipped without being decoded.
+
+    Example:
+        with open("staff.json") as in_file:
+            reader = JsonArrayReader(in_file, "staff.json")
+            reader.find_array(["staff"])
+            for line_number, element in reader:
+                ...
+    """
+
+    __slots__ = (
+        "path",
+        "_file",
+        "_decoder",
+        "_buffer",
+        "_position",
+        "_line",
+        "_counted",
+        "_eof",
+    )
+
+    def __init__(self, in_file, path: Path | str) -> None:
+        self.path = path
+        self._file = in_file
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._position = 0
+        # Line number at `_counted`, the position newlines have been counted up to
+        self._line = 1
+        self._counted = 0
+        self._eof = False
+
+    def _count_lines(self) -> None:
+        self._line += self._buffer.count("\n", self._counted, self._position)
+        self._counted = self._position
+
+    def _fill(self) -> bool:
+        """
+        Read another chunk, dropping what has been consumed. Return False if the
+        whole document has been read.
+        """
+        if self._eof:
+            return False
+        chunk = self._file.read(JSON_CHUNK_SIZE)
+        if not chunk:
+            self._eof = True
+            return False
+        self._count_lines()
+        self._buffer = self._buffer[self._position :] + chunk
+        self._position = self._counted = 0
+        return True
+
+    def _error(self, message: str) -> ValueError:
+        self._count_lines()
+        return ValueError(
+            f"Invalid JSON in {self.path} on line {self._line}: {message}."
+        )
+
+    def _peek(self) -> str:
+        """
+        Skip whitespace and return the next character, or "" at the end.
+        """
+        while True:
+            self._position = JSON_WHITESPACE.match(self._buffer, self._position).end()
+            if self._position < len(self._buffer):
+                return self._buffer[self._position]
+            if not self._fill():
+                return ""
+
+    def _expect(self, characters: str) -> str:
+        character = self._peek()
+        if not character or character not in characters:
+            expected = " or ".join(repr(expected) for expected in characters)
+            raise self._error(f"expected {expected}")
+        self._position += 1
+        return character
+
+    def _decode(self):
+        """
+        Decode the value at the current position, reading more of the document
+        until it is complete.
+        """
+        self._peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._position)
+            except json.JSONDecodeError as error:
+                if self._fill():
+                    continue
+                raise self._error(error.msg)
+            # A number at the end of the chunk may carry on in the next one
+            if end == len(self._buffer) and self._fill():
+                continue
+            self._position = end
+            return value
+
+    def _skip_string(self) -> None:
+        offset = 1
+        while True:
+            match = JSON_STRING_STOP.search(self._buffer, self._position + offset)
+            if match is None:
+                offset = len(self._buffer) - self._position
+            elif match.group() == "\\":
+                # Skip the escaped character too
+                offset = match.end() + 1 - self._position
+                if offset <= len(self._buffer) - self._position:
+                    continue
+            else:
+                self._position = match.end()
+                return
+            if not self._fill():
+                raise self._error("unterminated string")
+
+    def _skip_value(self) -> None:
+        """
+        Skip the value at the current position without decoding it.
+        """
+        depth = 0
+        while True:
+            character = self._peek()
+            if character == '"':
+                self._skip_string()
+            elif character in ["[", "{"]:
+                depth += 1
+                self._position += 1
+            elif character in ["]", "}"]:
+                depth -= 1
+                self._position += 1
+            elif depth and character in [",", ":"]:
+                self._position += 1
+            elif character:
+                self._decode()
+            else:
+                raise self._error("unexpected end of file")
+            if depth <= 0:
+                return
+
+    def find_array(self, keys: list[str]) -> None:
+        """
+        Move to the start of the array under `keys` in nested objects, or the
+        top-level array if `keys` is empty.
+        """
+        for depth, key in enumerate(keys):
+            self._expect("{")
+            if self._peek() == "}":
+                raise ValueError(f"Key '{key}' not found in {self.path}.")
+            while True:
+                name = self._decode()
+                self._expect(":")
+                if name == key:
+                    break
+                self._skip_value()
+                if self._expect(",}") == "}":
+                    raise ValueError(
+                        f"Key '{'.'.join(keys[: depth + 1])}' not found in {self.path}."
+                    )
+        if self._peek() != "[":
+            where = f"'{'.'.join(keys)}'" if keys else "Top-level value"
+            raise ValueError(f"{where} in {self.path} is not an array.")
+        self._position += 1
+
+    def __iter__(self) -> Iterator[tuple[int, object]]:
+        """
+        Yield (line_number, element) tuples, decoding each element as it is reached.
+        """
+        if self._peek() == "]":
+            self._position += 1
+            return
+        decode = self._decoder.raw_decode
+        while True:
+            self._peek()
+            self._count_lines()
+            line_number = self._line
+            # Decode the element and the separator after it straight from the
+            # buffer, unless either runs past the end of this chunk
+            try:
+                value, end = decode(self._buffer, self._position)
+                match = JSON_SEPARATOR.match(self._buffer, end)
+            except json.JSONDecodeError:
+                match = None
+            if match is not None:
+                self._position = match.end()
+                separator = match.group(1)
+            else:
+                value = self._decode()
+                separator = self._expect(",]")
+            yield line_number, value
+            if separator == "]":
+                return
+
+
+def iter_json_entries(
+    filepath: Path, column: str | None = None
+) -> Iterator[tuple[int, str]]:
+    """
+    Stream a JSON file, yielding (line_number, value) tuples for the entries in an
+    array, one element at a time. `column` is a path expression selecting the
+    array and the entry within each element (see `parse_json_path`). By default,
+    the document is a top-level array of entries.
+    """
+    array_path, element_path = parse_json_path(column)
+    with open_text(filepath, "r") as in_file:
+        reader = JsonArrayReader(in_file, filepath)
+        reader.find_array(array_path)
+        for line_number, element in reader:
+            yield (
+                line_number,
+                get_json_entry(element, element_path, filepath, line_number),
+            )
+
+
+def iter_json_lines_entries(
+    filepath: Path, column: str | None = None
+) -> Iterator[tuple[int, str]]:
+    """
+    Stream a JSON Lines file, yielding (line_number, value) tuples with one entry
+    per line. `column` is a path to the entry within each line's value, e.g. "name"
+    (see `parse_json_path`). By default, each line holds the entry itself. Blank
+    lines are skipped.
+    """
+    array_path, element_path = parse_json_path(column)
+    if array_path:
+        raise ValueError(
+            f"JSON Lines file {filepath} has one entry per line, so the path can't "
+            f"select an array."
+        )
+    with open_text(filepath, "r") as in_file:
+        for line_number, line in enumerate(in_file, start=1):
+            if not line.strip():
+                continue
+            try:
+                value = json.loads(line)
+            except json.JSONDecodeError as error:
+                raise ValueError(
+                    f"Invalid JSON in {filepath} on line {line_number}: {error.msg}."
+                )
+            yield (
+                line_number,
+                get_json_entry(value, element_path, filepath, line_number),
+            )
+
+
+def iter_entries_from_file(
+    filepath: Path, column: str | None = None, label: str = "Input"
+) -> Iterator[tuple[int, str]]:
+    """
+    Stream (line_number, value) tuples from an input file, dispatching on its
+    suffix or URI scheme to a registered format (see `get_format`). Files may be
+    compressed (e.g. entrants.csv.gz). For CSV files, `column` is a column name or
+    index. For JSON and JSON Lines files, it is a path to the entries (see
+    `parse_json_path`).
+
+    If `filepath` is "-", entries are read from stdin, as CSV if a column is passed
+    or as text otherwise. If it is a SQLite URI, entries are read from the table
+    and column it names, or from `column`.
+    """
+    if is_stdio(filepath):
+        file_format = get_format(filepath, suffix=".txt" if column is None else ".csv")
+    else:
+        filepath = as_path(filepath)
+        file_format = get_format(filepath)
+    if file_format is None or not file_format.reads_entries:
+        raise ValueError(
+            f"{label} file must be a {describe_formats('reads_entries')} file, "
+            f"got {get_format_key(filepath)}"
+        )
+    return file_format.iter_entries(filepath, column)
+
+
 def load_csv_rows_as_lists(filepath: Path) -> list[list]:
     """
     Load a CSV file and return rows as lists. The CSV file must have a header row.
@@ -78,30 +575,430 @@ def load_csv(
             )
 
 
-def write_result_to_csv(result: dict, path: Path) -> None:
+def write_result_to_csv(
+    result: Mapping[str, str], path: Path, metadata: ColumnTable | None = None
+) -> None:
     """
-    Write result dictionary to CSV file.
+    Write result dictionary to CSV file. If metadata is passed, its columns are
+    written after the entrant and pick, looked up by entrant.
     """
-    with open(path, "w") as csv_file:
+    with open_text(path, "w") as csv_file:
         field_names = ["entrant", "pick"]
+        if metadata is not None:
+            field_names += metadata.names
         writer = csv.DictWriter(csv_file, fieldnames=field_names)
         writer.writeheader()
+        for entrant, pick in result.items():
+            row = {"entrant": entrant, "pick": pick}
+            if metadata is not None:
+                row.update(metadata.row(entrant))
+            writer.writerow(row)
+
+
+def write_result_to_json(
+    result: Mapping[str, str], path: Path, metadata: ColumnTable | None = None
+) -> None:
+    """
+    Write result dictionary to JSON file. If metadata is passed, each entrant maps
+    to an object holding their pick and metadata instead of just their pick.
+
+    Entries are written one at a time, so no second copy of the results is built.
+    The output is the same as `json.dump(..., indent=4)`.
+    """
+    with open_text(path, "w") as jsonfile:
+        if not result:
+            jsonfile.write("{}")
+            return
+        separator = "{\n"
+        for entrant, pick in result.items():
+            value = (
+                pick if metadata is None else {"pick": pick, **metadata.row(entrant)}
+            )
+            value_text = json.dumps(value, indent=4).replace("\n", "\n    ")
+            jsonfile.write(f"{separator}    {json.dumps(entrant)}: {value_text}")
+            separator = ",\n"
+        jsonfile.write("\n}")
+
+
+def append_result_to_csv(result: Mapping[str, str], path: Path) -> None:
+    """
+    Append result dictionary to an existing CSV results file, or write a new file
+    if it does not exist. Existing rows are not read or rewritten.
+    """
+    if is_stdio(path) or not Path(path).exists():
+        return write_result_to_csv(result=result, path=path)
+
+    with open_text(path, "a") as csv_file:
+        field_names = ["entrant", "pick"]
+        writer = csv.DictWriter(csv_file, fieldnames=field_names)
         for entrant, pick in result.items():
             writer.writerow({"entrant": entrant, "pick": pick})
 
 
-def write_result_to_json(result: dict, path: Path) -> None:
+def append_result_to_json(result: Mapping[str, str], path: Path) -> None:
+    """
+    Append result dictionary to an existing JSON results file written by
+    `write_result_to_json`, or write a new file if it does not exist. Only the
+    closing brace of the existing object is rewritten.
+    """
+    if is_stdio(path) or not Path(path).exists():
+        return write_result_to_json(result=result, path=path)
+    if not result:
+        return
+    if get_compression_suffix(path):
+        raise ValueError(f"Cannot append to compressed JSON results file {path}.")
+
+    with open(path, "r+b") as jsonfile:
+        # Find the closing brace of the top-level object, and the character before it
+        position = jsonfile.seek(0, 2)
+        closing_brace = None
+        while position > 0:
+            position -= 1
+            jsonfile.seek(position)
+            character = jsonfile.read(1)
+            if character.isspace():
+                continue
+            if closing_brace is None and character == b"}":
+                closing_brace = position
+                continue
+            break
+        if closing_brace is None:
+            raise ValueError(f"JSON results file {path} is not a JSON object.")
+
+        lines = [
+            f"    {json.dumps(entrant)}: {json.dumps(pick)}"
+            for entrant, pick in result.items()
+        ]
+        separator = "\n" if character == b"{" else ",\n"
+        jsonfile.seek(closing_brace if character == b"{" else position + 1)
+        jsonfile.write((separator + ",\n".join(lines) + "\n}").encode("utf-8"))
+        jsonfile.truncate()
+
+
+def load_result_from_csv(path: Path) -> dict:
+    """
+    Load a CSV results file written by `write_result_to_csv` into a dictionary
+    mapping entrants to picks.
+    """
+    with open_text(path, "r", newline="") as csv_file:
+        reader = csv.DictReader(csv_file)
+        if reader.fieldnames is None:
+            return {}
+        if not {"entrant", "pick"} <= set(reader.fieldnames):
+            raise ValueError(
+                f"CSV results file {path} must have 'entrant' and 'pick' columns."
+            )
+        return {row["entrant"]: row["pick"] for row in reader}
+
+
+def load_result_from_json(path: Path) -> dict:
+    """
+    Load a JSON results file written by `write_result_to_json` into a dictionary
+    mapping entrants to picks.
+    """
+    with open_text(path, "r") as jsonfile:
+        result = json.load(jsonfile)
+    if not isinstance(result, dict):
+        raise ValueError(f"JSON results file {path} is not a JSON object.")
+    return result
+
+
+def get_results_format(path: Path | str) -> "FileFormat":
     """
-    Write result dictionary to JSON file.
+    Return the registered format for a results file, or raise ValueError if there
+    is none that can read results.
     """
-    with open(path, "w") as jsonfile:
-        json.dump(result, jsonfile, indent=4)
+    file_format = get_format(path)
+    if file_format is None or not file_format.reads_results:
+        raise ValueError(
+            f"Results file must be a {describe_formats('reads_results')} file, "
+            f"got {get_format_key(path)}"
+        )
+    return file_format
+
+
+def load_result_from_file(path: Path) -> dict:
+    """
+    Load a results file or table into a dictionary mapping entrants to picks,
+    dispatching on its suffix or URI scheme. Returns an empty dictionary if the
+    file does not exist.
+    """
+    file_format = get_results_format(path)
+    if not is_uri(path) and not Path(path).exists():
+        return {}
+    return dict(file_format.iter_result(as_path(path)))
+
+
+def load_taken_from_file(path: Path) -> tuple[set[str], set[str]]:
+    """
+    Stream a results file or table into the sets of entrants and picks it already
+    holds, without building a mapping between them, e.g. to draw late entrants.
+    Returns empty sets if the file does not exist.
+    """
+    get_results_format(path)
+    taken_entrants, taken_picks = set(), set()
+    if not is_uri(path) and not Path(path).exists():
+        return taken_entrants, taken_picks
+    for entrant, pick in iter_result_from_file(path):
+        taken_entrants.add(entrant)
+        taken_picks.add(pick)
+    return taken_entrants, taken_picks
+
+
+def iter_result_from_file(path: Path) -> Iterator[tuple[str, str]]:
+    """
+    Yield (entrant, pick) tuples from a results file or table, in the order they
+    were written, dispatching on its suffix or URI scheme. CSV files and SQLite
+    tables are streamed row by row.
+    """
+    return get_results_format(path).iter_result(as_path(path))
 
 
 def get_path_suffix(path: Path) -> str:
     """
+    Return the format suffix of a path, ignoring any compression suffix, e.g.
+    ".csv" for both "entrants.csv" and "entrants.csv.gz".
+
     Implemented as a named function to display more useful help text for
     OptionRequiredIf options - a lambda function only displays as <lambda>.
     """
+    if path is None or is_stdio(path) or is_uri(path):
+        return ""
     path = Path(path)
+    if get_compression_suffix(path):
+        path = path.with_suffix("")
     return path.suffix
+
+
+def get_format_key(path: Path | str) -> str:
+    """
+    Return the key a path's format is registered under: its URI scheme (e.g.
+    "sqlite://"), or its format suffix (e.g. ".csv").
+    """
+    if is_uri(path):
+        text = str(path)
+        return text[: text.index("://") + 3]
+    return get_path_suffix(path)
+
+
+def register_format(key: str, file_format: "type[FileFormat] | str") -> None:
+    """
+    Register a format for a file suffix (e.g. ".parquet") or URI scheme (e.g.
+    "postgresql://"), replacing any registered for it already.
+
+    Arguments:
+        - key (str):         Suffix or URI scheme
+        - file_format:       FileFormat subclass, or a "module:class" string naming
+                             one, so the module is only imported once the format is
+                             used
+    """
+    FORMATS[key] = file_format
+    load_format.cache_clear()
+
+
+@cache
+def load_format_entry_points() -> None:
+    """
+    Add formats registered by other packages under the "sweeper.formats" entry
+    point group. Only their names are read here: each is imported when first used.
+    Built-in formats take precedence.
+    """
+    # Imported here so package metadata is only read once an unknown suffix is met
+    from importlib.metadata import entry_points
+
+    for entry_point in entry_points(group=FORMAT_ENTRY_POINT_GROUP):
+        logger.debug(f"Found format {entry_point.name} from {entry_point.value}")
+        FORMATS.setdefault(entry_point.name, entry_point)
+
+
+def get_format(
+    path: Path | str | None, suffix: str | None = None
+) -> "FileFormat | None":
+    """
+    Return the format registered for a path's suffix or URI scheme, or for `suffix`
+    if passed, or None if there isn't one.
+    """
+    return load_format(suffix if suffix is not None else get_format_key(path))
+
+
+@cache
+def load_format(key: str) -> "FileFormat | None":
+    """
+    Return the format registered for a suffix or URI scheme, or None if there isn't
+    one. Its backend is imported on first use, and the same instance returned after
+    that.
+    """
+    if key not in FORMATS:
+        load_format_entry_points()
+    spec = FORMATS.get(key)
+    if spec is None:
+        return None
+    if isinstance(spec, str):
+        module_name, _, class_name = spec.partition(":")
+        logger.debug(f"Loading format {key} from {module_name}")
+        spec = getattr(importlib.import_module(module_name), class_name)
+    elif hasattr(spec, "load"):
+        logger.debug(f"Loading format {key} from entry point {spec.value}")
+        spec = spec.load()
+    return spec()
+
+
+def describe_formats(capability: str) -> str:
+    """
+    Describe the file suffixes of the formats with a capability, e.g. ".csv or
+    .txt" for "reads_entries", for error messages.
+    """
+    suffixes = [
+        key
+        for key in sorted(FORMATS)
+        if key.startswith(".") and getattr(load_format(key), capability)
+    ]
+    if len(suffixes) < 2:
+        return "".join(suffixes)
+    return f"{', '.join(suffixes[:-1])} or {suffixes[-1]}"
+
+
+class FileFormat(ABC):
+    """
+    A format entrants and picks can be read from, or results read from and written
+    to.
+
+    Formats subclass `EntriesFormat`, `ResultsFormat` or both, implementing their
+    abstract methods, and the capability flags say what they support. A results
+    format that can add to an existing result also sets `appends_results` and
+    implements `append_result(result, path)`, which writes the result if there is
+    none. Register formats for a suffix or URI scheme with `register_format`, or
+    from another package with a "sweeper.formats" entry point.
+
+    Example:
+        class ParquetFormat(EntriesFormat):
+            def iter_entries(self, path, column=None):
+                ...
+
+        register_format(".parquet", "sweeper_parquet:ParquetFormat")
+    """
+
+    reads_entries = False
+    reads_results = False
+    writes_results = False
+    appends_results = False
+
+
+class EntriesFormat(FileFormat):
+    """
+    A format entrants and picks can be read from.
+    """
+
+    reads_entries = True
+
+    @abstractmethod
+    def iter_entries(
+        self, path: Path | str, column: str | None = None
+    ) -> Iterator[tuple[int, str]]:
+        """
+        Stream (line_number, value) tuples of entrants or picks. `column` selects
+        the column to read, for formats that have them.
+        """
+
+
+class ResultsFormat(FileFormat):
+    """
+    A format results can be read from and written to.
+    """
+
+    reads_results = True
+    writes_results = True
+
+    @abstractmethod
+    def iter_result(self, path: Path | str) -> Iterator[tuple[str, str]]:
+        """
+        Stream (entrant, pick) tuples in the order they were written.
+        """
+
+    @abstractmethod
+    def write_result(
+        self,
+        result: Mapping[str, str],
+        path: Path | str,
+        metadata: ColumnTable | None = None,
+    ) -> None:
+        """
+        Write a result, replacing any existing one. Rows are taken from
+        `result.items()` as they are written, so it can be a stream such as an
+        ExternalDraw.
+        """
+
+
+class TextFormat(EntriesFormat):
+    """
+    Text files with one entry per line.
+    """
+
+    def iter_entries(self, path, column=None):
+        return iter_lines_from_file(path)
+
+
+class CsvFormat(EntriesFormat, ResultsFormat):
+    """
+    CSV files. Entries are read from one column; results have a header row with
+    "entrant" and "pick" columns, followed by any metadata columns.
+    """
+
+    appends_results = True
+
+    def iter_entries(self, path, column=None):
+        column = parse_column(column)
+        if isinstance(column, int):
+            return iter_csv_column(filepath=path, column_index=column)
+        return iter_csv_column(filepath=path, column_name=column)
+
+    def iter_result(self, path):
+        with open_text(path, "r", newline="") as csv_file:
+            reader = csv.DictReader(csv_file)
+            if reader.fieldnames is None:
+                return
+            if not {"entrant", "pick"} <= set(reader.fieldnames):
+                raise ValueError(
+                    f"CSV results file {path} must have 'entrant' and 'pick' columns."
+                )
+            for row in reader:
+                yield row["entrant"], row["pick"]
+
+    def write_result(self, result, path, metadata=None):
+        write_result_to_csv(result=result, path=path, metadata=metadata)
+
+    def append_result(self, result, path):
+        append_result_to_csv(result=result, path=path)
+
+
+class JsonFormat(EntriesFormat, ResultsFormat):
+    """
+    JSON files. Entries are streamed from an array, selected with a path
+    expression; results files hold an object mapping entrants to picks, or to
+    objects with their pick and metadata.
+    """
+
+    appends_results = True
+
+    def iter_entries(self, path, column=None):
+        return iter_json_entries(path, column)
+
+    def iter_result(self, path):
+        for entrant, value in load_result_from_json(path).items():
+            # Results written with metadata map entrants to objects
+            yield entrant, value["pick"] if isinstance(value, dict) else value
+
+    def write_result(self, result, path, metadata=None):
+        write_result_to_json(result=result, path=path, metadata=metadata)
+
+    def append_result(self, result, path):
+        append_result_to_json(result=result, path=path)
+
+
+class JsonLinesFormat(EntriesFormat):
+    """
+    JSON Lines files, with one entry, or one object holding it, per line.
+    """
+
+    def iter_entries(self, path, column=None):
+        return iter_json_lines_entries(path, column)
@@ -0,0 +1,230 @@
+import json
+import logging
+import os
+import time
+from pathlib import Path
+
+
+logger = logging.getLogger(__name__)
+
+JOURNAL_VERSION = 1
+DEFAULT_SYNC_EVERY = 1000
+DEFAULT_SYNC_INTERVAL = 1.0
+
+
+def encode_rng_state(state) -> list | None:
+    """
+    Convert a `random.getstate()` tuple to JSON-serialisable lists.
+    """
+    if state is None:
+        return None
+    version, internal_state, gauss_next = state
+    return [version, list(internal_state), gauss_next]
+
+
+def decode_rng_state(state: list | None):
+    """
+    Convert a JSON-decoded RNG state back to a tuple for `random.setstate()`.
+    """
+    if state is None:
+        return None
+    version, internal_state, gauss_next = state
+    return (version, tuple(internal_state), gauss_next)
+
+
+def get_rng_state(rng):
+    """
+    Return the state of `rng`, or None if the generator has no state to save
+    (e.g. `random.SystemRandom`).
+    """
+    try:
+        return rng.getstate()
+    except NotImplementedError:
+        return None
+
+
+class DrawJournal:
+    """
+    Append-only journal of a draw, written as JSON lines so a crashed draw can be
+    resumed.
+
+    The first record holds the inputs (after any shuffle), draw order and RNG state
+    at the start of the draw. One record is appended per round once it has been
+    presented. Periodically, a checkpoint record holding the round number and RNG
+    state is appended and the file is fsynced. Rounds up to the last checkpoint are
+    committed: resuming continues from there without recomputing or presenting them
+    again, and any rounds written after it are discarded.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        sync_every: int = DEFAULT_SYNC_EVERY,
+        sync_interval: float = DEFAULT_SYNC_INTERVAL,
+        seed: int | None = None,
+        rng_name: str = "default",
+    ) -> None:
+        """
+        Arguments:
+            - path (Path):        Path to the journal file
+            - sync_every (int):   Checkpoint and fsync at least every this many rounds
+            - sync_interval (float): Checkpoint and fsync if this many seconds have
+                                  passed since the last checkpoint
+            - seed (int):         Seed the draw's RNG was created from, recorded in
+                                  the header so a resumed draw can commit to it
+            - rng_name (str):     Name of the draw's RNG (see `sweeper.rng.get_rng`),
+                                  recorded so a resumed draw uses the same kind
+        """
+        self.path = Path(path)
+        self.sync_every = sync_every
+        self.sync_interval = sync_interval
+        self.seed = seed
+        self.rng_name = rng_name
+        self.draw_algorithm = None
+        self.header = None
+        self.assignments = []
+        self.rng_state = None
+        self.complete = False
+        self._file = None
+        self._last_sync_round = 0
+        self._last_sync_time = time.monotonic()
+
+    @classmethod
+    def load(cls, path: Path, **kwargs) -> "DrawJournal":
+        """
+        Load an existing journal to resume from its last committed round.
+        """
+        journal = cls(path, **kwargs)
+        committed_offset = 0
+        pending = []
+        offset = 0
+        with open(journal.path, "rb") as in_file:
+            for line in in_file:
+                offset += len(line)
+                if not line.endswith(b"\n"):
+                    # Partially written record from a crash
+                    break
+                record = json.loads(line)
+                if record["type"] == "header":
+                    if record.get("version") != JOURNAL_VERSION:
+                        raise ValueError(
+                            f"Unsupported journal version {record.get('version')}"
+                        )
+                    journal.header = record
+                    journal.seed = record.get("seed")
+                    journal.rng_name = record.get("rng", "default")
+                    # Journals written before draw algorithms were recorded used 1
+                    journal.draw_algorithm = record.get("draw_algorithm", 1)
+                    journal.rng_state = decode_rng_state(record["rng_state"])
+                    committed_offset = offset
+                elif record["type"] == "round":
+                    pending.append((record["entrant"], record["pick"]))
+                elif record["type"] == "checkpoint":
+                    journal.assignments.extend(pending)
+                    pending = []
+                    journal.rng_state = decode_rng_state(record["rng_state"])
+                    committed_offset = offset
+                elif record["type"] == "complete":
+                    journal.complete = True
+                    committed_offset = offset
+
+        if journal.header is None:
+            raise ValueError(f"Journal {journal.path} has no header record")
+
+        if pending:
+            logger.debug(f"Discarding {len(pending)} uncommitted rounds from journal")
+        # Drop anything after the last checkpoint so appended rounds follow on
+        with open(journal.path, "r+b") as journal_file:
+            journal_file.truncate(committed_offset)
+
+        journal._last_sync_round = len(journal.assignments)
+        logger.debug(
+            f"Loaded journal {journal.path} with {len(journal.assignments)} "
+            f"committed rounds (complete={journal.complete})"
+        )
+        return journal
+
+    @property
+    def started(self) -> bool:
+        return self.header is not None
+
+    def start(
+        self,
+        *,
+        entrants: list,
+        picks: list,
+        draw_order: str,
+        rng,
+        draw_algorithm: int,
+    ) -> None:
+        """
+        Create the journal file and write the header record.
+        """
+        self.draw_algorithm = draw_algorithm
+        self.header = {
+            "type": "header",
+            "version": JOURNAL_VERSION,
+            "draw_order": draw_order,
+            "entrants": list(entrants),
+            "picks": list(picks),
+            "rng_state": encode_rng_state(get_rng_state(rng)),
+            "seed": self.seed,
+            "rng": self.rng_name,
+            "draw_algorithm": draw_algorithm,
+        }
+        self._file = open(self.path, "w")
+        self._write(self.header)
+        self._sync()
+        logger.debug(f"Started draw journal {self.path}")
+
+    def open(self) -> None:
+        """
+        Reopen a loaded journal for appending.
+        """
+        self._file = open(self.path, "a")
+
+    def record(self, entrant: str, pick: str, rng) -> None:
+        """
+        Append a presented round, checkpointing if due.
+        """
+        self.assignments.append((entrant, pick))
+        self._write({"type": "round", "entrant": entrant, "pick": pick})
+        rounds_since_sync = len(self.assignments) - self._last_sync_round
+        if (
+            rounds_since_sync >= self.sync_every
+            or time.monotonic() - self._last_sync_time >= self.sync_interval
+        ):
+            self.checkpoint(rng)
+
+    def checkpoint(self, rng) -> None:
+        """
+        Commit all rounds recorded so far along with the current RNG state.
+        """
+        self._write(
+            {
+                "type": "checkpoint",
+                "round": len(self.assignments),
+                "rng_state": encode_rng_state(get_rng_state(rng)),
+            }
+        )
+        self._sync()
+        self._last_sync_round = len(self.assignments)
+
+    def close(self, rng) -> None:
+        """
+        Commit remaining rounds, mark the draw complete and close the journal.
+        """
+        self.checkpoint(rng)
+        self._write({"type": "complete"})
+        self._sync()
+        self._file.close()
+        self.complete = True
+        logger.debug(f"Closed draw journal {self.path}")
+
+    def _write(self, record: dict) -> None:
+        self._file.write(json.dumps(record) + "\n")
+
+    def _sync(self) -> None:
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._last_sync_time = time.monotonic()
@@ -4,19 +4,41 @@ from pathlib import Path
 
 import click
 
+from sweeper.audit import (
+    DEFAULT_BACKUP_COUNT,
+    DEFAULT_LOG_FILE,
+    DEFAULT_MAX_BYTES,
+    audit_command,
+    get_log_handler,
+)
+from sweeper.commitment import verify_command
 from sweeper.draw import draw_command
+from sweeper.index import lookup_command
+from sweeper.options import ByteSize
+from sweeper.sealed import reveal_command
+from sweeper.validate import validate_command
 
 
-def setup_logging():
+def setup_logging(
+    log_file: Path = DEFAULT_LOG_FILE,
+    max_bytes: int = DEFAULT_MAX_BYTES,
+    backup_count: int = DEFAULT_BACKUP_COUNT,
+    rotate_when: str | None = None,
+    per_run: bool = False,
+):
     formatter = logging.Formatter(
-        "%(asctime)s - %(levelname)-8s - %(name)-12s - %(message)s"
+        "%(asctime)s - %(run_id)s - %(levelname)-8s - %(name)-12s - %(message)s"
     )
     formatter.converter = time.gmtime  # Use UTC time
     formatter.datefmt = "%Y-%m-%d %H:%M:%S UTC"
 
-    path = Path("logs")
-    path.mkdir(parents=True, exist_ok=True)
-    file_handler = logging.FileHandler(filename=f"logs/audit.log")
+    file_handler = get_log_handler(
+        log_file=log_file,
+        max_bytes=max_bytes,
+        backup_count=backup_count,
+        rotate_when=rotate_when,
+        per_run=per_run,
+    )
     file_handler.setFormatter(formatter)
 
     root_logger = logging.getLogger()
@@ -26,12 +48,62 @@ def setup_logging():
 
 @click.group()
 @click.version_option()
-def sweeper():
-    setup_logging()
+@click.option(
+    "--log-file",
+    type=click.Path(dir_okay=False, writable=True),
+    default=str(DEFAULT_LOG_FILE),
+    show_default=True,
+    help="Path to the audit log file",
+)
+@click.option(
+    "--log-max-size",
+    type=ByteSize(),
+    default=DEFAULT_MAX_BYTES,
+    show_default="50M",
+    help="Rotate the audit log once it reaches this size. 0 disables rotation",
+)
+@click.option(
+    "--log-rotate-when",
+    type=click.Choice(["S", "M", "H", "D", "midnight"], case_sensitive=False),
+    help="Rotate the audit log at this interval (UTC) instead of by size",
+)
+@click.option(
+    "--log-backups",
+    type=click.IntRange(min=0),
+    default=DEFAULT_BACKUP_COUNT,
+    show_default=True,
+    help="Number of rotated, gzipped audit log segments to keep",
+)
+@click.option(
+    "--log-per-run",
+    is_flag=True,
+    default=False,
+    help="If set, write the audit log for this run to its own file in a runs "
+    "directory next to --log-file, named by run ID",
+)
+def sweeper(
+    log_file: str = str(DEFAULT_LOG_FILE),
+    log_max_size: int = DEFAULT_MAX_BYTES,
+    log_rotate_when: str | None = None,
+    log_backups: int = DEFAULT_BACKUP_COUNT,
+    log_per_run: bool = False,
+):
+    setup_logging(
+        log_file=Path(log_file),
+        max_bytes=log_max_size,
+        backup_count=log_backups,
+        rotate_when=log_rotate_when,
+        per_run=log_per_run,
+    )
     pass
 
 
 sweeper.add_command(draw_command)
+sweeper.add_command(validate_command)
+sweeper.add_command(verify_command)
+sweeper.add_command(lookup_command)
+sweeper.add_command(reveal_command)
+sweeper.add_command(audit_command)
 
 
 if __name__ == "__main__":
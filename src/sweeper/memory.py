@@ -0,0 +1,135 @@
+import logging
+import sys
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None
+
+from sweeper.io import get_compression_suffix, is_stdio, is_uri
+
+
+logger = logging.getLogger(__name__)
+
+# Rough bytes held per result row on the full-materialisation path: a result
+# dictionary entry, a results table row (a list of two cells) and a line of the
+# rendered table. The entrant and pick strings are shared with the inputs.
+RESULT_ROW_OVERHEAD = 400
+# Rough bytes held by a full-materialisation draw per byte of input on disk: each
+# short line becomes a string object, a list slot, a duplicate-check set entry, a
+# result dictionary entry and a table row
+INPUT_MEMORY_FACTOR = 20
+# Rough size of compressed text once decompressed, per byte on disk
+COMPRESSION_RATIO = 5
+STATM_PATH = Path("/proc/self/statm")
+
+
+def get_peak_memory() -> int | None:
+    """
+    Return the peak resident set size of this process in bytes, or None if it
+    can't be measured on this platform.
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Reported in bytes on macOS and kilobytes elsewhere
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def get_current_memory() -> int | None:
+    """
+    Return the current resident set size of this process in bytes. Falls back to
+    the peak where the current size can't be read.
+    """
+    try:
+        resident_pages = int(STATM_PATH.read_text().split()[1])
+    except (OSError, IndexError, ValueError):
+        return get_peak_memory()
+    return resident_pages * resource.getpagesize()
+
+
+def format_size(size: int | None) -> str:
+    """
+    Format a size in bytes for display, e.g. "512.0 MiB".
+    """
+    if size is None:
+        return "unknown"
+    for unit in ["B", "KiB", "MiB", "GiB"]:
+        if size < 1024:
+            return f"{size:.1f} {unit}" if unit != "B" else f"{size} B"
+        size /= 1024
+    return f"{size:.1f} TiB"
+
+
+def estimate_draw_memory(paths: list[Path | str]) -> int | None:
+    """
+    Estimate the memory needed to load and draw the given input files with the
+    full-materialisation path, from their sizes on disk. Returns None if any of
+    them is a URI or stdin, whose size isn't known before reading it.
+    """
+    size = 0
+    for path in paths:
+        if is_uri(path) or is_stdio(path):
+            return None
+        try:
+            file_size = Path(path).stat().st_size
+        except OSError:
+            return None
+        if get_compression_suffix(path):
+            file_size *= COMPRESSION_RATIO
+        size += file_size
+    return size * INPUT_MEMORY_FACTOR
+
+
+def estimate_result_memory(entrants_count: int, picks_count: int) -> int:
+    """
+    Estimate the extra memory needed to draw, tabulate and write the results of a
+    draw with the full-materialisation path, once its inputs are loaded.
+    """
+    return min(entrants_count, picks_count) * RESULT_ROW_OVERHEAD
+
+
+class MemoryBudget:
+    """
+    Track peak memory across the phases of a run and check projected usage against
+    an optional budget.
+    """
+
+    def __init__(self, max_memory: int | None = None) -> None:
+        """
+        Arguments:
+            - max_memory (int): Memory budget in bytes. If None, memory is tracked
+                                but no budget is enforced.
+        """
+        self.max_memory = max_memory
+        self.phases = {}
+
+    def record(self, name: str) -> None:
+        """
+        Record the peak memory reached by the end of a phase, e.g. "loading".
+        """
+        self.phases[name] = get_peak_memory()
+        logger.debug(f"Peak memory after {name}: {format_size(self.phases[name])}")
+
+    @property
+    def peak(self) -> int | None:
+        return get_peak_memory()
+
+    def exceeds(self, projected: int) -> bool:
+        """
+        Return True if allocating a further `projected` bytes would take the
+        process over the budget.
+        """
+        if self.max_memory is None:
+            return False
+        current = get_current_memory()
+        if current is None:
+            return False
+        over = current + projected > self.max_memory
+        logger.debug(
+            f"Memory budget check: current {format_size(current)} + projected "
+            f"{format_size(projected)} vs budget {format_size(self.max_memory)} "
+            f"({'over' if over else 'within'} budget)"
+        )
+        return over
@@ -0,0 +1,151 @@
+import click
+
+from sweeper.io import get_path_suffix
+from sweeper.option_required_if import OptionRequiredIf
+from sweeper.sqlite import is_sqlite_uri, parse_sqlite_uri
+
+
+SIZE_UNITS = {"": 1, "K": 1024, "M": 1024**2, "G": 1024**3, "T": 1024**4}
+
+
+class ByteSize(click.ParamType):
+    """
+    Click parameter type for a size in bytes, e.g. "512M", "2G" or "1024".
+    """
+
+    name = "size"
+
+    def convert(self, value, param, ctx) -> int:
+        if isinstance(value, int):
+            return value
+        text = str(value).strip().upper().removesuffix("B")
+        unit = text[-1:] if text[-1:] in SIZE_UNITS else ""
+        try:
+            size = float(text.removesuffix(unit)) * SIZE_UNITS[unit]
+        except ValueError:
+            self.fail(f"{value!r} is not a valid size, e.g. 512M or 2G", param, ctx)
+        if size < 0:
+            self.fail(f"{value!r} must not be negative", param, ctx)
+        return int(size)
+
+
+class HostPort(click.ParamType):
+    """
+    Click parameter type for a network address, e.g. "0.0.0.0:8000" or ":8000" for
+    all interfaces. Returns a (host, port) tuple.
+    """
+
+    name = "host:port"
+
+    def convert(self, value, param, ctx) -> tuple[str, int]:
+        if isinstance(value, tuple):
+            return value
+        host, separator, port = str(value).rpartition(":")
+        if not separator or not port.isdigit() or int(port) > 65535:
+            self.fail(
+                f"{value!r} is not a valid address, e.g. 0.0.0.0:8000", param, ctx
+            )
+        # Strip the brackets from IPv6 addresses, e.g. [::1]:8000
+        return host.strip("[]") or "0.0.0.0", int(port)
+
+
+class PathOrURI(click.Path):
+    """
+    Click parameter type for a file path that also accepts SQLite URIs, e.g.
+    "sqlite:///roster.db?table=staff&column=name". URIs are returned as strings;
+    if `exists` is set, the database file must exist.
+    """
+
+    def convert(self, value, param, ctx):
+        if not is_sqlite_uri(value):
+            return super().convert(value, param, ctx)
+        try:
+            database, _ = parse_sqlite_uri(value)
+        except ValueError as error:
+            self.fail(str(error), param, ctx)
+        if self.exists and not database.exists():
+            self.fail(f"SQLite database {str(database)!r} does not exist.", param, ctx)
+        return str(value)
+
+
+def input_options(func=None, *, required: bool = True):
+    """
+    Decorator adding the entrants and picks input options shared by commands that
+    read sweepstake inputs. Use as `@input_options`, or as
+    `@input_options(required=False)` if the command can run without inputs.
+    """
+    if func is None:
+        return lambda func: input_options(func, required=required)
+
+    options = [
+        click.option(
+            "-e",
+            "--entrants",
+            required=required,
+            type=PathOrURI(exists=True, readable=True, dir_okay=False, allow_dash=True),
+            help="Path to file containing list of entrants, or - to read from "
+            "stdin. Files may be compressed with gzip, bzip2 or xz. Also accepts a "
+            "SQLite URI, e.g. sqlite:///roster.db?table=staff&column=name",
+        ),
+        click.option(
+            "--entrants-column",
+            cls=OptionRequiredIf,
+            required_if_option="entrants",
+            required_if_value=".csv",
+            required_if_value_transform=get_path_suffix,
+            type=str,
+            help="Column name or index to use from entrants file, if a CSV file, "
+            "path to the entrants if a .json or .jsonl file (e.g. staff[*].name), "
+            "or column name if a SQLite URI without a column parameter.",
+        ),
+        click.option(
+            "-p",
+            "--picks",
+            required=required,
+            type=PathOrURI(exists=True, readable=True, dir_okay=False, allow_dash=True),
+            help="Path to file containing list of picks, or - to read from stdin. "
+            "Files may be compressed with gzip, bzip2 or xz. Also accepts a SQLite "
+            "URI, e.g. sqlite:///teams.db?table=teams&column=name",
+        ),
+        click.option(
+            "--picks-column",
+            cls=OptionRequiredIf,
+            required_if_option="picks",
+            required_if_value=".csv",
+            required_if_value_transform=get_path_suffix,
+            type=str,
+            help="Column name or index to use from picks file, if a CSV file, "
+            "path to the picks if a .json or .jsonl file (e.g. staff[*].name), "
+            "or column name if a SQLite URI without a column parameter.",
+        ),
+        click.option(
+            "--casefold",
+            is_flag=True,
+            default=False,
+            help="If set, entries differing only by case are treated as duplicates",
+        ),
+        click.option(
+            "--cache-dir",
+            type=click.Path(file_okay=False, writable=True),
+            help="Directory to cache parsed inputs in. Re-running against unchanged "
+            "files loads them from the cache instead of parsing them again",
+        ),
+        click.option(
+            "--cache-max-size",
+            type=ByteSize(),
+            default="1G",
+            show_default=True,
+            help="Maximum size of the cache directory. Least recently used entries "
+            "are evicted first",
+        ),
+        click.option(
+            "--workers",
+            type=click.IntRange(min=1),
+            help="Number of processes to parse large, uncompressed CSV inputs "
+            "with. Default is one per CPU. Pass 1 to parse in a single process",
+        ),
+    ]
+    # Apply in reverse so options are listed in the order above
+    for option in reversed(options):
+        func = option(func)
+    return func
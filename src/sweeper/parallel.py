@@ -0,0 +1,253 @@
+import csv
+import io
+import logging
+import multiprocessing
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from sweeper.column import StringColumn, StringColumnBuilder
+from sweeper.io import get_compression_suffix, is_stdio, parse_column
+
+
+logger = logging.getLogger(__name__)
+
+# CSV files smaller than this are parsed in a single process, as starting a process
+# pool would take longer than it saves
+DEFAULT_PARALLEL_THRESHOLD = 32 * 1024**2
+# Byte ranges are between these sizes, aiming for a few per worker so that ranges
+# with more rows than others don't hold up the rest
+MIN_CHUNK_SIZE = 4 * 1024**2
+MAX_CHUNK_SIZE = 64 * 1024**2
+CHUNKS_PER_WORKER = 4
+
+
+def get_default_workers() -> int:
+    """
+    Return the number of processes to parse with by default: one per CPU available
+    to this process.
+    """
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def get_process_context():
+    """
+    Return the multiprocessing context to start parsing processes with.
+
+    Inputs are loaded on threads (see `sweeper.validate.load_validated_inputs`),
+    and forking while other threads hold locks can deadlock the child, so
+    processes are started by a fork server, or spawned where there isn't one.
+    """
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context("forkserver")
+        # Import the parsing code once in the server rather than in every process
+        context.set_forkserver_preload(["sweeper.parallel"])
+        return context
+    return multiprocessing.get_context("spawn")
+
+
+def can_parse_in_parallel(
+    filepath: Path | str,
+    workers: int,
+    threshold: int = DEFAULT_PARALLEL_THRESHOLD,
+) -> bool:
+    """
+    Return True if a file is an uncompressed CSV file of at least `threshold` bytes,
+    so it can be split into byte ranges, and there is more than one worker.
+    """
+    if workers < 2 or is_stdio(filepath) or "://" in str(filepath):
+        return False
+    filepath = Path(filepath)
+    if filepath.suffix != ".csv" or get_compression_suffix(filepath):
+        return False
+    return filepath.stat().st_size >= threshold
+
+
+def read_header(filepath: Path) -> tuple[list[str], int, int]:
+    """
+    Return a CSV file's header row, the byte offset just after it, and the number
+    of lines it spans.
+    """
+    with open(filepath, "rb") as in_file:
+        lines = []
+        for line in in_file:
+            lines.append(line)
+            # Keep reading while the header has an open quoted field
+            if b"".join(lines).count(b'"') % 2 == 0:
+                break
+    data = b"".join(lines)
+    header = next(csv.reader(io.StringIO(data.decode("utf-8"), newline="")), None)
+    return header, len(data), len(lines)
+
+
+def scan_chunk(filepath: Path, start: int, end: int) -> tuple[int, int, list]:
+    """
+    Scan the bytes of a file from `start` to `end` for where records could begin.
+
+    Whether a newline ends a record depends on whether it is inside a quoted field,
+    which depends on the number of quotes before it in the whole file. Escaped
+    quotes are doubled, so only the parity of that count matters. As the parity at
+    `start` isn't known yet, the first record boundary is found for both: for each
+    parity of the quotes before `start`, the offset just after the first newline
+    outside quotes, and the number of newlines up to it, or None if there isn't one.
+
+    Returns a tuple of (quotes, newlines, boundaries), where `quotes` and `newlines`
+    count the quote and newline characters in the range.
+    """
+    with open(filepath, "rb") as in_file:
+        in_file.seek(start)
+        data = in_file.read(end - start)
+
+    boundaries = [None, None]
+    position = 0
+    quotes = 0
+    newlines = 0
+    while None in boundaries:
+        newline = data.find(b"\n", position)
+        if newline < 0:
+            break
+        quotes += data.count(b'"', position, newline)
+        newlines += 1
+        # A newline is outside quotes if the quotes before it in the file are even
+        for parity in [0, 1]:
+            if boundaries[parity] is None and (parity + quotes) % 2 == 0:
+                boundaries[parity] = (start + newline + 1, newlines)
+        position = newline + 1
+    return data.count(b'"'), data.count(b"\n"), boundaries
+
+
+def find_record_ranges(
+    filepath: Path, start: int, first_line: int, chunk_size: int, pool
+) -> list[tuple[int, int, int]]:
+    """
+    Split a CSV file from `start` (just after the header) into byte ranges of about
+    `chunk_size` bytes, each starting and ending on a record boundary, scanning the
+    chunks in parallel.
+
+    Returns a list of (start, end, line number before start) tuples.
+    """
+    size = Path(filepath).stat().st_size
+    starts = list(range(start, size, chunk_size))
+    ends = starts[1:] + [size]
+    scans = pool.map(scan_chunk, [filepath] * len(starts), starts, ends)
+
+    ranges = [(start, first_line)]
+    quotes = 0
+    lines = first_line
+    for index, (chunk_quotes, chunk_newlines, boundaries) in enumerate(scans):
+        if index > 0:
+            boundary = boundaries[quotes % 2]
+            # A record longer than a chunk has no boundary in it, so the range
+            # before it carries on into the next chunk
+            if boundary is not None:
+                offset, newlines = boundary
+                ranges.append((offset, lines + newlines))
+        quotes += chunk_quotes
+        lines += chunk_newlines
+    return [
+        (range_start, range_end, line)
+        for (range_start, line), (range_end, _) in zip(ranges, ranges[1:] + [(size, 0)])
+    ]
+
+
+def parse_range(
+    filepath: Path, start: int, end: int, first_line: int, column_index: int
+) -> tuple[StringColumn, array]:
+    """
+    Parse the records in a byte range of a CSV file, returning the stripped,
+    non-blank values of one column as a StringColumn, and an array of their line
+    numbers.
+    """
+    with open(filepath, "rb") as in_file:
+        in_file.seek(start)
+        text = in_file.read(end - start).decode("utf-8")
+
+    builder = StringColumnBuilder()
+    line_numbers = array("Q")
+    reader = csv.reader(io.StringIO(text, newline=""))
+    for row in reader:
+        if not row:
+            continue
+        try:
+            value = row[column_index].strip()
+        except IndexError:
+            raise IndexError(
+                f"Column index {column_index} out of range on line "
+                f"{first_line + reader.line_num}."
+            )
+        if value:
+            builder.append(value)
+            line_numbers.append(first_line + reader.line_num)
+    return builder.build(), line_numbers
+
+
+def get_chunk_size(size: int, workers: int) -> int:
+    chunk_size = size // (workers * CHUNKS_PER_WORKER) + 1
+    return max(MIN_CHUNK_SIZE, min(MAX_CHUNK_SIZE, chunk_size))
+
+
+def load_csv_column_parallel(
+    filepath: Path,
+    column: str | int,
+    workers: int | None = None,
+    chunk_size: int | None = None,
+) -> tuple[StringColumn, array]:
+    """
+    Parse one column of a large, uncompressed CSV file using a pool of processes.
+
+    The file is split into byte ranges aligned on record boundaries, so quoted
+    fields spanning lines are never split, and each range is parsed in its own
+    process. Values are stripped and blank ones skipped, as with
+    `normalise_entries`. The parsed slices are merged in file order into one
+    compact StringColumn.
+
+    Returns a tuple of (column, line numbers), where `line numbers` is an array of
+    the line each value was read from.
+
+    Arguments:
+        - filepath (Path):   CSV file with a header row
+        - column (str|int):  Column name or index to read
+        - workers (int):     Number of processes. Default is one per CPU.
+        - chunk_size (int):  Approximate size of each byte range in bytes. Default
+                             is chosen from the file size and number of workers.
+    """
+    filepath = Path(filepath)
+    workers = workers or get_default_workers()
+    header, header_end, header_lines = read_header(filepath)
+    if header is None:
+        raise ValueError(f"CSV file {filepath} is empty.")
+    column = parse_column(column)
+    if isinstance(column, int):
+        column_index = column
+    else:
+        try:
+            column_index = header.index(column)
+        except ValueError:
+            raise ValueError(f"Column '{column}' not found in file header.")
+
+    size = filepath.stat().st_size
+    chunk_size = chunk_size or get_chunk_size(size, workers)
+    with ProcessPoolExecutor(
+        max_workers=workers, mp_context=get_process_context()
+    ) as pool:
+        ranges = find_record_ranges(
+            filepath, header_end, header_lines, chunk_size, pool
+        )
+        logger.debug(
+            f"Parsing {filepath} in {len(ranges)} ranges with {workers} processes"
+        )
+        parts = pool.map(
+            parse_range,
+            [filepath] * len(ranges),
+            *zip(*ranges),
+            [column_index] * len(ranges),
+        )
+        columns = []
+        line_numbers = array("Q")
+        for part, part_line_numbers in parts:
+            columns.append(part)
+            line_numbers.extend(part_line_numbers)
+    return StringColumn.concat(columns), line_numbers
@@ -0,0 +1,168 @@
+import sys
+import time
+from collections import deque
+from typing import TYPE_CHECKING
+
+
+if TYPE_CHECKING:
+    from sweeper.broadcast import DrawBroadcast
+
+
+DEFAULT_RECENT_WINDOW = 5
+# Minimum seconds between progress bar redraws
+DEFAULT_REFRESH_INTERVAL = 0.1
+BAR_WIDTH = 30
+# ANSI escape codes: move the cursor up N lines to column 1, and clear to end of line
+CURSOR_UP = "\x1b[{}F"
+CLEAR_LINE = "\x1b[K"
+
+
+def format_duration(seconds: float | None) -> str:
+    """
+    Format a number of seconds as H:MM:SS, or "--:--:--" if unknown.
+    """
+    if seconds is None:
+        return "--:--:--"
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02}:{seconds:02}"
+
+
+def present_round(
+    index: int,
+    entrant: str,
+    pick: str,
+    draw_order: str,
+    delay: float,
+    broadcast: "DrawBroadcast | None" = None,
+) -> None:
+    """
+    Print the reveal for a single draw round, pausing between each step. If
+    `broadcast` is passed, viewers are shown each step as it is printed.
+    """
+    if draw_order in ["entrants", "shuffle"]:
+        print(f"Entrant {index + 1}: {entrant}")
+        if broadcast is not None:
+            broadcast.publish_drawing(index, entrant, draw_order)
+        time.sleep(delay)
+        print("\nDrawing...\n")
+        time.sleep(delay)
+        print(f"{entrant} ... draws ... {pick}\n")
+    else:
+        print(f"Pick {index + 1}: {pick}")
+        if broadcast is not None:
+            broadcast.publish_drawing(index, pick, draw_order)
+        time.sleep(delay)
+        print("\nDrawing...\n")
+        time.sleep(delay)
+        print(f"{pick} ... drawn by ... {entrant}\n")
+    if broadcast is not None:
+        broadcast.publish_round(index, entrant, pick, draw_order)
+    time.sleep(delay * 2)
+    print("------------------------------------\n")
+
+
+def format_assignment(entrant: str, pick: str, draw_order: str) -> str:
+    """
+    Format a single round for the recent assignments window.
+    """
+    if draw_order in ["entrants", "shuffle"]:
+        return f"{entrant} ... draws ... {pick}"
+    return f"{pick} ... drawn by ... {entrant}"
+
+
+class ProgressPresenter:
+    """
+    Present a draw as a progress bar with throughput, ETA and a window of the most
+    recent assignments, instead of revealing each round in turn.
+
+    Rounds are counted as they are drawn, but the display is only redrawn every
+    `interval` seconds, as a single write and flush, so terminal output does not
+    slow down large draws. On a terminal the display is redrawn in place; otherwise
+    a progress line is written at each refresh.
+    """
+
+    def __init__(
+        self,
+        total: int,
+        draw_order: str = "entrants",
+        window: int = DEFAULT_RECENT_WINDOW,
+        interval: float = DEFAULT_REFRESH_INTERVAL,
+        stream=None,
+    ) -> None:
+        """
+        Arguments:
+            - total (int):      Total number of rounds in the draw
+            - draw_order (str): Draw order, used to word the recent assignments
+            - window (int):     Number of recent assignments to show
+            - interval (float): Minimum seconds between redraws
+            - stream:           Stream to write to. Default is `sys.stdout` at the
+                                time of writing.
+        """
+        self.total = total
+        self.draw_order = draw_order
+        self.interval = interval
+        self.stream = stream
+        self.recent = deque(maxlen=window)
+        self.count = 0
+        self._start_count = None
+        self._start_time = None
+        self._last_render = None
+        self._rendered_lines = 0
+
+    def update(self, index: int, entrant: str, pick: str) -> None:
+        """
+        Record a drawn round, redrawing the display if the refresh interval has
+        passed.
+        """
+        now = time.monotonic()
+        if self._start_time is None:
+            # Rounds committed before a resumed draw don't count towards throughput
+            self._start_count = index
+            self._start_time = now
+        self.count = index + 1
+        self.recent.append((entrant, pick))
+        if self._last_render is None or now - self._last_render >= self.interval:
+            self.render(now)
+
+    def close(self) -> None:
+        """
+        Redraw the display with the final counts.
+        """
+        self.render(time.monotonic())
+
+    def render(self, now: float) -> None:
+        stream = self.stream if self.stream is not None else sys.stdout
+        in_place = stream.isatty()
+        lines = [self.format_progress(now)]
+        if in_place:
+            lines += [
+                f"  {format_assignment(entrant, pick, self.draw_order)}"
+                for entrant, pick in self.recent
+            ]
+
+        text = ""
+        if in_place:
+            if self._rendered_lines:
+                text += CURSOR_UP.format(self._rendered_lines)
+            lines = [f"{line}{CLEAR_LINE}" for line in lines]
+        text += "\n".join(lines) + "\n"
+        stream.write(text)
+        stream.flush()
+        self._rendered_lines = len(lines)
+        self._last_render = now
+
+    def format_progress(self, now: float) -> str:
+        fraction = self.count / self.total if self.total else 1.0
+        filled = int(BAR_WIDTH * fraction)
+        bar = "#" * filled + "-" * (BAR_WIDTH - filled)
+
+        elapsed = now - self._start_time if self._start_time is not None else 0
+        drawn = self.count - (self._start_count or 0)
+        rate = drawn / elapsed if elapsed > 0 else None
+        eta = (self.total - self.count) / rate if rate else None
+        rate_text = f"{rate:,.0f}" if rate is not None else "-"
+        return (
+            f"[{bar}] {fraction:6.1%} {self.count}/{self.total} rounds | "
+            f"{rate_text} rounds/s | ETA {format_duration(eta)}"
+        )
@@ -0,0 +1,226 @@
+from array import array
+from collections.abc import ItemsView, Iterator, Mapping, Sequence
+
+
+def get_positions(values: Sequence[str]) -> dict[str, int]:
+    """
+    Return a dictionary mapping each value to its index in `values`.
+    """
+    return {value: index for index, value in enumerate(values)}
+
+
+def get_rounds(indexes: array, size: int) -> array:
+    """
+    Invert an array of indexes drawn from `range(size)`, returning an array mapping
+    each index to the round it was drawn in, or -1 if it was not drawn.
+    """
+    rounds = array("q", [-1]) * size
+    for round_index, index in enumerate(indexes):
+        rounds[index] = round_index
+    return rounds
+
+
+class DrawResult:
+    """
+    Compact result of a draw.
+
+    Rather than a dictionary of strings, the result holds the entrants and picks it
+    was drawn from once, with two parallel arrays of indexes into them: the
+    entrant and pick assigned in each round, in draw order. Iterating yields
+    (entrant, pick) tuples in draw order.
+
+    `pick_for` and `entrant_for` look up assignments in either direction in O(1).
+    The lookup tables are built on first use. Use `as_mapping()` where a read-only
+    dictionary of entrants to picks is expected, e.g. by the writers in
+    `sweeper.io`.
+    """
+
+    __slots__ = (
+        "entrants",
+        "picks",
+        "entrant_indexes",
+        "pick_indexes",
+        "seed",
+        "_entrant_positions",
+        "_pick_positions",
+        "_entrant_rounds",
+        "_pick_rounds",
+    )
+
+    def __init__(
+        self,
+        entrants: Sequence[str],
+        picks: Sequence[str],
+        entrant_indexes: array,
+        pick_indexes: array,
+        seed: int | None = None,
+        entrant_positions: dict[str, int] | None = None,
+        pick_positions: dict[str, int] | None = None,
+    ) -> None:
+        """
+        Arguments:
+            - entrants (Sequence): Entrants the draw was made from
+            - picks (Sequence):    Picks the draw was made from
+            - entrant_indexes (array): Index into `entrants` for each round
+            - pick_indexes (array): Index into `picks` for each round
+            - seed (int):          Seed the draw was made with, if known
+            - entrant_positions (dict): Index of each entrant in `entrants`, if
+                                   already built, e.g. shared between the draws of a
+                                   Sweepstake. Built on first lookup otherwise.
+            - pick_positions (dict): Index of each pick in `picks`, as above
+        """
+        self.entrants = entrants
+        self.picks = picks
+        self.entrant_indexes = entrant_indexes
+        self.pick_indexes = pick_indexes
+        self.seed = seed
+        self._entrant_positions = entrant_positions
+        self._pick_positions = pick_positions
+        self._entrant_rounds = None
+        self._pick_rounds = None
+
+    @classmethod
+    def from_pairs(
+        cls,
+        entrants: Sequence[str],
+        picks: Sequence[str],
+        pairs,
+        seed: int | None = None,
+    ) -> "DrawResult":
+        """
+        Build a result from (entrant, pick) tuples in draw order, e.g. from a
+        results file or a dictionary's items.
+        """
+        entrant_positions = get_positions(entrants)
+        pick_positions = get_positions(picks)
+        entrant_indexes = array("L")
+        pick_indexes = array("L")
+        for entrant, pick in pairs:
+            entrant_indexes.append(entrant_positions[entrant])
+            pick_indexes.append(pick_positions[pick])
+        return cls(
+            entrants,
+            picks,
+            entrant_indexes,
+            pick_indexes,
+            seed=seed,
+            entrant_positions=entrant_positions,
+            pick_positions=pick_positions,
+        )
+
+    def __len__(self) -> int:
+        return len(self.entrant_indexes)
+
+    def __iter__(self) -> Iterator[tuple[str, str]]:
+        """
+        Yield (entrant, pick) tuples in draw order.
+        """
+        entrants = self.entrants
+        picks = self.picks
+        for entrant_index, pick_index in zip(self.entrant_indexes, self.pick_indexes):
+            yield entrants[entrant_index], picks[pick_index]
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, DrawResult):
+            return NotImplemented
+        return list(self) == list(other)
+
+    def __repr__(self) -> str:
+        return f"DrawResult({len(self)} rounds, seed={self.seed})"
+
+    def items(self) -> Iterator[tuple[str, str]]:
+        """
+        Yield (entrant, pick) tuples in draw order, as `dict.items()` does.
+        """
+        return iter(self)
+
+    def pick_for(self, entrant: str) -> str:
+        """
+        Return the pick drawn by `entrant`. Raises KeyError if they drew nothing.
+        """
+        if self._entrant_positions is None:
+            self._entrant_positions = get_positions(self.entrants)
+        if self._entrant_rounds is None:
+            self._entrant_rounds = get_rounds(self.entrant_indexes, len(self.entrants))
+        position = self._entrant_positions.get(entrant)
+        if position is None or self._entrant_rounds[position] < 0:
+            raise KeyError(entrant)
+        return self.picks[self.pick_indexes[self._entrant_rounds[position]]]
+
+    def entrant_for(self, pick: str) -> str:
+        """
+        Return the entrant who drew `pick`. Raises KeyError if it was not drawn.
+        """
+        if self._pick_positions is None:
+            self._pick_positions = get_positions(self.picks)
+        if self._pick_rounds is None:
+            self._pick_rounds = get_rounds(self.pick_indexes, len(self.picks))
+        position = self._pick_positions.get(pick)
+        if position is None or self._pick_rounds[position] < 0:
+            raise KeyError(pick)
+        return self.entrants[self.entrant_indexes[self._pick_rounds[position]]]
+
+    def as_mapping(self) -> "ResultView":
+        """
+        Return a read-only view of the result mapping entrants to picks, in draw
+        order, without copying it into a dictionary.
+        """
+        return ResultView(self)
+
+    def by_pick(self) -> "ResultView":
+        """
+        Return a read-only view of the result mapping picks to entrants, in draw
+        order.
+        """
+        return ResultView(self, by_pick=True)
+
+    def to_dict(self) -> dict[str, str]:
+        """
+        Return the result as a dictionary mapping entrants to picks, in draw order.
+        """
+        return dict(self)
+
+
+class ResultView(Mapping):
+    """
+    Lazy, read-only Mapping over a DrawResult, from entrants to picks or from picks
+    to entrants. Lookups are O(1) and iteration follows draw order.
+    """
+
+    __slots__ = ("_result", "_by_pick")
+
+    def __init__(self, result: DrawResult, by_pick: bool = False) -> None:
+        self._result = result
+        self._by_pick = by_pick
+
+    def __getitem__(self, key: str) -> str:
+        if self._by_pick:
+            return self._result.entrant_for(key)
+        return self._result.pick_for(key)
+
+    def __iter__(self) -> Iterator[str]:
+        result = self._result
+        if self._by_pick:
+            return (result.picks[index] for index in result.pick_indexes)
+        return (result.entrants[index] for index in result.entrant_indexes)
+
+    def __len__(self) -> int:
+        return len(self._result)
+
+    def items(self) -> "ResultItemsView":
+        return ResultItemsView(self)
+
+    def __repr__(self) -> str:
+        return f"ResultView({self._result!r}, by_pick={self._by_pick})"
+
+
+class ResultItemsView(ItemsView):
+    """
+    Items of a ResultView, read straight from the result's index arrays in draw
+    order rather than by looking up each key.
+    """
+
+    def __iter__(self) -> Iterator[tuple[str, str]]:
+        view = self._mapping
+        for entrant, pick in view._result:
+            yield (pick, entrant) if view._by_pick else (entrant, pick)
@@ -0,0 +1,93 @@
+import os
+import random
+
+
+RNG_NAMES = ["default", "secure"]
+# Bytes read from the operating system's CSPRNG at a time
+DEFAULT_BLOCK_SIZE = 64 * 1024
+
+
+class BufferedSecureRandom(random.Random):
+    """
+    Cryptographically secure random number generator reading `os.urandom` in
+    large blocks.
+
+    `random.SystemRandom` makes a system call for every number drawn. This reads
+    `block_size` bytes at a time and serves random bits from the buffer instead.
+    Bounded integers (`randint`, `randrange`, `shuffle`) are sampled without bias
+    by `random.Random`, which draws just enough bits from `getrandbits` and rejects
+    values out of range.
+
+    Like SystemRandom, it can't be seeded and has no state to save or restore, so
+    draws made with it can't be reproduced.
+    """
+
+    def __init__(self, block_size: int = DEFAULT_BLOCK_SIZE) -> None:
+        self._block_size = block_size
+        self._buffer = b""
+        self._position = 0
+        super().__init__()
+
+    def _refill(self, size: int) -> None:
+        # Keep unused bytes and read at least a block more
+        remainder = self._buffer[self._position :]
+        self._buffer = remainder + os.urandom(max(self._block_size, size))
+        self._position = 0
+
+    def _read(self, size: int) -> bytes:
+        if self._position + size > len(self._buffer):
+            self._refill(size)
+        data = self._buffer[self._position : self._position + size]
+        self._position += size
+        return data
+
+    def getrandbits(self, k: int) -> int:
+        if k < 0:
+            raise ValueError("number of bits must be non-negative")
+        if k == 0:
+            return 0
+        size = (k + 7) // 8
+        position = self._position
+        if position + size > len(self._buffer):
+            self._refill(size)
+            position = 0
+        # Inlined rather than calling _read, as this is called once per round
+        value = int.from_bytes(self._buffer[position : position + size], "little")
+        self._position = position + size
+        # Drop the excess bits from the last byte
+        return value >> (size * 8 - k)
+
+    def random(self) -> float:
+        return self.getrandbits(53) * 2**-53
+
+    def randbytes(self, n: int) -> bytes:
+        return self._read(n)
+
+    def seed(self, *args, **kwargs) -> None:
+        # Called by random.Random.__init__; secure generators can't be seeded
+        return None
+
+    def getstate(self):
+        raise NotImplementedError("Secure random number generators have no state.")
+
+    def setstate(self, state):
+        raise NotImplementedError("Secure random number generators have no state.")
+
+
+def get_rng(name: str = "default", seed: int | None = None) -> random.Random:
+    """
+    Return a random number generator by name.
+
+    Arguments:
+        - name (str): "default" for Python's Mersenne Twister, seeded with `seed` so
+                      draws can be reproduced, or "secure" for a buffered CSPRNG,
+                      which can't be seeded
+        - seed (int): Seed for the default generator
+    """
+    if name == "secure":
+        if seed is not None:
+            raise ValueError("The secure random number generator can't be seeded.")
+        return BufferedSecureRandom()
+    if name == "default":
+        return random.Random(seed)
+    raise ValueError(f"rng must be one of {', '.join(RNG_NAMES)}, got {name}")
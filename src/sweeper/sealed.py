@@ -0,0 +1,289 @@
+import hashlib
+import json
+import logging
+import mmap
+import os
+import struct
+import sys
+from array import array
+from collections.abc import Iterator, Mapping
+from contextlib import nullcontext
+from pathlib import Path
+
+import click
+
+from sweeper.options import HostPort
+from sweeper.presentation import present_round
+
+
+logger = logging.getLogger(__name__)
+
+SEALED_MAGIC = b"SWEEPSLD"
+SEALED_VERSION = 1
+# Magic, version, length of the JSON draw details and number of rounds
+SEALED_HEADER = struct.Struct("<8sIxxxxQQ")
+# Offset of each round's record from the start of the records, then the end offset
+SEALED_OFFSET = struct.Struct("<Q")
+# Each record is the entrant then the pick, each prefixed with its big-endian byte
+# length: the encoding hashed for draw commitments, so the records can be checked
+# against the committed result digest in one pass
+LENGTH_PREFIX = 8
+
+
+def encode_round(entrant: str, pick: str) -> bytes:
+    parts = []
+    for value in [entrant, pick]:
+        data = value.encode("utf-8")
+        parts.append(len(data).to_bytes(LENGTH_PREFIX, "big"))
+        parts.append(data)
+    return b"".join(parts)
+
+
+def write_sealed(
+    path: Path,
+    result: Mapping[str, str],
+    draw_order: str,
+    commitment: dict,
+    undrawn: int = 0,
+) -> None:
+    """
+    Write a drawn result to a sealed draw file, to be revealed later with
+    `SealedDraw`. Rounds are stored in draw order with an offset table, so any
+    round can be read without reading those before it.
+
+    Arguments:
+        - path (Path):        File to write
+        - result (Mapping):   Result in draw order, e.g. from `draw`
+        - draw_order (str):   Draw order, used to word the reveal
+        - commitment (dict):  Draw commitment for the result, from
+                              `build_commitment`
+        - undrawn (int):      Number of picks left undrawn, shown when the reveal
+                              ends
+    """
+    path = Path(path)
+    offsets = array("Q", [0])
+    for entrant, pick in result.items():
+        size = 2 * LENGTH_PREFIX + len(entrant.encode("utf-8"))
+        offsets.append(offsets[-1] + size + len(pick.encode("utf-8")))
+    if sys.byteorder != "little":
+        offsets.byteswap()
+    details = json.dumps(
+        {"draw_order": draw_order, "commitment": commitment, "undrawn": undrawn}
+    ).encode()
+
+    temp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(temp_path, "wb") as sealed_file:
+        sealed_file.write(
+            SEALED_HEADER.pack(
+                SEALED_MAGIC, SEALED_VERSION, len(details), len(offsets) - 1
+            )
+        )
+        sealed_file.write(details)
+        offsets.tofile(sealed_file)
+        for entrant, pick in result.items():
+            sealed_file.write(encode_round(entrant, pick))
+    os.replace(temp_path, path)
+    logger.debug(f"Sealed {len(offsets) - 1} rounds in {path}")
+
+
+class SealedDraw:
+    """
+    A sealed draw file, memory-mapped so rounds are read lazily as they are
+    revealed. Opening it reads only the header, however many rounds it holds.
+
+    Example:
+        with SealedDraw("draw.sealed") as sealed:
+            sealed.verify()
+            for index, entrant, pick in sealed.iter_rounds(start=10):
+                ...
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        with open(self.path, "rb") as sealed_file:
+            self._mmap = mmap.mmap(sealed_file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            if len(self._mmap) < SEALED_HEADER.size:
+                raise ValueError(f"{self.path} is not a supported sealed draw file")
+            magic, version, details_length, rounds = SEALED_HEADER.unpack_from(
+                self._mmap
+            )
+            if magic != SEALED_MAGIC or version != SEALED_VERSION:
+                raise ValueError(f"{self.path} is not a supported sealed draw file")
+            details_end = SEALED_HEADER.size + details_length
+            details = json.loads(self._mmap[SEALED_HEADER.size : details_end])
+        except BaseException:
+            self._mmap.close()
+            raise
+        self.draw_order = details["draw_order"]
+        self.commitment = details["commitment"]
+        self.undrawn = details["undrawn"]
+        self.rounds = rounds
+        self._offsets_start = details_end
+        self._records_start = details_end + (rounds + 1) * SEALED_OFFSET.size
+
+    def __enter__(self) -> "SealedDraw":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self.rounds
+
+    def close(self) -> None:
+        self._mmap.close()
+
+    def _offset(self, index: int) -> int:
+        (offset,) = SEALED_OFFSET.unpack_from(
+            self._mmap, self._offsets_start + index * SEALED_OFFSET.size
+        )
+        return self._records_start + offset
+
+    def _read_value(self, position: int) -> tuple[str, int]:
+        length = int.from_bytes(self._mmap[position : position + LENGTH_PREFIX], "big")
+        start = position + LENGTH_PREFIX
+        return str(self._mmap[start : start + length], "utf-8"), start + length
+
+    def __getitem__(self, index: int) -> tuple[str, str]:
+        """
+        Return the (entrant, pick) drawn in a round, counting from 0.
+        """
+        if index < 0:
+            index += self.rounds
+        if not 0 <= index < self.rounds:
+            raise IndexError("Round out of range")
+        entrant, position = self._read_value(self._offset(index))
+        pick, _ = self._read_value(position)
+        return entrant, pick
+
+    def iter_rounds(
+        self, start: int = 0, stop: int | None = None
+    ) -> Iterator[tuple[int, str, str]]:
+        """
+        Yield (index, entrant, pick) tuples for rounds `start` up to but not
+        including `stop`, counting from 0, reading each as it is needed.
+        """
+        stop = self.rounds if stop is None else min(stop, self.rounds)
+        if start >= stop:
+            return
+        position = self._offset(start)
+        for index in range(start, stop):
+            entrant, position = self._read_value(position)
+            pick, position = self._read_value(position)
+            yield index, entrant, pick
+
+    def verify(self) -> None:
+        """
+        Raise ValueError if the rounds don't match the committed result digest,
+        hashing the records straight from the file.
+        """
+        end = self._offset(self.rounds)
+        with memoryview(self._mmap)[self._records_start : end] as records:
+            sha256 = hashlib.sha256(records).hexdigest()
+        if (
+            self.rounds != self.commitment["result_count"]
+            or sha256 != self.commitment["result_sha256"]
+        ):
+            raise ValueError(f"{self.path} does not match its draw commitment")
+
+
+@click.command(
+    name="reveal",
+    epilog="""EXAMPLES
+
+Compute a draw ahead of time, then reveal it later:
+
+sweeper draw --entrants entrants.txt --picks picks.txt --sealed draw.sealed
+
+sweeper reveal draw.sealed
+
+Carry on an interrupted reveal from round 40, pausing 2 seconds per step:
+
+sweeper reveal draw.sealed --start-round 40 --delay 2
+""",
+)
+@click.argument(
+    "sealed_file", type=click.Path(exists=True, readable=True, dir_okay=False)
+)
+@click.option(
+    "--delay",
+    default=1.0,
+    show_default=True,
+    type=float,
+    help="Delay between reveal steps in seconds",
+)
+@click.option(
+    "--start-round",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Round to start revealing from",
+)
+@click.option(
+    "--end-round",
+    type=click.IntRange(min=1),
+    help="Last round to reveal. Default is the last round of the draw",
+)
+@click.option(
+    "--broadcast",
+    "broadcast_address",
+    type=HostPort(),
+    help="Address to broadcast the reveal on, e.g. 0.0.0.0:8000, as with "
+    "sweeper draw --broadcast",
+)
+def reveal_command(
+    *,
+    sealed_file: Path,
+    delay: float = 1.0,
+    start_round: int = 1,
+    end_round: int | None = None,
+    broadcast_address: tuple[str, int] | None = None,
+) -> None:
+    """
+    Reveal a draw sealed with draw --sealed.
+    """
+    logger.debug("START: Running reveal")
+    try:
+        sealed = SealedDraw(sealed_file)
+    except (ValueError, KeyError) as error:
+        raise click.ClickException(str(error))
+    with sealed:
+        try:
+            sealed.verify()
+        except ValueError as error:
+            raise click.ClickException(str(error))
+        end_round = min(end_round or len(sealed), len(sealed))
+        if start_round > end_round:
+            raise click.UsageError(
+                f"--start-round must be at most {end_round}, the last round"
+            )
+        logger.info(
+            f"Revealing rounds {start_round} to {end_round} of {len(sealed)} from "
+            f"{sealed_file} (result {sealed.commitment['result_sha256']})"
+        )
+
+        broadcast = None
+        if broadcast_address:
+            from sweeper.broadcast import DrawBroadcast
+
+            broadcast = DrawBroadcast(*broadcast_address)
+            try:
+                broadcast.start()
+            except OSError as error:
+                raise click.ClickException(
+                    f"Can't broadcast on {broadcast_address[0]}:"
+                    f"{broadcast_address[1]}: {error.strerror or error}"
+                )
+            click.echo(f"Broadcasting reveal at {broadcast.url}", err=True)
+
+        with broadcast if broadcast is not None else nullcontext():
+            if broadcast is not None:
+                broadcast.publish_start(len(sealed), sealed.draw_order)
+            rounds = sealed.iter_rounds(start_round - 1, end_round)
+            for index, entrant, pick in rounds:
+                logger.debug(f"Revealing round {index + 1}: {entrant} - {pick}")
+                present_round(index, entrant, pick, sealed.draw_order, delay, broadcast)
+            if broadcast is not None and end_round == len(sealed):
+                broadcast.publish_complete(len(sealed), sealed.undrawn)
+    click.echo(f"Revealed rounds {start_round} to {end_round} of {len(sealed)}.")
@@ -0,0 +1,220 @@
+import logging
+from collections.abc import Iterator, Mapping
+from contextlib import closing, contextmanager
+from pathlib import Path
+from typing import TYPE_CHECKING
+from urllib.parse import parse_qs
+
+from sweeper.column import ColumnTable
+from sweeper.io import EntriesFormat, ResultsFormat
+
+
+if TYPE_CHECKING:
+    import sqlite3
+
+
+logger = logging.getLogger(__name__)
+
+SQLITE_SCHEME = "sqlite:///"
+DEFAULT_RESULTS_TABLE = "results"
+FETCH_BATCH_SIZE = 10_000
+
+
+def is_sqlite_uri(path: Path | str | None) -> bool:
+    """
+    Return True if the path is a SQLite URI, e.g. "sqlite:///roster.db?table=staff".
+    """
+    return path is not None and str(path).startswith(SQLITE_SCHEME)
+
+
+def parse_sqlite_uri(uri: str) -> tuple[Path, dict[str, str]]:
+    """
+    Split a SQLite URI into the database path and its query parameters.
+
+    "sqlite:///roster.db?table=staff&column=name" gives a relative path
+    "roster.db", and "sqlite:////data/roster.db?..." an absolute path
+    "/data/roster.db".
+    """
+    if not is_sqlite_uri(uri):
+        raise ValueError(f"SQLite URI must start with {SQLITE_SCHEME}, got {uri}")
+    location, _, query = str(uri).removeprefix(SQLITE_SCHEME).partition("?")
+    if not location:
+        raise ValueError(f"SQLite URI {uri} has no database path.")
+    params = {key: values[-1] for key, values in parse_qs(query).items()}
+    return Path(location), params
+
+
+def quote_identifier(name: str) -> str:
+    """
+    Quote a table or column name for use in SQL.
+    """
+    return '"' + name.replace('"', '""') + '"'
+
+
+@contextmanager
+def connect(database: Path):
+    """
+    Open a connection in autocommit mode, so transactions are only started
+    explicitly with BEGIN.
+    """
+    # Imported here so sqlite3 is only loaded once a SQLite URI is used
+    import sqlite3
+
+    with closing(sqlite3.connect(database, isolation_level=None)) as connection:
+        yield connection
+
+
+def iter_sqlite_column(
+    uri: str, column: str | None = None, batch_size: int = FETCH_BATCH_SIZE
+) -> Iterator[tuple[int, str]]:
+    """
+    Stream (row_number, value) tuples for one column of a SQLite table, fetching
+    `batch_size` rows at a time. Row numbers start at 1. The table is given by the
+    URI's `table` parameter, and the column by its `column` parameter or `column`.
+    NULL values are returned as empty strings.
+    """
+    database, params = parse_sqlite_uri(uri)
+    table = params.get("table")
+    column = params.get("column", column)
+    if table is None or column is None:
+        raise ValueError(
+            f"SQLite input {uri} must name a table and column, "
+            f"e.g. {SQLITE_SCHEME}roster.db?table=staff&column=name"
+        )
+    if not database.exists():
+        raise ValueError(f"SQLite database {database} does not exist.")
+
+    logger.debug(f"Reading column {column} from table {table} in {database}")
+    with connect(database) as connection:
+        cursor = connection.execute(
+            f"SELECT {quote_identifier(str(column))} FROM {quote_identifier(table)}"
+        )
+        row_number = 0
+        while rows := cursor.fetchmany(batch_size):
+            for (value,) in rows:
+                row_number += 1
+                yield row_number, "" if value is None else str(value)
+
+
+def get_results_table(uri: str) -> tuple[Path, str]:
+    """
+    Return the database path and results table name for a SQLite results URI.
+    """
+    database, params = parse_sqlite_uri(uri)
+    return database, params.get("table", DEFAULT_RESULTS_TABLE)
+
+
+def insert_results(
+    connection: "sqlite3.Connection",
+    table: str,
+    result: Mapping[str, str],
+    metadata: ColumnTable | None = None,
+) -> None:
+    """
+    Create the results table and its indexes if needed, and insert the results.
+    """
+    columns = ["entrant", "pick"] + (metadata.names if metadata is not None else [])
+    quoted_table = quote_identifier(table)
+    column_definitions = ", ".join(f"{quote_identifier(c)} TEXT" for c in columns)
+    connection.execute(
+        f"CREATE TABLE IF NOT EXISTS {quoted_table} ({column_definitions})"
+    )
+
+    if metadata is None:
+        rows = result.items()
+    else:
+        rows = (
+            (entrant, pick, *metadata.row(entrant).values())
+            for entrant, pick in result.items()
+        )
+    placeholders = ", ".join("?" for _ in columns)
+    quoted_columns = ", ".join(quote_identifier(c) for c in columns)
+    connection.executemany(
+        f"INSERT INTO {quoted_table} ({quoted_columns}) VALUES ({placeholders})", rows
+    )
+    for column in ["entrant", "pick"]:
+        index = quote_identifier(f"{table}_{column}_index")
+        connection.execute(
+            f"CREATE INDEX IF NOT EXISTS {index} ON {quoted_table} ({column})"
+        )
+
+
+def write_result_to_sqlite(
+    result: Mapping[str, str], uri: str, metadata: ColumnTable | None = None
+) -> None:
+    """
+    Write result dictionary to a SQLite table, replacing the table if it exists.
+    The table is given by the URI's `table` parameter (default "results"). All rows
+    are inserted in a single transaction, then indexed by entrant and pick.
+    """
+    database, table = get_results_table(uri)
+    logger.debug(f"Writing {len(result)} results to table {table} in {database}")
+    with connect(database) as connection:
+        connection.execute("BEGIN")
+        try:
+            connection.execute(f"DROP TABLE IF EXISTS {quote_identifier(table)}")
+            insert_results(connection, table, result, metadata)
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        connection.execute("COMMIT")
+
+
+def append_result_to_sqlite(result: Mapping[str, str], uri: str) -> None:
+    """
+    Append result dictionary to a SQLite results table, creating it if it does
+    not exist. Existing rows are not read or rewritten.
+    """
+    database, table = get_results_table(uri)
+    logger.debug(f"Appending {len(result)} results to table {table} in {database}")
+    with connect(database) as connection:
+        connection.execute("BEGIN")
+        try:
+            insert_results(connection, table, result)
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        connection.execute("COMMIT")
+
+
+def iter_result_from_sqlite(
+    uri: str, batch_size: int = FETCH_BATCH_SIZE
+) -> Iterator[tuple[str, str]]:
+    """
+    Yield (entrant, pick) tuples from a SQLite results table in the order they were
+    written. Yields nothing if the database or table does not exist.
+    """
+    database, table = get_results_table(uri)
+    if not database.exists():
+        return
+    with connect(database) as connection:
+        exists = connection.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)
+        ).fetchone()
+        if not exists:
+            return
+        cursor = connection.execute(
+            f"SELECT entrant, pick FROM {quote_identifier(table)} ORDER BY rowid"
+        )
+        while rows := cursor.fetchmany(batch_size):
+            yield from rows
+
+
+class SqliteFormat(EntriesFormat, ResultsFormat):
+    """
+    SQLite tables, named by URIs such as "sqlite:///roster.db?table=staff".
+    """
+
+    appends_results = True
+
+    def iter_entries(self, path, column=None):
+        return iter_sqlite_column(path, column)
+
+    def iter_result(self, path):
+        return iter_result_from_sqlite(path)
+
+    def write_result(self, result, path, metadata=None):
+        write_result_to_sqlite(result=result, uri=path, metadata=metadata)
+
+    def append_result(self, result, path):
+        append_result_to_sqlite(result=result, uri=path)
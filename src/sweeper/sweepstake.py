@@ -0,0 +1,347 @@
+import logging
+import random
+import secrets
+import sys
+from array import array
+from collections.abc import Iterable, Iterator
+from itertools import islice
+from pathlib import Path
+
+from sweeper.cache import InputCache
+from sweeper.derangement import (
+    check_derangeable,
+    check_derangement,
+    iter_derangement_rounds,
+)
+from sweeper.result import DrawResult, get_positions
+from sweeper.validate import check_enough_picks, check_unique, load_validated_inputs
+
+
+logger = logging.getLogger(__name__)
+
+DRAW_ORDERS = ["entrants", "picks", "shuffle"]
+# How each round removes its draw from the pool (see `take_from_pool`). Recorded in
+# draw commitments and journals so older draws can still be recomputed.
+DRAW_ALGORITHMS = [1, 2]
+DRAW_ALGORITHM = 2
+
+
+def check_draw_order(draw_order: str) -> None:
+    """
+    Raise a ValueError if `draw_order` is not a supported draw order.
+    """
+    if draw_order not in DRAW_ORDERS:
+        message = f"draw_order must be one of 'entrants', 'picks', or 'shuffle', got {draw_order}"
+        logger.error(message)
+        raise ValueError(message)
+
+
+def check_draw_algorithm(draw_algorithm: int) -> None:
+    """
+    Raise a ValueError if `draw_algorithm` is not a supported draw algorithm.
+    """
+    if draw_algorithm not in DRAW_ALGORITHMS:
+        message = f"draw_algorithm must be 1 or 2, got {draw_algorithm}"
+        logger.error(message)
+        raise ValueError(message)
+
+
+def take_from_pool(pool: list, index: int, draw_algorithm: int = DRAW_ALGORITHM):
+    """
+    Remove and return the item at `index` in `pool`.
+
+    Draw algorithm 2 moves the last item into its place, so each removal is O(1)
+    (as in a Fisher-Yates shuffle). Draw algorithm 1 shifts every later item down,
+    keeping the pool in its original order, and is kept so draws committed with it
+    can be recomputed.
+    """
+    if draw_algorithm == 1:
+        return pool.pop(index)
+    item = pool[index]
+    pool[index] = pool[-1]
+    pool.pop()
+    return item
+
+
+def remove_drawn(
+    pool: list,
+    drawn: list,
+    *,
+    draw_algorithm: int = DRAW_ALGORITHM,
+    debug: bool = False,
+) -> None:
+    """
+    Remove items already drawn from `pool` (in place), in the order they were
+    drawn, leaving the pool as `iter_draw_rounds` would have left it, e.g. to
+    resume a draw from its journal.
+    """
+    if draw_algorithm == 1 or debug:
+        # The pool keeps its original order
+        drawn_set = set(drawn)
+        pool[:] = [item for item in pool if item not in drawn_set]
+        return
+    positions = {item: index for index, item in enumerate(pool)}
+    for item in drawn:
+        index = positions.pop(item)
+        last = pool.pop()
+        if index < len(pool):
+            pool[index] = last
+            positions[last] = index
+
+
+def iter_draw_rounds(
+    drawers: list,
+    pool: list,
+    *,
+    draw_order: str,
+    rng,
+    debug: bool = False,
+    start: int = 0,
+    log_rounds: bool = True,
+    draw_algorithm: int = DRAW_ALGORITHM,
+) -> Iterator[tuple[int, str, str]]:
+    """
+    Draw one round at a time, yielding (index, entrant, pick) tuples.
+
+    When drawing in order of entrants, `drawers` are the entrants and `pool` the
+    picks. When drawing in order of picks, it's the other way round. Each drawer
+    from `start` onwards removes a random item from `pool` (in place, see
+    `take_from_pool`) until either runs out. In debug mode items are taken in
+    order, and removed from the front of the pool once the draw stops.
+    """
+    taken = 0
+    try:
+        for index in range(start, len(drawers)):
+            if taken == len(pool):
+                break
+            if debug:
+                # If debug mode is on, assign picks (or entrants) in order
+                drawn = pool[taken]
+                taken += 1
+            else:
+                # Remove a random pick (or entrant) from the pool
+                drawn = take_from_pool(
+                    pool, rng.randint(0, len(pool) - 1), draw_algorithm
+                )
+            if draw_order in ["entrants", "shuffle"]:
+                entrant, pick = drawers[index], drawn
+                if log_rounds:
+                    logger.debug(f"Drawing for entrant {index + 1}: {entrant}")
+                    logger.debug(f"Assigned pick {pick} to entrant {entrant}")
+            else:
+                entrant, pick = drawn, drawers[index]
+                if log_rounds:
+                    logger.debug(f"Drawing for pick {index + 1}: {pick}")
+                    logger.debug(f"Pick {pick} drawn by entrant {entrant}")
+            yield index, entrant, pick
+    finally:
+        del pool[:taken]
+
+
+class Sweepstake:
+    """
+    Entrants and picks validated once, ready to be drawn any number of times.
+
+    Draws never print, sleep or log each round, and return compact `DrawResult`
+    objects. Given the same inputs, draw order and seed, a draw gives the same
+    result as `sweeper.draw.draw`, so results can be checked against draw
+    commitments.
+
+    Example:
+        sweepstake = Sweepstake(["Harold", "Jim"], ["Bengals", "Bills"])
+        result = sweepstake.draw(seed=42)
+        results = sweepstake.draw_many(1000, seed=42)
+    """
+
+    __slots__ = (
+        "entrants",
+        "picks",
+        "draw_order",
+        "derangement",
+        "draw_algorithm",
+        "_entrant_positions",
+        "_pick_positions",
+    )
+
+    def __init__(
+        self,
+        entrants: Iterable[str],
+        picks: Iterable[str],
+        draw_order: str = "entrants",
+        validate: bool = True,
+        derangement: str | None = None,
+        draw_algorithm: int = DRAW_ALGORITHM,
+    ) -> None:
+        """
+        Arguments:
+            - entrants (Iterable): Entrants (must be unique). entrants >= picks must be
+                                  true.
+            - picks (Iterable):   Picks (must be unique)
+            - draw_order (str):   "entrants", "picks" or "shuffle". See
+                                  `sweeper.draw.draw`. Default is "entrants".
+            - validate (bool):    If True, check entrants and picks are unique and
+                                  there are enough picks. Pass False if the inputs
+                                  have already been validated. Default is True.
+            - derangement (str):  If set, entrants and picks are the same names and
+                                  nobody draws themselves: "any" for any
+                                  derangement, or "single-cycle" for a single
+                                  cycle. See `sweeper.derangement`.
+            - draw_algorithm (int): How rounds remove their draw from the pool.
+                                  Default is the latest, DRAW_ALGORITHM; pass the
+                                  algorithm a commitment records to recompute it.
+        """
+        check_draw_order(draw_order)
+        check_derangement(derangement)
+        check_draw_algorithm(draw_algorithm)
+        # Intern entries so repeated values across inputs and results share memory
+        self.entrants = tuple(sys.intern(entrant) for entrant in entrants)
+        self.picks = tuple(sys.intern(pick) for pick in picks)
+        self.draw_order = draw_order
+        self.derangement = derangement
+        self.draw_algorithm = draw_algorithm
+        # Built on first lookup, then shared by every result
+        self._entrant_positions = None
+        self._pick_positions = None
+        if validate:
+            check_unique(enumerate(self.entrants, start=1), label="Entrants")
+            check_unique(enumerate(self.picks, start=1), label="Picks")
+            check_enough_picks(len(self.entrants), len(self.picks))
+        if validate and derangement:
+            check_derangeable(self.entrants, self.picks)
+        logger.debug(
+            f"Created sweepstake with {len(self.entrants)} entrants and "
+            f"{len(self.picks)} picks ({draw_order=}, {derangement=})"
+        )
+
+    @classmethod
+    def from_files(
+        cls,
+        entrants: Path | str,
+        picks: Path | str,
+        *,
+        entrants_column: str | None = None,
+        picks_column: str | None = None,
+        draw_order: str = "entrants",
+        casefold: bool = False,
+        cache: InputCache | None = None,
+        derangement: str | None = None,
+    ) -> "Sweepstake":
+        """
+        Load and validate entrants and picks from files, as `sweeper draw` does.
+        """
+        entrants_list, picks_list, _ = load_validated_inputs(
+            entrants=entrants,
+            entrants_column=entrants_column,
+            picks=picks,
+            picks_column=picks_column,
+            casefold=casefold,
+            cache=cache,
+        )
+        sweepstake = cls(
+            entrants_list,
+            picks_list,
+            draw_order=draw_order,
+            validate=False,
+            derangement=derangement,
+        )
+        if derangement:
+            check_derangeable(sweepstake.entrants, sweepstake.picks)
+        return sweepstake
+
+    def __repr__(self) -> str:
+        return (
+            f"Sweepstake({len(self.entrants)} entrants, {len(self.picks)} picks, "
+            f"draw_order={self.draw_order!r})"
+        )
+
+    def iter_rounds(
+        self, seed: int | None = None, rng=None
+    ) -> Iterator[tuple[int, int]]:
+        """
+        Draw one round at a time, yielding (entrant index, pick index) tuples in draw
+        order. Pass either a `seed` or a random number generator `rng`.
+        """
+        if rng is None:
+            rng = random.Random(seed)
+        entrant_indexes = list(range(len(self.entrants)))
+        pick_indexes = list(range(len(self.picks)))
+        if self.draw_order == "shuffle":
+            rng.shuffle(entrant_indexes)
+        if self.derangement:
+            yield from self._iter_derangement_rounds(entrant_indexes, rng)
+            return
+        if self.draw_order in ["entrants", "shuffle"]:
+            drawers, pool = entrant_indexes, pick_indexes
+        else:
+            drawers, pool = pick_indexes, entrant_indexes
+        rounds = iter_draw_rounds(
+            drawers,
+            pool,
+            draw_order=self.draw_order,
+            rng=rng,
+            log_rounds=False,
+            draw_algorithm=self.draw_algorithm,
+        )
+        for _, entrant_index, pick_index in rounds:
+            yield entrant_index, pick_index
+
+    def _iter_derangement_rounds(
+        self, entrant_indexes: list, rng
+    ) -> Iterator[tuple[int, int]]:
+        self._build_positions()
+        if self.draw_order in ["entrants", "shuffle"]:
+            drawers = [self.entrants[index] for index in entrant_indexes]
+        else:
+            drawers = self.picks
+        rounds = iter_derangement_rounds(
+            drawers,
+            draw_order=self.draw_order,
+            rng=rng,
+            derangement=self.derangement,
+            log_rounds=False,
+        )
+        for _, entrant, pick in rounds:
+            yield self._entrant_positions[entrant], self._pick_positions[pick]
+
+    def _build_positions(self) -> None:
+        if self._entrant_positions is None:
+            self._entrant_positions = get_positions(self.entrants)
+            self._pick_positions = get_positions(self.picks)
+
+    def draw(self, seed: int | None = None, rng=None) -> DrawResult:
+        """
+        Run a draw. If neither `seed` nor `rng` is passed, a random seed is
+        generated and recorded on the result so the draw can be reproduced.
+        """
+        if seed is None and rng is None:
+            seed = secrets.randbits(64)
+        entrant_indexes = array("L")
+        pick_indexes = array("L")
+        for entrant_index, pick_index in self.iter_rounds(seed=seed, rng=rng):
+            entrant_indexes.append(entrant_index)
+            pick_indexes.append(pick_index)
+        self._build_positions()
+        return DrawResult(
+            self.entrants,
+            self.picks,
+            entrant_indexes,
+            pick_indexes,
+            seed=seed,
+            entrant_positions=self._entrant_positions,
+            pick_positions=self._pick_positions,
+        )
+
+    def iter_draws(self, seed: int | None = None) -> Iterator[DrawResult]:
+        """
+        Yield independent draws indefinitely. Each draw's seed is taken from a
+        generator seeded with `seed`, so the sequence can be reproduced.
+        """
+        seeds = random.Random(seed if seed is not None else secrets.randbits(64))
+        while True:
+            yield self.draw(seed=seeds.getrandbits(64))
+
+    def draw_many(self, n: int, seed: int | None = None) -> list[DrawResult]:
+        """
+        Run `n` independent draws, e.g. for simulations. See `iter_draws`.
+        """
+        return list(islice(self.iter_draws(seed=seed), n))
@@ -0,0 +1,792 @@
+import logging
+import struct
+import sys
+from collections.abc import Iterable, Iterator, Sequence
+from concurrent.futures import FIRST_EXCEPTION, Future, ThreadPoolExecutor, wait
+from pathlib import Path
+
+import click
+
+from sweeper.cache import InputCache
+from sweeper.column import ColumnTable, StringColumn, StringColumnBuilder
+from sweeper.io import (
+    as_path,
+    get_path_suffix,
+    is_stdio,
+    iter_csv_columns,
+    iter_entries_from_file,
+    parse_column,
+)
+from sweeper.options import ByteSize, input_options
+from sweeper.sqlite import is_sqlite_uri
+
+
+logger = logging.getLogger(__name__)
+
+MAX_REPORTED_DUPLICATES = 10
+# Number of spill files entries are hash-partitioned into once they exceed the
+# memory budget, and the number of times an oversized partition is split again
+DEFAULT_SPILL_PARTITIONS = 64
+MAX_SPILL_DEPTH = 4
+# Rough bytes held per entry while checking in memory, on top of the string itself:
+# a buffered (line number, entry) tuple and a DuplicateTracker dictionary entry
+SPILL_ENTRY_OVERHEAD = 200
+# Spill record header: line number and length of the UTF-8 encoded entry
+SPILL_RECORD = struct.Struct("<QI")
+
+
+def normalise_entries(
+    numbered_entries: Iterable[tuple[int, str]],
+) -> Iterator[tuple[int, str]]:
+    """
+    Strip surrounding whitespace from each entry and skip blank entries, keeping
+    the original line numbers.
+    """
+    for line_number, entry in numbered_entries:
+        entry = entry.strip()
+        if entry:
+            yield line_number, entry
+
+
+class DuplicateTracker:
+    """
+    Track entries as they are read to find duplicates in a single pass.
+
+    Every distinct entry is kept in memory with its first line number, so memory
+    grows with the number of distinct entries; use SpillingDuplicateTracker to
+    check inputs too large for that. Every line number is kept for up to
+    `max_reported` duplicated values only, so the report stays small however many
+    duplicates there are.
+    """
+
+    __slots__ = ("casefold", "max_reported", "count", "_first_seen", "_reported")
+
+    def __init__(
+        self, casefold: bool = False, max_reported: int = MAX_REPORTED_DUPLICATES
+    ) -> None:
+        self.casefold = casefold
+        self.max_reported = max_reported
+        # Total number of distinct duplicated values
+        self.count = 0
+        # First line number of each entry, or 0 once an unreported duplicate is counted
+        self._first_seen = {}
+        self._reported = {}
+
+    def add(self, line_number: int, entry: str) -> None:
+        key = entry.casefold() if self.casefold else entry
+        first_line = self._first_seen.get(key)
+        if first_line is None:
+            self._first_seen[key] = line_number
+        elif key in self._reported:
+            self._reported[key][1].append(line_number)
+        elif first_line:
+            self.count += 1
+            if len(self._reported) < self.max_reported:
+                self._reported[key] = (entry, [first_line, line_number])
+            else:
+                self._first_seen[key] = 0
+
+    @property
+    def duplicates(self) -> dict[str, list[int]]:
+        """
+        Reported duplicated values mapped to every line number they appear on.
+        """
+        return dict(self._reported.values())
+
+    def close(self) -> None:
+        # Nothing to clean up, unlike SpillingDuplicateTracker
+        pass
+
+    def check(self, label: str) -> None:
+        """
+        Raise ValueError reporting the offending values if any entries are duplicated.
+        """
+        if self.count:
+            message = format_duplicates(label, self.duplicates, self.count)
+            logger.error(message)
+            raise ValueError(message)
+
+
+class SpillPartitions:
+    """
+    Set of spill files that (line_number, entry) records are hash-partitioned into.
+    Files are only created once a record is written to them.
+    """
+
+    __slots__ = ("directory", "prefix", "files", "counts")
+
+    def __init__(self, directory: str, prefix: str) -> None:
+        self.directory = directory
+        self.prefix = prefix
+        self.files = {}
+        self.counts = {}
+
+    def write(self, index: int, line_number: int, entry: str) -> None:
+        out_file = self.files.get(index)
+        if out_file is None:
+            path = Path(self.directory) / f"{self.prefix}{index}.spill"
+            out_file = self.files[index] = open(path, "wb")
+            self.counts[index] = 0
+        data = entry.encode("utf-8")
+        out_file.write(SPILL_RECORD.pack(line_number, len(data)))
+        out_file.write(data)
+        self.counts[index] += 1
+
+    def close(self) -> list[tuple[Path, int]]:
+        """
+        Close the files, returning (path, record count) for each.
+        """
+        closed = []
+        for index, out_file in sorted(self.files.items()):
+            out_file.close()
+            closed.append((Path(out_file.name), self.counts[index]))
+        return closed
+
+
+def read_spill_file(path: Path) -> Iterator[tuple[int, str]]:
+    """
+    Yield (line_number, entry) records from a spill file in the order written.
+    """
+    with open(path, "rb") as in_file:
+        while header := in_file.read(SPILL_RECORD.size):
+            line_number, size = SPILL_RECORD.unpack(header)
+            yield line_number, in_file.read(size).decode("utf-8")
+
+
+class SpillingDuplicateTracker:
+    """
+    Find duplicates within a memory budget, for inputs too large to track in memory.
+
+    Entries are buffered in memory until their estimated size exceeds `max_memory`.
+    After that, every entry is hash-partitioned into one of `partitions` spill
+    files, so all copies of a value end up in the same file. Each file is then
+    checked with a DuplicateTracker on its own. Files still too large for the
+    budget are partitioned again with a different hash.
+
+    Duplicates are reported with the same line numbers, and in the same order, as
+    DuplicateTracker. `count` and `duplicates` are only available after `finish()`,
+    which `check()` calls.
+    """
+
+    __slots__ = (
+        "casefold",
+        "max_reported",
+        "max_memory",
+        "partitions",
+        "directory",
+        "count",
+        "_buffer",
+        "_buffer_size",
+        "_spill_dir",
+        "_spill",
+        "_reported",
+        "_finished",
+    )
+
+    def __init__(
+        self,
+        max_memory: int,
+        casefold: bool = False,
+        max_reported: int = MAX_REPORTED_DUPLICATES,
+        partitions: int = DEFAULT_SPILL_PARTITIONS,
+        directory: Path | None = None,
+    ) -> None:
+        """
+        Arguments:
+            - max_memory (int):   Memory budget in bytes for tracking entries
+            - casefold (bool):    If True, entries differing only by case are
+                                  duplicates
+            - max_reported (int): Maximum number of duplicated values to report
+            - partitions (int):   Number of spill files to partition entries into
+            - directory (Path):   Directory to create spill files in. Defaults to
+                                  the system temporary directory.
+        """
+        self.max_memory = max_memory
+        self.casefold = casefold
+        self.max_reported = max_reported
+        self.partitions = partitions
+        self.directory = directory
+        self.count = 0
+        self._buffer = []
+        self._buffer_size = 0
+        self._spill_dir = None
+        self._spill = None
+        self._reported = []
+        self._finished = False
+
+    def add(self, line_number: int, entry: str) -> None:
+        if self._spill is not None:
+            self._spill.write(self._partition(entry, 0), line_number, entry)
+            return
+        self._buffer.append((line_number, entry))
+        self._buffer_size += sys.getsizeof(entry) + SPILL_ENTRY_OVERHEAD
+        if self._buffer_size > self.max_memory:
+            self._start_spilling()
+
+    def _partition(self, entry: str, depth: int) -> int:
+        key = entry.casefold() if self.casefold else entry
+        # Salt the hash with the depth so a partition split again spreads out
+        return hash((depth, key)) % self.partitions
+
+    def _start_spilling(self) -> None:
+        import tempfile
+
+        self._spill_dir = tempfile.mkdtemp(prefix="sweeper-dedupe-", dir=self.directory)
+        logger.debug(
+            f"Duplicate check exceeded {self.max_memory} bytes - spilling entries "
+            f"to {self.partitions} partitions in {self._spill_dir}"
+        )
+        self._spill = SpillPartitions(self._spill_dir, prefix="0-")
+        for line_number, entry in self._buffer:
+            self._spill.write(self._partition(entry, 0), line_number, entry)
+        self._buffer = []
+        self._buffer_size = 0
+
+    def _track(self, numbered_entries: Iterable[tuple[int, str]]) -> None:
+        tracker = DuplicateTracker(
+            casefold=self.casefold, max_reported=self.max_reported
+        )
+        for line_number, entry in numbered_entries:
+            tracker.add(line_number, entry)
+        self.count += tracker.count
+        self._reported.extend(tracker.duplicates.items())
+
+    def _check_partitions(self, spill: SpillPartitions, depth: int) -> None:
+        for path, count in spill.close():
+            size = path.stat().st_size + count * SPILL_ENTRY_OVERHEAD
+            # Splitting a single record, or splitting forever, doesn't help
+            if size <= self.max_memory or count < 2 or depth >= MAX_SPILL_DEPTH:
+                self._track(read_spill_file(path))
+            else:
+                logger.debug(f"Partitioning {path} again at depth {depth + 1}")
+                sub_spill = SpillPartitions(self._spill_dir, prefix=f"{path.stem}-")
+                for line_number, entry in read_spill_file(path):
+                    sub_spill.write(
+                        self._partition(entry, depth + 1), line_number, entry
+                    )
+                self._check_partitions(sub_spill, depth + 1)
+            path.unlink()
+
+    def finish(self) -> None:
+        """
+        Check every entry added so far for duplicates and remove any spill files.
+        """
+        if self._finished:
+            return
+        self._finished = True
+        try:
+            if self._spill is None:
+                self._track(self._buffer)
+                self._buffer = []
+            else:
+                self._check_partitions(self._spill, depth=0)
+        finally:
+            self.close()
+        # Report the same duplicates as DuplicateTracker: those seen a second time
+        # earliest in the input
+        self._reported.sort(key=lambda item: item[1][1])
+        del self._reported[self.max_reported :]
+
+    def close(self) -> None:
+        """
+        Remove any spill files.
+        """
+        if self._spill is not None:
+            self._spill.close()
+        if self._spill_dir is not None:
+            import shutil
+
+            shutil.rmtree(self._spill_dir, ignore_errors=True)
+            self._spill_dir = None
+
+    @property
+    def duplicates(self) -> dict[str, list[int]]:
+        """
+        Reported duplicated values mapped to every line number they appear on.
+        """
+        self.finish()
+        return dict(self._reported)
+
+    def check(self, label: str) -> None:
+        """
+        Raise ValueError reporting the offending values if any entries are duplicated.
+        """
+        self.finish()
+        if self.count:
+            message = format_duplicates(label, self.duplicates, self.count)
+            logger.error(message)
+            raise ValueError(message)
+
+
+def get_duplicate_tracker(
+    casefold: bool = False, max_memory: int | None = None
+) -> DuplicateTracker | SpillingDuplicateTracker:
+    """
+    Return a tracker for finding duplicates, spilling to disk if `max_memory` is
+    passed and the entries don't fit in it. Without `max_memory`, every distinct
+    entry is held in memory.
+    """
+    if max_memory is None:
+        return DuplicateTracker(casefold=casefold)
+    return SpillingDuplicateTracker(max_memory, casefold=casefold)
+
+
+def find_duplicates(
+    numbered_entries: Iterable[tuple[int, str]],
+    casefold: bool = False,
+    max_reported: int = MAX_REPORTED_DUPLICATES,
+    collect: list | None = None,
+) -> tuple[dict[str, list[int]], int]:
+    """
+    Consume (line_number, entry) tuples in a single pass and find duplicated entries.
+
+    Returns a tuple of (duplicates, duplicate_count). `duplicates` maps up to
+    `max_reported` offending values to every line number they appear on, so the
+    report stays small however many duplicates there are. `duplicate_count` is the
+    total number of distinct duplicated values.
+
+    Arguments:
+        - numbered_entries: Iterable of (line_number, entry) tuples
+        - casefold (bool):  If True, entries differing only by case are duplicates
+        - max_reported (int): Maximum number of duplicated values to report
+        - collect (list):   If passed, each entry is appended to it as it is seen, so
+                            callers can load and validate in the same pass
+    """
+    tracker = DuplicateTracker(casefold=casefold, max_reported=max_reported)
+    for line_number, entry in numbered_entries:
+        if collect is not None:
+            collect.append(entry)
+        tracker.add(line_number, entry)
+    return tracker.duplicates, tracker.count
+
+
+def format_duplicates(label: str, duplicates: dict[str, list[int]], count: int) -> str:
+    """
+    Build an error message reporting duplicated values and their line numbers.
+    """
+    offending = "; ".join(
+        f"{entry!r} on lines {', '.join(str(line) for line in lines)}"
+        for entry, lines in duplicates.items()
+    )
+    message = (
+        f"{label} must be unique but found {count} duplicated value(s): {offending}"
+    )
+    if count > len(duplicates):
+        message += f" (and {count - len(duplicates)} more)"
+    return message
+
+
+def check_unique(
+    numbered_entries: Iterable[tuple[int, str]],
+    label: str,
+    casefold: bool = False,
+    collect: list | None = None,
+    max_memory: int | None = None,
+) -> None:
+    """
+    Raise ValueError reporting the offending values if any entries are duplicated.
+    If `max_memory` is passed, entries are spilled to disk rather than tracked in
+    memory beyond it (see SpillingDuplicateTracker). Otherwise memory grows with
+    the number of distinct entries.
+    """
+    tracker = get_duplicate_tracker(casefold=casefold, max_memory=max_memory)
+    try:
+        for line_number, entry in numbered_entries:
+            if collect is not None:
+                collect.append(entry)
+            tracker.add(line_number, entry)
+        tracker.check(label)
+    finally:
+        tracker.close()
+
+
+def check_enough_picks(entrants_count: int, picks_count: int) -> None:
+    """
+    Raise ValueError if there are fewer picks than entrants.
+    """
+    if picks_count < entrants_count:
+        message = f"There are not enough picks ({picks_count}) to give all entrants ({entrants_count}) a pick"
+        logger.error(message)
+        raise ValueError(message)
+
+
+def load_validated_entries(
+    filepath: Path,
+    column: str | None,
+    label: str,
+    casefold: bool = False,
+    cache: InputCache | None = None,
+    max_memory: int | None = None,
+    workers: int | None = None,
+) -> Sequence[str]:
+    """
+    Stream an input file once, normalising entries and checking uniqueness as
+    they are read. Return the normalised entries.
+
+    If a cache is passed, entries previously loaded from an unchanged file with the
+    same options are read from the cache instead, skipping parsing and validation.
+    They are returned as the memory-mapped `StringColumn` without copying, and can
+    be read until the cache is closed.
+    If `max_memory` is passed, the uniqueness check spills to disk beyond it.
+    Large, uncompressed CSV files are parsed in parallel with up to `workers`
+    processes (default one per CPU; see `load_csv_column_parallel`).
+    """
+    if is_stdio(filepath) or is_sqlite_uri(filepath):
+        # Stdin can only be read once, and neither stdin nor a database table has
+        # a file fingerprint to cache by
+        cache = None
+    if cache is not None:
+        cache_key = cache.key(filepath, column, casefold=casefold)
+        cached = cache.get(cache_key)
+        if cached is not None:
+            logger.debug(f"Loaded {len(cached)} {label.lower()} from cache")
+            return cached
+
+    # Imported here so process pools are only loaded once an input is read
+    from sweeper.parallel import (
+        can_parse_in_parallel,
+        get_default_workers,
+        load_csv_column_parallel,
+    )
+
+    workers = workers or get_default_workers()
+    if column is not None and can_parse_in_parallel(filepath, workers):
+        entries_column, line_numbers = load_csv_column_parallel(
+            filepath, column, workers=workers
+        )
+        check_unique(
+            zip(line_numbers, entries_column),
+            label=label,
+            casefold=casefold,
+            max_memory=max_memory,
+        )
+        # Kept as the compact column rather than copied to a list of strings
+        entries = entries_column
+    else:
+        entries = []
+        numbered_entries = iter_entries_from_file(filepath, column, label=label)
+        check_unique(
+            normalise_entries(numbered_entries),
+            label=label,
+            casefold=casefold,
+            collect=entries,
+            max_memory=max_memory,
+        )
+        entries_column = None
+    logger.debug(f"Loaded and validated {len(entries)} {label.lower()} from {filepath}")
+    if cache is not None:
+        if entries_column is None:
+            entries_column = StringColumn.from_strings(entries)
+        cache.put(cache_key, entries_column)
+    return entries
+
+
+def count_validated_entries(
+    filepath: Path,
+    column: str | None,
+    label: str,
+    casefold: bool = False,
+    max_memory: int | None = None,
+) -> int:
+    """
+    Stream a file once, normalising entries and checking uniqueness as they are
+    read, without keeping them. Return the number of entries.
+
+    With `max_memory`, memory use stays within the budget however large the file,
+    so inputs larger than RAM can be checked.
+    """
+    count = 0
+    tracker = get_duplicate_tracker(casefold=casefold, max_memory=max_memory)
+    try:
+        numbered_entries = iter_entries_from_file(filepath, column, label=label)
+        for line_number, entry in normalise_entries(numbered_entries):
+            count += 1
+            tracker.add(line_number, entry)
+        tracker.check(label)
+    finally:
+        tracker.close()
+    logger.debug(f"Validated {count} {label.lower()} from {filepath}")
+    return count
+
+
+def load_validated_csv_columns(
+    filepath: Path,
+    *,
+    entrants_column: str,
+    picks_column: str | None = None,
+    metadata_columns: list[str] | None = None,
+    casefold: bool = False,
+    max_memory: int | None = None,
+) -> tuple[list, list | None, ColumnTable | None]:
+    """
+    Parse a CSV file once, extracting the entrants column and optionally a picks
+    column and metadata columns, normalising and validating entries as they are
+    read. Metadata values are stored as compact columns aligned to the entrants.
+
+    Returns a tuple of (entrants, picks, metadata). `picks` is None if no picks
+    column is passed, and `metadata` is None if no metadata columns are passed.
+    """
+    metadata_columns = metadata_columns or []
+    columns = [entrants_column]
+    if picks_column is not None:
+        columns.append(picks_column)
+    columns.extend(metadata_columns)
+
+    header = []
+    rows = iter_csv_columns(
+        filepath=filepath,
+        columns=[parse_column(column) for column in columns],
+        header=header,
+    )
+    entrants = []
+    entrants_tracker = get_duplicate_tracker(casefold=casefold, max_memory=max_memory)
+    picks = [] if picks_column is not None else None
+    picks_tracker = get_duplicate_tracker(casefold=casefold, max_memory=max_memory)
+    metadata_offset = len(columns) - len(metadata_columns)
+    builders = [StringColumnBuilder() for _ in metadata_columns]
+
+    try:
+        for line_number, values in rows:
+            entrant = values[0].strip()
+            if entrant:
+                entrants.append(entrant)
+                entrants_tracker.add(line_number, entrant)
+                for builder, value in zip(builders, values[metadata_offset:]):
+                    builder.append(value)
+            if picks is not None:
+                pick = values[1].strip()
+                if pick:
+                    picks.append(pick)
+                    picks_tracker.add(line_number, pick)
+
+        entrants_tracker.check("Entrants")
+        picks_tracker.check("Picks")
+    finally:
+        entrants_tracker.close()
+        picks_tracker.close()
+    logger.debug(
+        f"Loaded and validated {len(entrants)} entrants from {filepath} "
+        f"with columns {columns}"
+    )
+
+    metadata = None
+    if metadata_columns:
+        names = [
+            header[column]
+            if isinstance(column, int) and column < len(header)
+            else str(column)
+            for column in map(parse_column, metadata_columns)
+        ]
+        metadata = ColumnTable(
+            entrants,
+            {name: builder.build() for name, builder in zip(names, builders)},
+        )
+    return entrants, picks, metadata
+
+
+def raise_first_error(futures: list[Future]) -> None:
+    """
+    Wait for futures until they have all finished or one has failed. If any
+    failed, cancel those not yet started and re-raise the first failure in the
+    order the futures were passed.
+    """
+    wait(futures, return_when=FIRST_EXCEPTION)
+    for future in futures:
+        if future.done() and future.exception() is not None:
+            for other in futures:
+                other.cancel()
+            raise future.exception()
+
+
+def load_validated_inputs(
+    *,
+    entrants: Path,
+    entrants_column: str | None = None,
+    picks: Path,
+    picks_column: str | None = None,
+    metadata_columns: list[str] | None = None,
+    casefold: bool = False,
+    cache: InputCache | None = None,
+    max_memory: int | None = None,
+    workers: int | None = None,
+) -> tuple[Sequence[str], Sequence[str], ColumnTable | None]:
+    """
+    Load and validate entrants and picks in a single pass over each file. Return
+    a tuple of (entrants, picks, metadata) ready to be drawn.
+
+    If metadata columns are passed, they are read from the entrants CSV file in the
+    same pass as the entrants. If entrants and picks come from the same CSV file,
+    both columns are read in a single pass over it. Otherwise the two inputs are
+    loaded concurrently in threads, so reading, decompression and waiting on slow
+    storage for one overlaps with the other.
+
+    If `max_memory` is passed, uniqueness checks spill entries to disk rather than
+    tracking more than that in memory. `workers` is the number of processes to
+    parse large CSV inputs with (default one per CPU). Both are split evenly
+    between concurrent loads.
+    """
+    if is_stdio(entrants) and is_stdio(picks):
+        raise ValueError("Entrants and picks cannot both be read from stdin.")
+
+    same_file = not is_stdio(entrants) and as_path(entrants) == as_path(picks)
+    if metadata_columns and get_path_suffix(entrants) != ".csv":
+        raise ValueError("Metadata columns can only be read from a CSV entrants file.")
+
+    single_pass = metadata_columns or (
+        same_file and get_path_suffix(entrants) == ".csv"
+    )
+    concurrent = not (single_pass and same_file)
+    if max_memory and concurrent:
+        # Both loads track their entries at once, so they share the budget
+        max_memory = max(max_memory // 2, 1)
+    if concurrent:
+        from sweeper.parallel import get_default_workers
+
+        # Both loads may parse in parallel at once, so they share the processes
+        workers = max((workers or get_default_workers()) // 2, 1)
+
+    pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="sweeper-load")
+    try:
+        if single_pass:
+            entrants_future = pool.submit(
+                load_validated_csv_columns,
+                entrants,
+                entrants_column=entrants_column,
+                picks_column=picks_column if same_file else None,
+                metadata_columns=metadata_columns,
+                casefold=casefold,
+                max_memory=max_memory,
+            )
+        else:
+            entrants_future = pool.submit(
+                load_validated_entries,
+                entrants,
+                entrants_column,
+                label="Entrants",
+                casefold=casefold,
+                cache=cache,
+                max_memory=max_memory,
+                workers=workers,
+            )
+        futures = [entrants_future]
+        if concurrent:
+            picks_future = pool.submit(
+                load_validated_entries,
+                picks,
+                picks_column,
+                label="Picks",
+                casefold=casefold,
+                cache=cache,
+                max_memory=max_memory,
+                workers=workers,
+            )
+            futures.append(picks_future)
+        raise_first_error(futures)
+    finally:
+        # Every load has finished unless one failed, in which case don't wait for
+        # the other before reporting the failure
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    if single_pass:
+        entrants_list, picks_list, metadata = entrants_future.result()
+    else:
+        entrants_list, picks_list, metadata = entrants_future.result(), None, None
+    if picks_list is None:
+        picks_list = picks_future.result()
+    check_enough_picks(len(entrants_list), len(picks_list))
+    return entrants_list, picks_list, metadata
+
+
+def get_input_cache(
+    cache_dir: Path | None, cache_max_size: int | None
+) -> InputCache | None:
+    """
+    Return an InputCache if a cache directory was passed, else None. Within a
+    command, the cache (and the entries read from it) is closed once the command
+    finishes.
+    """
+    if cache_dir is None:
+        return None
+    logger.debug(f"Using input cache in {cache_dir} ({cache_max_size=})")
+    cache = InputCache(cache_dir, max_size=cache_max_size)
+    ctx = click.get_current_context(silent=True)
+    if ctx is not None:
+        ctx.with_resource(cache)
+    return cache
+
+
+@click.command(
+    name="validate",
+    epilog="""EXAMPLES
+
+Check entrants and picks files without running a draw:
+
+sweeper validate --entrants entrants.txt --picks picks.txt
+
+Treat entries differing only by case as duplicates:
+
+sweeper validate --entrants entrants.txt --picks picks.txt --casefold
+
+Check files larger than memory, spilling to disk beyond 1 GiB:
+
+sweeper validate --entrants tickets.csv --picks prizes.csv --max-memory 1G
+""",
+)
+@input_options
+@click.option(
+    "--max-memory",
+    type=ByteSize(),
+    help="Memory budget for the uniqueness check, e.g. 1G. Entries beyond it are "
+    "partitioned into temporary files on disk and checked one partition at a "
+    "time, so files larger than memory can be validated",
+)
+def validate_command(
+    *,
+    entrants: Path,
+    entrants_column: str | None = None,
+    picks: Path,
+    picks_column: str | None = None,
+    casefold: bool = False,
+    cache_dir: Path | None = None,
+    cache_max_size: int | None = None,
+    workers: int | None = None,
+    max_memory: int | None = None,
+) -> None:
+    """
+    Validate entrants and picks files without running a draw.
+    """
+    logger.debug("START: Running validate")
+    try:
+        if max_memory is None:
+            entrants_list, picks_list, _ = load_validated_inputs(
+                entrants=entrants,
+                entrants_column=entrants_column,
+                picks=picks,
+                picks_column=picks_column,
+                casefold=casefold,
+                cache=get_input_cache(cache_dir, cache_max_size),
+                workers=workers,
+            )
+            entrants_count, picks_count = len(entrants_list), len(picks_list)
+        else:
+            if is_stdio(entrants) and is_stdio(picks):
+                raise ValueError("Entrants and picks cannot both be read from stdin.")
+            # One after the other, so each check can use the whole budget
+            entrants_count = count_validated_entries(
+                as_path(entrants),
+                entrants_column,
+                label="Entrants",
+                casefold=casefold,
+                max_memory=max_memory,
+            )
+            picks_count = count_validated_entries(
+                as_path(picks),
+                picks_column,
+                label="Picks",
+                casefold=casefold,
+                max_memory=max_memory,
+            )
+            check_enough_picks(entrants_count, picks_count)
+    except (ValueError, IndexError) as error:
+        raise click.ClickException(str(error))
+    click.echo(f"Validation passed: {entrants_count} entrants, {picks_count} picks")
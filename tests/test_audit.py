@@ -0,0 +1,258 @@
+import gc
+import gzip
+import logging
+import os
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from sweeper.audit import (
+    BUFFERED_HANDLERS,
+    BufferedAuditHandler,
+    GzipRotatingFileHandler,
+    discard_buffers_after_fork,
+    get_log_handler,
+    iter_run_records,
+    list_runs,
+)
+from sweeper.main import sweeper
+
+RUN_IDS = ["20250730T224505Z-100-aaaa", "20250730T224505Z-200-bbbb"]
+
+
+def make_logger(handler: logging.Handler) -> logging.Logger:
+    logger = logging.getLogger(f"test_audit.{id(handler)}")
+    logger.propagate = False
+    logger.setLevel(logging.DEBUG)
+    logger.addHandler(handler)
+    return logger
+
+
+def test_gzip_rotating_file_handler(tmp_path: Path):
+    log_file = tmp_path / "audit.log"
+    handler = GzipRotatingFileHandler(filename=log_file, maxBytes=100, backupCount=2)
+    logger = make_logger(handler)
+    for index in range(20):
+        logger.debug(f"Round {index:02d} " + "x" * 40)
+    handler.close()
+
+    segments = sorted(tmp_path.glob("audit.log.*"))
+    assert [segment.name for segment in segments] == [
+        "audit.log.1.gz",
+        "audit.log.2.gz",
+    ]
+    assert "Round 19" in log_file.read_text()
+    with gzip.open(tmp_path / "audit.log.1.gz", "rt") as in_file:
+        assert "Round 18" in in_file.read()
+
+
+def test_get_log_handler_per_run(tmp_path: Path):
+    handler = get_log_handler(log_file=tmp_path / "audit.log", per_run=True)
+    handler.close()
+    run_log = Path(handler.baseFilename)
+    assert run_log.parent == tmp_path / "runs"
+    assert run_log.name.startswith("audit-")
+
+
+def test_get_log_handler_per_run_named_by_run_id(tmp_path: Path):
+    handler = get_log_handler(
+        log_file=tmp_path / "audit.log", per_run=True, run_id=RUN_IDS[0]
+    )
+    logger = make_logger(handler)
+    handler.setFormatter(logging.Formatter("%(run_id)s - %(message)s"))
+    logger.info("Drawing")
+    handler.close()
+    run_log = tmp_path / "runs" / f"audit-{RUN_IDS[0]}.log"
+    assert run_log.read_text() == f"{RUN_IDS[0]} - Drawing\n"
+    assert list(iter_run_records(tmp_path / "audit.log", RUN_IDS[0])) == [
+        f"{RUN_IDS[0]} - Drawing\n"
+    ]
+
+
+def test_get_log_handler_timed(tmp_path: Path):
+    handler = get_log_handler(log_file=tmp_path / "audit.log", rotate_when="midnight")
+    handler.close()
+    assert isinstance(handler, BufferedAuditHandler)
+    assert handler.target.namer("audit.log.2025-07-30") == "audit.log.2025-07-30.gz"
+
+
+def test_sweeper_log_options(
+    tmp_path: Path, temp_entrants_txt_file, temp_picks_txt_file
+):
+    log_file = tmp_path / "logs" / "audit.log"
+    runner = CliRunner()
+    result = runner.invoke(
+        sweeper,
+        [
+            "--log-file",
+            log_file,
+            "--log-max-size",
+            "1M",
+            "validate",
+            "--entrants",
+            temp_entrants_txt_file,
+            "--picks",
+            temp_picks_txt_file,
+        ],
+    )
+    root_logger = logging.getLogger()
+    for handler in root_logger.handlers[:]:
+        if getattr(handler, "baseFilename", None) == str(log_file.resolve()):
+            handler.close()
+            root_logger.removeHandler(handler)
+    assert result.exit_code == 0
+    assert "START: Running validate" in log_file.read_text()
+
+
+def get_audit_logger(log_file: Path, run_id: str, **kwargs) -> logging.Logger:
+    handler = get_log_handler(log_file=log_file, run_id=run_id, **kwargs)
+    handler.setFormatter(
+        logging.Formatter(
+            "2025-07-30 22:45:05 UTC - %(run_id)s - %(levelname)-8s - %(message)s"
+        )
+    )
+    return make_logger(handler)
+
+
+def close_logger(logger: logging.Logger) -> None:
+    for handler in logger.handlers[:]:
+        handler.close()
+        logger.removeHandler(handler)
+
+
+def test_buffered_audit_handler_writes_whole_blocks(tmp_path: Path):
+    log_file = tmp_path / "audit.log"
+    loggers = [get_audit_logger(log_file, run_id) for run_id in RUN_IDS]
+    for index in range(50):
+        for run, logger in enumerate(loggers):
+            logger.debug(f"Round {index} of run {run}\n+---+\n| {index} |\n+---+")
+    # Buffered records are written straight away from warnings up
+    assert not log_file.read_text()
+    loggers[1].warning("Undrawn picks")
+    assert log_file.read_text().count(RUN_IDS[1]) == 51
+    for logger in loggers:
+        close_logger(logger)
+
+    assert list(list_runs(log_file)) == [RUN_IDS[1], RUN_IDS[0]]
+    for run, run_id in enumerate(RUN_IDS):
+        lines = list(iter_run_records(log_file, run_id))
+        assert len(lines) == 200 + run
+        assert lines[196].endswith(f"Round 49 of run {run}\n")
+        assert lines[197:200] == ["+---+\n", "| 49 |\n", "+---+\n"]
+        assert all(RUN_IDS[1 - run] not in line for line in lines)
+
+
+def log_rounds(log_file: Path, run_id: str) -> None:
+    logger = get_audit_logger(log_file, run_id, max_bytes=20_000, backup_count=50)
+    logger.handlers[0].buffer_size = 512
+    for index in range(300):
+        logger.debug(f"Round {index}\n| {run_id} |")
+    close_logger(logger)
+
+
+def test_buffered_audit_handler_concurrent_processes(tmp_path: Path):
+    log_file = tmp_path / "audit.log"
+    run_ids = [f"20250730T224505Z-{pid}-cccc" for pid in range(4)]
+    with ProcessPoolExecutor(max_workers=4) as pool:
+        list(pool.map(log_rounds, [log_file] * len(run_ids), run_ids))
+
+    # Rotated by size, with the segments compressed one at a time
+    assert len(list(tmp_path.glob("audit.log.*.gz"))) > 4
+    for run_id in run_ids:
+        lines = list(iter_run_records(log_file, run_id))
+        assert len(lines) == 600
+        for index in range(300):
+            assert lines[2 * index].endswith(f"Round {index}\n")
+            assert lines[2 * index + 1] == f"| {run_id} |\n"
+
+
+def test_buffered_audit_handler_discards_buffer_after_fork(tmp_path: Path):
+    log_file = tmp_path / "audit.log"
+    logger = get_audit_logger(log_file, RUN_IDS[0])
+    handler = logger.handlers[0]
+    logger.debug("Written by the parent only")
+    assert handler in BUFFERED_HANDLERS
+    discard_buffers_after_fork()
+    close_logger(logger)
+    assert handler not in BUFFERED_HANDLERS
+    assert not log_file.read_text()
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs os.fork")
+def test_buffered_audit_handler_forked_child_writes_nothing(tmp_path: Path):
+    log_file = tmp_path / "audit.log"
+    logger = get_audit_logger(log_file, RUN_IDS[0])
+    logger.debug("Written by the parent only")
+    pid = os.fork()
+    if pid == 0:
+        close_logger(logger)
+        os._exit(0)
+    os.waitpid(pid, 0)
+    close_logger(logger)
+    assert log_file.read_text().count("Written by the parent only") == 1
+
+
+def test_buffered_audit_handler_can_be_collected(tmp_path: Path):
+    target = GzipRotatingFileHandler(tmp_path / "audit.log")
+    handler = BufferedAuditHandler(target, RUN_IDS[0])
+    reference = weakref.ref(handler)
+    target.close()
+    del handler
+    gc.collect()
+    assert reference() is None
+
+
+def test_iter_run_records_invalid_run_id(tmp_path: Path):
+    with pytest.raises(ValueError, match="'latest' is not a valid run ID"):
+        list(iter_run_records(tmp_path / "audit.log", "latest"))
+
+
+def test_sweeper_audit_command(
+    tmp_path: Path, temp_entrants_txt_file, temp_picks_txt_file, mocker
+):
+    log_file = tmp_path / "audit.log"
+    mocker.patch(
+        "sweeper.audit.get_run_id",
+        side_effect=RUN_IDS
+        + ["20250730T224505Z-300-cccc", "20250730T224505Z-400-dddd"],
+    )
+    root_logger = logging.getLogger()
+    handlers = root_logger.handlers[:]
+    runner = CliRunner()
+
+    def invoke(args: list[str]):
+        # Detach each run's handler, as each run is normally its own process
+        try:
+            return runner.invoke(sweeper, ["--log-file", str(log_file)] + args)
+        finally:
+            for handler in root_logger.handlers[:]:
+                if handler not in handlers:
+                    handler.close()
+                    root_logger.removeHandler(handler)
+
+    result = invoke(
+        [
+            "validate",
+            "--entrants",
+            str(temp_entrants_txt_file),
+            "--picks",
+            str(temp_picks_txt_file),
+        ]
+    )
+    assert result.exit_code == 0, result.output
+
+    result = invoke(["audit"])
+    assert result.exit_code == 0, result.output
+    assert result.output.startswith(f"{RUN_IDS[0]}  ")
+
+    result = invoke(["audit", RUN_IDS[0]])
+    assert result.exit_code == 0, result.output
+    assert f"- {RUN_IDS[0]} - DEBUG    - sweeper.validate - START" in result.output
+    assert "Running audit" not in result.output
+
+    result = invoke(["audit", "20250730T224505Z-1-ffff"])
+    assert result.exit_code == 1
+    assert "No audit log records found" in result.output
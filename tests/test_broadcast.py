@@ -0,0 +1,153 @@
+import json
+import socket
+import time
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from sweeper.broadcast import DrawBroadcast
+from sweeper.draw import draw, draw_command
+
+
+def connect(broadcast: DrawBroadcast, path: str, headers: str = "") -> socket.socket:
+    client = socket.create_connection(("127.0.0.1", broadcast.port), timeout=5)
+    client.sendall(f"GET {path} HTTP/1.1\r\nHost: localhost\r\n{headers}\r\n".encode())
+    return client
+
+
+def read_events(client: socket.socket, count: int) -> list[tuple[int, str, dict]]:
+    """
+    Read `count` Server-Sent Events from a connected client.
+    """
+    data = b""
+    while b"\r\n\r\n" not in data or data.count(b"\n\n") < count:
+        chunk = client.recv(65536)
+        if not chunk:
+            break
+        data += chunk
+    _, body = data.split(b"\r\n\r\n", 1)
+    events = []
+    for block in body.decode().split("\n\n")[:count]:
+        fields = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((int(fields["id"]), fields["event"], json.loads(fields["data"])))
+    return events
+
+
+@pytest.fixture
+def broadcast():
+    with DrawBroadcast("127.0.0.1", 0, history=10) as broadcast:
+        yield broadcast
+
+
+def test_serves_viewer_page(broadcast: DrawBroadcast):
+    client = connect(broadcast, "/")
+    response = client.makefile("rb").read()
+    assert response.startswith(b"HTTP/1.1 200 OK")
+    assert b'new EventSource("events")' in response
+
+    client = connect(broadcast, "/missing")
+    assert client.makefile("rb").read().startswith(b"HTTP/1.1 404")
+
+
+def test_viewers_join_late_and_resume(broadcast: DrawBroadcast):
+    broadcast.publish_start(3, "entrants")
+    broadcast.publish_round(0, "Harold", "Bengals", "entrants")
+    client = connect(broadcast, "/events")
+    broadcast.publish_round(1, "Jim", "Bills", "entrants")
+
+    events = read_events(client, 3)
+    assert [event for _, event, _ in events] == ["start", "round", "round"]
+    assert events[2][2] == {
+        "round": 2,
+        "entrant": "Jim",
+        "pick": "Bills",
+        "draw_order": "entrants",
+    }
+
+    # Browsers reconnect with the ID of the last event they saw
+    client = connect(broadcast, "/events", "Last-Event-ID: 2\r\n")
+    assert [event_id for event_id, _, _ in read_events(client, 1)] == [3]
+
+
+def test_slow_viewer_skips_ahead_without_blocking(broadcast: DrawBroadcast):
+    start = time.monotonic()
+    for index in range(100):
+        broadcast.publish_round(index, f"entrant{index}", f"pick{index}", "entrants")
+    assert time.monotonic() - start < 1
+    # Only the last 10 events are kept, so a new viewer starts from the oldest kept
+    client = connect(broadcast, "/events", "Last-Event-ID: 5\r\n")
+    assert read_events(client, 1)[0][0] == 91
+
+
+def test_close_sends_remaining_events(broadcast: DrawBroadcast):
+    client = connect(broadcast, "/events")
+    deadline = time.monotonic() + 5
+    while broadcast.viewers == 0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    broadcast.publish_complete(3, 0)
+    broadcast.close()
+    events = read_events(client, 1)
+    assert events[0][1:] == ("complete", {"rounds": 3, "undrawn": 0})
+    # The server closes the stream once it has been sent
+    assert client.recv(1) == b""
+
+
+def test_draw_broadcasts_each_step(broadcast: DrawBroadcast):
+    client = connect(broadcast, "/events")
+    draw(["Harold", "Jim"], ["Bengals", "Bills"], delay=0, broadcast=broadcast)
+    events = read_events(client, 6)
+    assert [event for _, event, _ in events] == [
+        "start",
+        "drawing",
+        "round",
+        "drawing",
+        "round",
+        "complete",
+    ]
+    assert events[1][2]["drawer"] == "Harold"
+
+
+def test_draw_command_broadcast_address_in_use(
+    temp_entrants_txt_file: Path, temp_picks_txt_file: Path
+):
+    with socket.socket() as listener:
+        listener.bind(("127.0.0.1", 0))
+        listener.listen()
+        port = listener.getsockname()[1]
+        result = CliRunner().invoke(
+            draw_command,
+            [
+                "--entrants",
+                temp_entrants_txt_file,
+                "--picks",
+                temp_picks_txt_file,
+                "--delay",
+                0,
+                "--broadcast",
+                f"127.0.0.1:{port}",
+            ],
+        )
+    assert result.exit_code != 0
+    assert f"Can't broadcast on 127.0.0.1:{port}" in result.output
+
+
+def test_draw_command_broadcast(
+    temp_entrants_txt_file: Path, temp_picks_txt_file: Path
+):
+    result = CliRunner().invoke(
+        draw_command,
+        [
+            "--entrants",
+            temp_entrants_txt_file,
+            "--picks",
+            temp_picks_txt_file,
+            "--delay",
+            0,
+            "--quiet",
+            "--broadcast",
+            "127.0.0.1:0",
+        ],
+    )
+    assert result.exit_code == 0, result.output
+    assert "Broadcasting draw at http://127.0.0.1:" in result.output
@@ -0,0 +1,74 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from sweeper.cache import InputCache
+from sweeper.column import StringColumn
+from sweeper.validate import load_validated_entries
+
+
+def test_input_cache_put_and_get(tmp_path: Path, temp_entrants_txt_file: Path):
+    cache = InputCache(tmp_path / "cache")
+    key = cache.key(temp_entrants_txt_file)
+    assert cache.get(key) is None
+
+    cache.put(key, StringColumn.from_strings(["Harold", "Jim"]))
+    assert list(cache.get(key)) == ["Harold", "Jim"]
+
+
+def test_input_cache_close_releases_columns(tmp_path: Path):
+    with InputCache(tmp_path / "cache") as cache:
+        cache.put("names", StringColumn.from_strings(["Harold", "Jim"]))
+        column = cache.get("names")
+        assert column[1] == "Jim"
+    with pytest.raises(ValueError, match="released"):
+        column[1]
+
+
+def test_input_cache_key_changes_with_file_and_options(
+    tmp_path: Path, temp_entrants_txt_file: Path
+):
+    cache = InputCache(tmp_path / "cache")
+    key = cache.key(temp_entrants_txt_file)
+    assert key == cache.key(temp_entrants_txt_file)
+    assert key != cache.key(temp_entrants_txt_file, "name")
+    assert key != cache.key(temp_entrants_txt_file, casefold=True)
+
+    temp_entrants_txt_file.write_text("Harold\nJim\nMargaret\nJohn")
+    assert key != cache.key(temp_entrants_txt_file)
+
+
+def test_input_cache_evicts_least_recently_used(tmp_path: Path):
+    column = StringColumn.from_strings(["x" * 100])
+    entry_size = len(column.to_bytes())
+    cache = InputCache(tmp_path / "cache", max_size=entry_size * 2)
+
+    cache.put("first", column)
+    os.utime(cache.path("first"), ns=(1, 1))
+    cache.put("second", column)
+    os.utime(cache.path("second"), ns=(2, 2))
+    cache.put("third", column)
+
+    assert cache.get("first") is None
+    assert cache.get("second") is not None
+    assert cache.get("third") is not None
+
+
+def test_load_validated_entries_uses_cache(
+    mocker, tmp_path: Path, temp_entrants_csv_file: Path
+):
+    cache = InputCache(tmp_path / "cache")
+    entries = load_validated_entries(
+        temp_entrants_csv_file, "name", label="Entrants", cache=cache
+    )
+    assert entries == ["Harold", "Jim", "Margaret"]
+
+    mock_iter = mocker.patch("sweeper.validate.iter_entries_from_file")
+    cached = load_validated_entries(
+        temp_entrants_csv_file, "name", label="Entrants", cache=cache
+    )
+    # Returned as the memory-mapped column, without copying it to a list
+    assert isinstance(cached, StringColumn)
+    assert list(cached) == entries
+    mock_iter.assert_not_called()
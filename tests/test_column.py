@@ -0,0 +1,60 @@
+import pytest
+
+from sweeper.column import ColumnTable, StringColumn, StringColumnBuilder
+
+
+def test_string_column_sequence():
+    column = StringColumn.from_strings(["Harold", "Jim", "Márgarét", ""])
+    assert len(column) == 4
+    assert list(column) == ["Harold", "Jim", "Márgarét", ""]
+    assert column[2] == "Márgarét"
+    assert column[-1] == ""
+    assert column[1:3] == ["Jim", "Márgarét"]
+    assert "Jim" in column
+
+
+def test_string_column_index_out_of_range():
+    column = StringColumn.from_strings(["Harold"])
+    with pytest.raises(IndexError):
+        column[1]
+
+
+def test_string_column_round_trip():
+    column = StringColumn.from_strings(["Harold", "Jim", "Margaret"])
+    loaded = StringColumn.from_buffer(column.to_bytes())
+    assert list(loaded) == ["Harold", "Jim", "Margaret"]
+    assert loaded.to_bytes() == column.to_bytes()
+
+
+def test_string_column_empty_round_trip():
+    loaded = StringColumn.from_buffer(StringColumn.from_strings([]).to_bytes())
+    assert len(loaded) == 0
+    assert list(loaded) == []
+
+
+def test_string_column_from_invalid_buffer_raises_error():
+    with pytest.raises(ValueError, match="does not contain a serialised StringColumn"):
+        StringColumn.from_buffer(b"\x00" * 64)
+
+
+def test_string_column_builder():
+    builder = StringColumnBuilder()
+    for value in ["Harold", "Jim"]:
+        builder.append(value)
+    assert len(builder) == 2
+    assert list(builder.build()) == ["Harold", "Jim"]
+
+
+def test_column_table_row():
+    table = ColumnTable(
+        ["Harold", "Jim"],
+        {
+            "email": StringColumn.from_strings(
+                ["harold@example.com", "jim@example.com"]
+            ),
+            "team": StringColumn.from_strings(["Red", "Blue"]),
+        },
+    )
+    assert len(table) == 2
+    assert table.row("Jim") == {"email": "jim@example.com", "team": "Blue"}
+    assert table.row("Nobody") == {"email": "", "team": ""}
@@ -0,0 +1,162 @@
+import json
+import random
+from pathlib import Path
+
+from click.testing import CliRunner
+
+from sweeper.commitment import (
+    build_commitment,
+    get_commitment_path,
+    hash_entries,
+    hash_result,
+    load_commitment,
+    verify_command,
+    verify_commitment,
+    write_commitment,
+)
+from sweeper.draw import compute_result, draw, draw_command
+from sweeper.sweepstake import Sweepstake
+
+
+ENTRANTS = ["Harold", "Jim", "Margaret", "John", "Tony", "Gordon"]
+PICKS = ["Bengals", "Bills", "Chiefs", "Dolphins", "Eagles", "Falcons"]
+
+
+def test_hash_entries_is_length_prefixed():
+    assert hash_entries(["ab", "c"]) != hash_entries(["a", "bc"])
+    assert hash_entries(["a", "b"])[1] == 2
+
+
+def test_hash_result_depends_on_order():
+    assert hash_result([("a", "1"), ("b", "2")]) != hash_result(
+        [("b", "2"), ("a", "1")]
+    )
+
+
+def test_compute_result_matches_draw():
+    for draw_order in ["entrants", "picks", "shuffle"]:
+        expected = draw(
+            ENTRANTS,
+            PICKS,
+            draw_order=draw_order,
+            delay=0,
+            quiet=True,
+            rng=random.Random(7),
+        )
+        result = compute_result(
+            ENTRANTS, PICKS, draw_order=draw_order, rng=random.Random(7)
+        )
+        assert list(result.items()) == list(expected.items())
+
+
+def test_commitment_round_trip(tmp_path: Path):
+    result = compute_result(ENTRANTS, PICKS, rng=random.Random(1))
+    commitment = build_commitment(
+        entrants=ENTRANTS, picks=PICKS, draw_order="entrants", seed=1, result=result
+    )
+    path = tmp_path / "draw.commitment.json"
+    write_commitment(commitment, path)
+    assert load_commitment(path) == commitment
+    assert commitment["result_count"] == len(ENTRANTS)
+
+
+def test_get_commitment_path():
+    assert get_commitment_path(Path("out/results.csv.gz")) == Path(
+        "out/results.csv.gz.commitment.json"
+    )
+
+
+def test_draw_command_writes_commitment_and_verifies(tmp_path: Path):
+    entrants = tmp_path / "entrants.txt"
+    picks = tmp_path / "picks.txt"
+    entrants.write_text("\n".join(ENTRANTS))
+    picks.write_text("\n".join(PICKS))
+    output = tmp_path / "results.csv"
+
+    runner = CliRunner()
+    result = runner.invoke(
+        draw_command,
+        [
+            "--entrants",
+            entrants,
+            "--picks",
+            picks,
+            "--draw-order",
+            "shuffle",
+            "--seed",
+            "42",
+            "--quiet",
+            "--output-file",
+            output,
+        ],
+    )
+    assert result.exit_code == 0, result.output
+    commitment = json.loads(get_commitment_path(output).read_text())
+    assert commitment["seed"] == 42
+    assert commitment["draw_order"] == "shuffle"
+
+    result = runner.invoke(
+        verify_command,
+        [str(output), "--entrants", entrants, "--picks", picks],
+    )
+    assert result.exit_code == 0, result.output
+    assert "Verified 6 results" in result.output
+
+
+def test_verify_detects_tampered_results(tmp_path: Path):
+    result = compute_result(ENTRANTS, PICKS, rng=random.Random(3))
+    commitment = build_commitment(
+        entrants=ENTRANTS, picks=PICKS, draw_order="entrants", seed=3, result=result
+    )
+    output = tmp_path / "results.csv"
+    rows = [f"{entrant},{pick}" for entrant, pick in result.items()]
+    rows[0], rows[1] = rows[0].split(",")[0] + "," + rows[1].split(",")[1], rows[1]
+    output.write_text("entrant,pick\n" + "\n".join(rows) + "\n")
+
+    failures = verify_commitment(commitment, output)
+    assert failures == ["Results file does not match the committed result digest"]
+
+
+def test_verify_detects_different_inputs(tmp_path: Path):
+    result = compute_result(ENTRANTS, PICKS, rng=random.Random(3))
+    commitment = build_commitment(
+        entrants=ENTRANTS, picks=PICKS, draw_order="entrants", seed=3, result=result
+    )
+    output = tmp_path / "results.csv"
+    rows = [f"{entrant},{pick}" for entrant, pick in result.items()]
+    output.write_text("entrant,pick\n" + "\n".join(rows) + "\n")
+
+    assert verify_commitment(commitment, output, ENTRANTS, PICKS) == []
+    failures = verify_commitment(commitment, output, ENTRANTS[::-1], PICKS)
+    assert "Entrants do not match the committed hash" in failures
+    assert "Result recomputed from the inputs and seed does not match" in failures
+
+
+def test_verify_version_1_commitment(tmp_path: Path):
+    # Commitments written before draw algorithms were recorded used algorithm 1
+    result = Sweepstake(ENTRANTS, PICKS, draw_algorithm=1).draw(seed=3).to_dict()
+    commitment = build_commitment(
+        entrants=ENTRANTS,
+        picks=PICKS,
+        draw_order="entrants",
+        seed=3,
+        result=result,
+        draw_algorithm=1,
+    )
+    del commitment["draw_algorithm"]
+    commitment["version"] = 1
+    path = tmp_path / "results.csv.commitment.json"
+    write_commitment(commitment, path)
+    output = tmp_path / "results.csv"
+    rows = [f"{entrant},{pick}" for entrant, pick in result.items()]
+    output.write_text("entrant,pick\n" + "\n".join(rows) + "\n")
+
+    assert verify_commitment(load_commitment(path), output, ENTRANTS, PICKS) == []
+
+
+def test_verify_command_missing_commitment(tmp_path: Path):
+    output = tmp_path / "results.csv"
+    output.write_text("entrant,pick\n")
+    result = CliRunner().invoke(verify_command, [str(output)])
+    assert result.exit_code == 1
+    assert "not found" in result.output
@@ -0,0 +1,181 @@
+import random
+from collections import Counter
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from sweeper.derangement import (
+    check_derangeable,
+    get_derangement_ratios,
+    random_cycle,
+    random_derangement,
+)
+from sweeper.draw import draw
+from sweeper.io import load_result_from_csv
+from sweeper.main import sweeper
+from sweeper.sweepstake import Sweepstake
+from sweeper.validate import check_unique
+
+
+NAMES = ["Harold", "Jim", "Margaret", "John", "Tony"]
+
+
+def cycle_length(permutation) -> int:
+    length, index = 1, permutation[0]
+    while index != 0:
+        length, index = length + 1, permutation[index]
+    return length
+
+
+def test_get_derangement_ratios():
+    # D(k) = 1, 0, 1, 2, 9, 44, 265
+    ratios = get_derangement_ratios(6)
+    factorials = [1, 1, 2, 6, 24, 120, 720]
+    counts = [1, 0, 1, 2, 9, 44, 265]
+    assert ratios == pytest.approx(
+        [count / factorial for count, factorial in zip(counts, factorials)]
+    )
+
+
+@pytest.mark.parametrize("n, derangements", [(3, 2), (4, 9)])
+def test_random_derangement_is_uniform(n: int, derangements: int):
+    rng = random.Random(7)
+    draws = 2000 * derangements
+    counts = Counter(tuple(random_derangement(n, rng)) for _ in range(draws))
+    assert len(counts) == derangements
+    for permutation, count in counts.items():
+        assert all(value != index for index, value in enumerate(permutation))
+        assert abs(count - 2000) < 250
+
+
+def test_random_cycle_is_uniform():
+    rng = random.Random(7)
+    counts = Counter(tuple(random_cycle(4, rng)) for _ in range(12000))
+    # (n - 1)! cycles of 4 items
+    assert len(counts) == 6
+    assert all(cycle_length(permutation) == 4 for permutation in counts)
+    assert all(abs(count - 2000) < 250 for count in counts.values())
+
+
+def test_large_derangement():
+    rng = random.Random(7)
+    derangement = random_derangement(100_000, rng)
+    check_unique(enumerate(derangement, start=1), label="Picks")
+    assert all(value != index for index, value in enumerate(derangement))
+    assert cycle_length(random_cycle(100_000, rng)) == 100_000
+
+
+def test_check_derangeable():
+    check_derangeable(NAMES, list(reversed(NAMES)))
+    with pytest.raises(ValueError, match="must be the same names"):
+        check_derangeable(NAMES, NAMES[:-1] + ["Dolphins"])
+    with pytest.raises(ValueError, match="at least 2 entrants"):
+        check_derangeable(["Harold"], ["Harold"])
+
+
+@pytest.mark.parametrize("draw_order", ["entrants", "picks", "shuffle"])
+@pytest.mark.parametrize("derangement", ["any", "single-cycle"])
+def test_sweepstake_derangement_matches_draw(draw_order: str, derangement: str):
+    picks = sorted(NAMES)
+    sweepstake = Sweepstake(
+        NAMES, picks, draw_order=draw_order, derangement=derangement
+    )
+    expected = draw(
+        NAMES,
+        picks,
+        draw_order=draw_order,
+        delay=0,
+        quiet=True,
+        rng=random.Random(11),
+        derangement=derangement,
+    )
+    assert sweepstake.draw(seed=11).to_dict() == expected
+    assert sorted(expected.values()) == picks
+    assert all(entrant != pick for entrant, pick in expected.items())
+    if derangement == "single-cycle":
+        entrant, seen = NAMES[0], set()
+        while entrant not in seen:
+            seen.add(entrant)
+            entrant = expected[entrant]
+        assert seen == set(NAMES)
+
+
+def test_draw_derangement_rejects_journal(tmp_path: Path, mocker):
+    with pytest.raises(ValueError, match="must be the same names"):
+        draw(NAMES, NAMES[:-1] + ["Dolphins"], quiet=True, derangement="any")
+    with pytest.raises(ValueError, match="can't be recorded to a journal"):
+        draw(NAMES, NAMES, quiet=True, derangement="any", journal=mocker.Mock())
+
+
+def test_draw_command_derangement(tmp_path: Path):
+    names_file = tmp_path / "names.txt"
+    names_file.write_text("\n".join(NAMES))
+    output = tmp_path / "results.csv"
+    runner = CliRunner()
+    result = runner.invoke(
+        sweeper,
+        [
+            "--log-file",
+            str(tmp_path / "sweeper.log"),
+            "draw",
+            "--entrants",
+            str(names_file),
+            "--picks",
+            str(names_file),
+            "--derangement",
+            "--single-cycle",
+            "--quiet",
+            "--delay",
+            "0",
+            "--output-file",
+            str(output),
+        ],
+    )
+    assert result.exit_code == 0, result.output
+    results = load_result_from_csv(output)
+    assert sorted(results.values()) == sorted(NAMES)
+    assert all(entrant != pick for entrant, pick in results.items())
+
+    # The derangement is committed, so the draw can be recomputed from the seed
+    result = runner.invoke(
+        sweeper,
+        [
+            "--log-file",
+            str(tmp_path / "sweeper.log"),
+            "verify",
+            str(output),
+            "--entrants",
+            str(names_file),
+            "--picks",
+            str(names_file),
+        ],
+    )
+    assert result.exit_code == 0, result.output
+
+
+@pytest.mark.parametrize(
+    "args, message",
+    [
+        (["--single-cycle"], "--single-cycle needs --derangement"),
+        (["--derangement", "--journal", "draw.journal"], "--journal cannot be used"),
+    ],
+)
+def test_draw_command_derangement_usage_errors(
+    tmp_path: Path, temp_entrants_txt_file: Path, args: list, message: str
+):
+    result = CliRunner().invoke(
+        sweeper,
+        [
+            "--log-file",
+            str(tmp_path / "sweeper.log"),
+            "draw",
+            "--entrants",
+            str(temp_entrants_txt_file),
+            "--picks",
+            str(temp_entrants_txt_file),
+        ]
+        + args,
+    )
+    assert result.exit_code == 2
+    assert message in result.output
@@ -1,3 +1,5 @@
+import csv
+import gzip
 import json
 from pathlib import Path
 
@@ -5,7 +7,9 @@ import click
 import pytest
 from click.testing import CliRunner
 
-from sweeper.draw import draw, draw_command
+from sweeper.draw import draw, draw_command, get_delta_inputs
+from sweeper.io import load_result_from_file
+from sweeper.main import sweeper
 
 
 def test_draw():
@@ -98,14 +102,15 @@ def test_draw_command_short_options(
 
 
 def test_draw_command_passes_on_arguments(
-    mocker, temp_picks_txt_file: Path, temp_entrants_txt_file: Path
+    mocker, tmp_path: Path, temp_picks_txt_file: Path, temp_entrants_txt_file: Path
 ):
     mock_draw = mocker.patch("sweeper.draw.draw")
-    mock_get_lines = mocker.patch("sweeper.draw.get_lines_from_file")
-    mock_get_lines.side_effect = [
+    mock_load_inputs = mocker.patch("sweeper.draw.load_validated_inputs")
+    mock_load_inputs.return_value = (
         ["Harold", "Jim", "Margaret"],
         ["Bengals", "Bills", "Chiefs"],
-    ]
+        None,
+    )
 
     runner = CliRunner()
     result = runner.invoke(
@@ -120,18 +125,35 @@ def test_draw_command_passes_on_arguments(
             "--draw-order",
             "shuffle",
             "--output-file",
-            "output.csv",
+            tmp_path / "output.csv",
             "--quiet",
         ],
     )
-    mock_get_lines.assert_any_call(filepath=temp_picks_txt_file)
-    mock_get_lines.assert_any_call(filepath=temp_entrants_txt_file)
+    mock_load_inputs.assert_called_once_with(
+        entrants=temp_entrants_txt_file,
+        entrants_column=None,
+        picks=temp_picks_txt_file,
+        picks_column=None,
+        metadata_columns=None,
+        casefold=False,
+        cache=None,
+        max_memory=None,
+        workers=None,
+    )
     mock_draw.assert_called_once_with(
         entrants=["Harold", "Jim", "Margaret"],
         picks=["Bengals", "Bills", "Chiefs"],
         draw_order="shuffle",
         delay=0.0,
         quiet=True,
+        validate=False,
+        rng=mocker.ANY,
+        journal=None,
+        log_rounds=False,
+        show_table=True,
+        presenter=None,
+        broadcast=None,
+        derangement=None,
     )
 
 
@@ -149,7 +171,7 @@ def test_draw_command_file_does_not_exist_raises_error():
 def test_draw_command_with_csv_columns(
     mocker, temp_entrants_csv_file, temp_picks_csv_file
 ):
-    mock_load_csv = mocker.patch("sweeper.draw.load_csv")
+    mock_iter_csv_column = mocker.patch("sweeper.io.iter_csv_column")
 
     runner = CliRunner()
     result = runner.invoke(
@@ -168,8 +190,40 @@ def test_draw_command_with_csv_columns(
         ],
     )
 
-    mock_load_csv.assert_any_call(filepath=temp_entrants_csv_file, column_index=1)
-    mock_load_csv.assert_any_call(filepath=temp_picks_csv_file, column_index=1)
+    mock_iter_csv_column.assert_any_call(
+        filepath=temp_entrants_csv_file, column_index=1
+    )
+    mock_iter_csv_column.assert_any_call(filepath=temp_picks_csv_file, column_index=1)
+
+
+def test_draw_command_with_json_inputs(tmp_path: Path):
+    entrants_file = tmp_path / "staff.json"
+    entrants_file.write_text(
+        '{"staff": [{"name": "Harold"}, {"name": "Jim"}, {"name": "Margaret"}]}'
+    )
+    picks_file = tmp_path / "picks.jsonl"
+    picks_file.write_text('"Bengals"\n"Bills"\n"Chiefs"\n')
+    output = tmp_path / "results.json"
+    runner = CliRunner()
+    result = runner.invoke(
+        draw_command,
+        [
+            "--entrants",
+            str(entrants_file),
+            "--entrants-column",
+            "staff[*].name",
+            "--picks",
+            str(picks_file),
+            "--delay",
+            "0",
+            "--output-file",
+            str(output),
+        ],
+    )
+    assert result.exit_code == 0, result.output
+    results = load_result_from_file(output)
+    assert sorted(results) == ["Harold", "Jim", "Margaret"]
+    assert sorted(results.values()) == ["Bengals", "Bills", "Chiefs"]
 
 
 def test_draw_command_with_csv_but_no_column_raises_error(
@@ -205,7 +259,7 @@ def test_draw_command_invalid_file_suffix_raises_error(temp_py_file: Path):
     )
     assert result.exit_code != 0
     assert isinstance(result.exception, ValueError)
-    assert "file must be a .csv or .txt file" in result.exception.args[0]
+    assert "file must be a .csv, .json, .jsonl or .txt file" in result.exception.args[0]
 
 
 def test_draw_command_creates_valid_output_csv_file(
@@ -281,3 +335,210 @@ def test_draw_command_invalid_output_file_suffix_raises_error(
     assert result.exit_code != 0
     assert isinstance(result.exception, ValueError)
     assert "Output file must be a .csv or .json file" in result.exception.args[0]
+
+
+def test_draw_duplicates_error_reports_only_offending_values():
+    entrants = ["Harold", "Jim", "Margaret", "Jim"]
+    picks = ["Bengals", "Bills", "Chiefs", "Dolphins"]
+    with pytest.raises(ValueError) as error:
+        draw(entrants=entrants, picks=picks, delay=0)
+    assert "'Jim' on lines 2, 4" in error.value.args[0]
+    assert "Harold" not in error.value.args[0]
+
+
+def test_draw_command_dry_run(temp_picks_txt_file: Path, temp_entrants_txt_file: Path):
+    runner = CliRunner()
+    result = runner.invoke(
+        draw_command,
+        [
+            "--picks",
+            temp_picks_txt_file,
+            "--entrants",
+            temp_entrants_txt_file,
+            "--dry-run",
+        ],
+    )
+    assert result.exit_code == 0
+    assert "Validation passed: 3 entrants, 3 picks" in result.output
+    assert "Draw complete" not in result.output
+
+
+def test_get_delta_inputs():
+    entrants, picks = get_delta_inputs(
+        ["Harold", "Jim", "Margaret"],
+        iter(["Bengals", "Bills", "Chiefs", "Dolphins"]),
+        {"Harold", "Jim"},
+        {"Bills", "Dolphins"},
+    )
+    assert entrants == ["Margaret"]
+    assert picks == ["Bengals", "Chiefs"]
+
+
+def test_get_delta_inputs_too_few_picks_raises_error():
+    with pytest.raises(ValueError, match="not enough picks"):
+        get_delta_inputs(
+            ["Harold", "Jim"],
+            ["Bengals", "Bills"],
+            {"Harold", "Tony"},
+            {"Bills", "Bengals"},
+        )
+
+
+def test_draw_command_append_to(
+    temp_picks_txt_file: Path, temp_entrants_txt_file: Path, tmp_path: Path
+):
+    output_file = tmp_path / "results.csv"
+    output_file.write_text("entrant,pick\nJim,Bills\n")
+    runner = CliRunner()
+    result = runner.invoke(
+        draw_command,
+        [
+            "--picks",
+            temp_picks_txt_file,
+            "--entrants",
+            temp_entrants_txt_file,
+            "--delay",
+            0,
+            "--append-to",
+            output_file,
+        ],
+    )
+    assert result.exit_code == 0
+    lines = output_file.read_text().splitlines()
+    assert lines[:2] == ["entrant,pick", "Jim,Bills"]
+    assert sorted(line.split(",")[0] for line in lines[2:]) == ["Harold", "Margaret"]
+    assert sorted(line.split(",")[1] for line in lines[1:]) == [
+        "Bengals",
+        "Bills",
+        "Chiefs",
+    ]
+
+
+def test_draw_command_append_to_recommits_results_file(tmp_path: Path):
+    entrants = tmp_path / "entrants.txt"
+    entrants.write_text("Harold\nJim\nMargaret\n")
+    late_entrants = tmp_path / "late_entrants.txt"
+    late_entrants.write_text("Harold\nJim\nMargaret\nJohn\n")
+    picks = tmp_path / "picks.txt"
+    picks.write_text("Bengals\nBills\nChiefs\nDolphins\nEagles\n")
+    output_file = tmp_path / "results.csv"
+    log_file = str(tmp_path / "sweeper.log")
+    runner = CliRunner()
+    for entrants_file, args in [
+        (entrants, ["--output-file", str(output_file), "--seed", "1"]),
+        (late_entrants, ["--append-to", str(output_file), "--seed", "2"]),
+    ]:
+        result = runner.invoke(
+            sweeper,
+            ["--log-file", log_file, "draw", "--entrants", str(entrants_file)]
+            + ["--picks", str(picks), "--quiet", "--delay", "0"]
+            + args,
+        )
+        assert result.exit_code == 0, result.output
+
+    result = runner.invoke(
+        sweeper, ["--log-file", log_file, "verify", str(output_file)]
+    )
+    assert result.exit_code == 0, result.output
+    assert "Verified 4 results" in result.output
+
+
+def test_draw_command_append_to_needs_appendable_format(
+    temp_entrants_txt_file: Path, temp_picks_txt_file: Path, tmp_path: Path
+):
+    result = CliRunner().invoke(
+        draw_command,
+        [
+            "--entrants",
+            str(temp_entrants_txt_file),
+            "--picks",
+            str(temp_picks_txt_file),
+            "--append-to",
+            str(tmp_path / "results.txt"),
+        ],
+    )
+    assert result.exit_code == 2
+    assert "--append-to must be a .csv or .json file, got .txt" in result.output
+
+
+def test_draw_command_compressed_input_and_output(
+    temp_picks_txt_file: Path, tmp_path: Path
+):
+    entrants_file = tmp_path / "entrants.txt.gz"
+    with gzip.open(entrants_file, "wt") as out_file:
+        out_file.write("Harold\nJim\nMargaret\n")
+    output_file = tmp_path / "results.json.gz"
+    runner = CliRunner()
+    result = runner.invoke(
+        draw_command,
+        [
+            "--entrants",
+            entrants_file,
+            "--picks",
+            temp_picks_txt_file,
+            "--delay",
+            0,
+            "--output-file",
+            output_file,
+        ],
+    )
+    assert result.exit_code == 0
+    with gzip.open(output_file, "rt") as in_file:
+        assert list(json.load(in_file)) == ["Harold", "Jim", "Margaret"]
+
+
+def test_draw_command_output_to_stdout(
+    temp_picks_txt_file: Path, temp_entrants_txt_file: Path
+):
+    runner = CliRunner()
+    result = runner.invoke(
+        draw_command,
+        [
+            "--entrants",
+            temp_entrants_txt_file,
+            "--picks",
+            temp_picks_txt_file,
+            "--delay",
+            0,
+            "--output-file",
+            "-",
+            "--output-format",
+            "json",
+        ],
+    )
+    assert result.exit_code == 0
+    assert list(json.loads(result.stdout)) == ["Harold", "Jim", "Margaret"]
+    assert "Draw complete" in result.stderr
+
+
+def test_draw_command_with_metadata_columns(tmp_path: Path):
+    staff_file = tmp_path / "staff.csv"
+    staff_file.write_text(
+        "name,team,email\nHarold,Bengals,h@x.com\nJim,Bills,j@x.com\n"
+    )
+    output_file = tmp_path / "results.csv"
+    runner = CliRunner()
+    result = runner.invoke(
+        draw_command,
+        [
+            "--entrants",
+            staff_file,
+            "--entrants-column",
+            "name",
+            "--picks",
+            staff_file,
+            "--picks-column",
+            "team",
+            "--metadata-columns",
+            "email",
+            "--delay",
+            0,
+            "--output-file",
+            output_file,
+        ],
+    )
+    assert result.exit_code == 0
+    with open(output_file, "r", newline="") as in_file:
+        rows = list(csv.DictReader(in_file))
+    assert [row["email"] for row in rows] == ["h@x.com", "j@x.com"]
+    assert sorted(row["pick"] for row in rows) == ["Bengals", "Bills"]
@@ -0,0 +1,134 @@
+import random
+from collections import Counter
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from sweeper.commitment import build_commitment, get_commitment_path
+from sweeper.draw import draw_command
+from sweeper.external import ExternalDraw, ExternalShuffle
+from sweeper.io import iter_result_from_file, load_result_from_csv
+
+
+def test_external_shuffle_is_uniform(tmp_path: Path):
+    rng = random.Random(3)
+    counts = Counter()
+    for _ in range(1200):
+        # A budget of a couple of entries forces scattering to disk
+        shuffle = ExternalShuffle(rng, max_memory=600, directory=tmp_path, buckets=4)
+        for entry in "abcd":
+            shuffle.add(entry)
+        counts["".join(shuffle)] += 1
+    assert len(counts) == 24
+    assert all(20 < count < 80 for count in counts.values())
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_external_shuffle_without_rng_keeps_order(tmp_path: Path):
+    shuffle = ExternalShuffle(None, max_memory=1, directory=tmp_path)
+    entries = [f"entry{i}" for i in range(100)]
+    for entry in entries:
+        shuffle.add(entry)
+    assert list(shuffle) == entries
+
+
+@pytest.fixture
+def inputs(tmp_path: Path) -> tuple[Path, Path]:
+    entrants = tmp_path / "entrants.txt"
+    entrants.write_text("\n".join(f"ticket{i}" for i in range(300)) + "\n")
+    picks = tmp_path / "picks.txt"
+    picks.write_text("\n".join(f"prize{i}" for i in range(400)) + "\n")
+    return entrants, picks
+
+
+@pytest.mark.parametrize("draw_order", ["entrants", "picks", "shuffle"])
+def test_external_draw(inputs: tuple[Path, Path], draw_order: str):
+    entrants, picks = inputs
+    entrants_list = entrants.read_text().split()
+    picks_list = picks.read_text().split()
+    with ExternalDraw(
+        entrants,
+        None,
+        picks,
+        None,
+        rng=random.Random(1),
+        draw_order=draw_order,
+        max_memory=8192,
+    ) as external_draw:
+        result = dict(external_draw.items())
+
+    assert sorted(result) == sorted(entrants_list)
+    assert len(set(result.values())) == len(entrants_list)
+    assert set(result.values()) <= set(picks_list)
+    if draw_order == "entrants":
+        assert list(result) == entrants_list
+    elif draw_order == "picks":
+        assert sorted(result.values(), key=picks_list.index) == list(result.values())
+    assert external_draw.get_commitment() == build_commitment(
+        entrants=entrants_list,
+        picks=picks_list,
+        draw_order=draw_order,
+        seed=None,
+        result=result,
+    )
+
+
+def test_external_draw_checks_inputs(inputs: tuple[Path, Path], tmp_path: Path):
+    entrants, picks = inputs
+    with pytest.raises(ValueError, match="not enough picks"):
+        ExternalDraw(picks, None, entrants, None, rng=random.Random(1))
+    duplicated = tmp_path / "duplicated.txt"
+    duplicated.write_text("Jim\nHarold\nJim\n")
+    with pytest.raises(ValueError, match="'Jim' on lines 1, 3"):
+        ExternalDraw(duplicated, None, picks, None, rng=random.Random(1))
+
+
+def test_draw_command_out_of_core(inputs: tuple[Path, Path], tmp_path: Path):
+    entrants, picks = inputs
+    output = tmp_path / "results.csv"
+    runner = CliRunner()
+    result = runner.invoke(
+        draw_command,
+        [
+            "--entrants",
+            entrants,
+            "--picks",
+            picks,
+            "--out-of-core",
+            "--max-memory",
+            "8K",
+            "--output-file",
+            output,
+        ],
+    )
+    assert result.exit_code == 0, result.output
+    assert len(load_result_from_csv(output)) == 300
+    assert get_commitment_path(output).exists()
+
+    result = runner.invoke(
+        draw_command,
+        ["--entrants", entrants, "--picks", picks, "--out-of-core", "--journal", "j"],
+    )
+    assert result.exit_code != 0
+    assert "--journal cannot be used with --out-of-core" in result.output
+
+
+def test_draw_command_out_of_core_to_sqlite(inputs: tuple[Path, Path], tmp_path: Path):
+    entrants, picks = inputs
+    uri = f"sqlite:///{tmp_path / 'draws.db'}?table=results"
+    runner = CliRunner()
+    result = runner.invoke(
+        draw_command,
+        [
+            "--entrants",
+            entrants,
+            "--picks",
+            picks,
+            "--out-of-core",
+            "--output-file",
+            uri,
+        ],
+    )
+    assert result.exit_code == 0, result.output
+    assert len(list(iter_result_from_file(uri))) == 300
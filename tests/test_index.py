@@ -0,0 +1,110 @@
+import csv
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from sweeper.draw import draw_command
+from sweeper.index import ResultIndex, get_index_path, iter_row_offsets, write_index
+from sweeper.io import write_result_to_csv
+from sweeper.main import sweeper
+
+
+RESULT = {
+    "Harold": "Bengals",
+    "Jim": "Bills",
+    'Margaret "Maggie"\nThatcher': "Chiefs",
+    "John": "Dolphins, Miami",
+}
+
+
+@pytest.fixture
+def results_file(tmp_path: Path) -> Path:
+    path = tmp_path / "results.csv"
+    write_result_to_csv(RESULT, path)
+    return path
+
+
+def test_iter_row_offsets_handles_quoted_newlines(results_file: Path):
+    data = results_file.read_bytes()
+    rows = list(iter_row_offsets(results_file))
+    assert [row for _, row in rows] == [list(item) for item in RESULT.items()]
+    for offset, row in rows:
+        lines = data[offset:].decode("utf-8").splitlines(keepends=True)
+        assert next(csv.reader(lines)) == row
+
+
+def test_result_index_lookups(results_file: Path):
+    write_index(results_file)
+    with ResultIndex(results_file) as index:
+        for entrant, pick in RESULT.items():
+            assert index.lookup_entrant(entrant) == {"entrant": entrant, "pick": pick}
+            assert index.lookup_pick(pick)["entrant"] == entrant
+        assert index.lookup_entrant("Nobody") is None
+        assert index.lookup_pick("Bengals ") is None
+
+
+def test_result_index_with_many_rows(tmp_path: Path):
+    path = tmp_path / "results.csv"
+    result = {f"ticket{i}": f"prize{i * 7 % 5000}" for i in range(5000)}
+    write_result_to_csv(result, path)
+    write_index(path)
+    with ResultIndex(path) as index:
+        assert index.lookup_entrant("ticket4321")["pick"] == result["ticket4321"]
+        assert index.lookup_pick("prize0")["entrant"] == "ticket0"
+
+
+def test_result_index_rejects_stale_index(results_file: Path):
+    write_index(results_file)
+    with open(results_file, "a") as csv_file:
+        csv_file.write("Tony,Eagles\r\n")
+    with pytest.raises(ValueError, match="out of date"):
+        ResultIndex(results_file)
+
+
+def test_write_index_rejects_compressed_files(tmp_path: Path):
+    with pytest.raises(ValueError, match="uncompressed .csv"):
+        write_index(tmp_path / "results.csv.gz")
+
+
+def test_draw_command_index_and_lookup(
+    tmp_path: Path, temp_entrants_txt_file: Path, temp_picks_txt_file: Path
+):
+    output = tmp_path / "results.csv"
+    runner = CliRunner()
+    result = runner.invoke(
+        draw_command,
+        [
+            "--entrants",
+            temp_entrants_txt_file,
+            "--picks",
+            temp_picks_txt_file,
+            "--quiet",
+            "--output-file",
+            output,
+            "--index",
+        ],
+    )
+    assert result.exit_code == 0, result.output
+    assert get_index_path(output).exists()
+
+    result = runner.invoke(sweeper, ["lookup", str(output), "--entrant", "Jim"])
+    assert result.exit_code == 0, result.output
+    assert result.output.startswith("Jim: ")
+
+    result = runner.invoke(sweeper, ["lookup", str(output), "--entrant", "Nobody"])
+    assert result.exit_code != 0
+    assert "Entrant 'Nobody' not found" in result.output
+
+
+def test_lookup_command_without_index(results_file: Path):
+    runner = CliRunner()
+    result = runner.invoke(sweeper, ["lookup", str(results_file), "--pick", "Bills"])
+    assert result.exit_code != 0
+    assert "--build-index" in result.output
+
+    result = runner.invoke(
+        sweeper, ["lookup", str(results_file), "--pick", "Bills", "--build-index"]
+    )
+    assert result.exit_code == 0, result.output
+    assert result.output == "Jim: Bills\n"
@@ -1,15 +1,36 @@
 import csv
+import io
 import json
+import sys
 from pathlib import Path
 
 import pytest
 
+from sweeper.column import ColumnTable, StringColumn
+import sweeper.io
 from sweeper.io import (
+    EntriesFormat,
+    ResultsFormat,
+    TextFormat,
+    describe_formats,
+    get_format,
     get_lines_from_file,
     get_path_suffix,
+    iter_csv_column,
+    iter_csv_columns,
+    iter_entries_from_file,
+    iter_json_entries,
+    iter_json_lines_entries,
+    iter_lines_from_file,
     load_csv_rows_as_lists,
     load_csv_rows_as_dicts,
     load_csv,
+    append_result_to_csv,
+    append_result_to_json,
+    load_result_from_file,
+    load_taken_from_file,
+    open_text,
+    register_format,
     write_result_to_csv,
     write_result_to_json,
 )
@@ -164,3 +185,325 @@ def test_get_path_suffix():
     assert get_path_suffix(Path("/some/path/to/file.csv")) == ".csv"
     assert get_path_suffix(Path("/some/path/to/file")) == ""
     assert get_path_suffix("not/a/path/object.txt") == ".txt"
+
+
+def test_iter_lines_from_file(temp_txt_file):
+    temp_txt_file.write_text("alpha\r\nbravo\n\ncharlie")
+    assert list(iter_lines_from_file(temp_txt_file)) == [
+        (1, "alpha"),
+        (2, "bravo"),
+        (3, ""),
+        (4, "charlie"),
+    ]
+
+
+def test_iter_csv_column(temp_picks_csv_file):
+    by_name = list(iter_csv_column(filepath=temp_picks_csv_file, column_name="name"))
+    by_index = list(iter_csv_column(filepath=temp_picks_csv_file, column_index=1))
+    assert by_name == by_index == [(2, "Bengals"), (3, "Bills"), (4, "Chiefs")]
+
+
+def test_iter_csv_column_index_zero(temp_picks_csv_file):
+    values = [
+        value
+        for _, value in iter_csv_column(filepath=temp_picks_csv_file, column_index=0)
+    ]
+    assert values == ["1", "2", "3"]
+
+
+def test_iter_csv_column_invalid_name_raises_error(temp_picks_csv_file):
+    with pytest.raises(ValueError, match="not found in file header"):
+        list(iter_csv_column(filepath=temp_picks_csv_file, column_name="doesnotexist"))
+
+
+def test_iter_entries_from_file_invalid_suffix_raises_error(temp_py_file):
+    with pytest.raises(
+        ValueError, match="Picks file must be a .csv, .json, .jsonl or .txt file"
+    ):
+        iter_entries_from_file(temp_py_file, label="Picks")
+
+
+def test_append_result_to_csv(tmp_path: Path):
+    file = tmp_path / "test_result.csv"
+    write_result_to_csv(result={"Harold": "Chiefs"}, path=file)
+    append_result_to_csv(result={"Jim": "Bengals", "Margaret": "Bills"}, path=file)
+    assert (
+        file.read_text() == "entrant,pick\nHarold,Chiefs\nJim,Bengals\nMargaret,Bills\n"
+    )
+
+
+def test_append_result_to_csv_new_file(tmp_path: Path):
+    file = tmp_path / "test_result.csv"
+    append_result_to_csv(result={"Harold": "Chiefs"}, path=file)
+    assert file.read_text() == "entrant,pick\nHarold,Chiefs\n"
+
+
+@pytest.mark.parametrize("existing", [{}, {"Harold": "Chiefs", "Jim": "Bengals"}])
+def test_append_result_to_json(tmp_path: Path, existing: dict):
+    file = tmp_path / "test_result.json"
+    write_result_to_json(result=existing, path=file)
+    append_result_to_json(result={"Margaret": "Bills", "Zoë": "Jets"}, path=file)
+    with open(file, "r") as in_file:
+        file_data = json.load(in_file)
+    assert file_data == {**existing, "Margaret": "Bills", "Zoë": "Jets"}
+    assert list(file_data)[-1] == "Zoë"
+
+
+def test_load_result_from_file(tmp_path: Path):
+    result = {"Harold": "Chiefs", "Jim": "Bengals"}
+    for suffix, writer in [
+        (".csv", write_result_to_csv),
+        (".json", write_result_to_json),
+    ]:
+        file = tmp_path / f"test_result{suffix}"
+        writer(result=result, path=file)
+        assert load_result_from_file(file) == result
+    assert load_result_from_file(tmp_path / "missing.csv") == {}
+
+
+def test_load_taken_from_file(tmp_path: Path, temp_txt_file):
+    file = tmp_path / "test_result.csv"
+    write_result_to_csv(result={"Harold": "Chiefs", "Jim": "Bengals"}, path=file)
+    assert load_taken_from_file(file) == ({"Harold", "Jim"}, {"Chiefs", "Bengals"})
+    assert load_taken_from_file(tmp_path / "missing.csv") == (set(), set())
+    with pytest.raises(ValueError):
+        load_taken_from_file(temp_txt_file)
+
+
+def test_load_result_from_file_invalid_suffix_raises_error(temp_txt_file):
+    with pytest.raises(ValueError, match="Results file must be a .csv or .json file"):
+        load_result_from_file(temp_txt_file)
+
+
+@pytest.mark.parametrize("suffix", [".gz", ".bz2", ".xz"])
+def test_compressed_input_and_output(tmp_path: Path, suffix: str):
+    entrants_file = tmp_path / f"entrants.csv{suffix}"
+    with open_text(entrants_file, "w") as out_file:
+        out_file.write("id,name\n1,Harold\n2,Jim\n")
+    assert list(iter_entries_from_file(entrants_file, "name")) == [
+        (2, "Harold"),
+        (3, "Jim"),
+    ]
+
+    result = {"Harold": "Chiefs", "Jim": "Bengals"}
+    results_file = tmp_path / f"results.csv{suffix}"
+    write_result_to_csv(result=result, path=results_file)
+    assert not results_file.read_bytes().startswith(b"entrant")
+    assert load_result_from_file(results_file) == result
+
+
+def test_iter_entries_from_stdin(monkeypatch):
+    monkeypatch.setattr("sys.stdin", io.StringIO("id,name\n1,Harold\n2,Jim\n"))
+    assert list(iter_entries_from_file("-", "name")) == [(2, "Harold"), (3, "Jim")]
+
+    monkeypatch.setattr("sys.stdin", io.StringIO("Harold\nJim\n"))
+    assert list(iter_entries_from_file("-")) == [(1, "Harold"), (2, "Jim")]
+
+
+STAFF = {
+    "exported": "2025-07-30",
+    "meta": {"note": 'brackets ] } and escaped \\" quotes', "sizes": [1, [2, {}]]},
+    "staff": [
+        {"id": 1, "name": "Harold", "team": {"name": "Red"}},
+        {"id": 2, "name": "Jim", "team": {"name": "Blue"}},
+        {"id": 3, "name": None},
+        {"id": 4, "name": "Märgaret"},
+    ],
+}
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 64 * 1024])
+def test_iter_json_entries(tmp_path: Path, monkeypatch, chunk_size: int):
+    monkeypatch.setattr(sweeper.io, "JSON_CHUNK_SIZE", chunk_size)
+    path = tmp_path / "staff.json"
+    path.write_text(json.dumps(STAFF, indent=2))
+    assert list(iter_json_entries(path, "$.staff[*].name")) == [
+        (14, "Harold"),
+        (21, "Jim"),
+        (28, ""),
+        (32, "Märgaret"),
+    ]
+    assert [value for _, value in iter_json_entries(path, "staff[*].id")] == [
+        "1",
+        "2",
+        "3",
+        "4",
+    ]
+
+    path.write_text('[\n  "Harold",\n  "Jim", 42,\n\n  "Margaret"\n]')
+    assert list(iter_json_entries(path)) == [
+        (2, "Harold"),
+        (3, "Jim"),
+        (3, "42"),
+        (5, "Margaret"),
+    ]
+    path.write_text('[["a", "Harold"], ["b", "Jim"]]')
+    assert list(iter_json_entries(path, "1")) == [(1, "Harold"), (1, "Jim")]
+    path.write_text("[ ]")
+    assert list(iter_json_entries(path)) == []
+
+
+@pytest.mark.parametrize(
+    "text, column, message",
+    [
+        ('{"staff": []}', "people[*]", "Key 'people' not found"),
+        ('{"staff": {}}', "staff[*]", "'staff' in .* is not an array"),
+        ('{"staff": []}', None, "Top-level value in .* is not an array"),
+        ('["Harold",\n"Jim"', None, "Invalid JSON in .* on line 2"),
+        ('[{"name": "Harold"}]', None, "not a string or number"),
+        ('[{"name": "Harold"}, {}]', "name", "Path 'name' not found on line 1"),
+    ],
+)
+def test_iter_json_entries_errors(
+    tmp_path: Path, text: str, column: str | None, message: str
+):
+    path = tmp_path / "staff.json"
+    path.write_text(text)
+    with pytest.raises(ValueError, match=message):
+        list(iter_json_entries(path, column))
+
+
+def test_iter_json_lines_entries(tmp_path: Path):
+    path = tmp_path / "staff.jsonl.gz"
+    with open_text(path, "w") as out_file:
+        out_file.write('{"name": "Harold"}\n\n{"name": "Jim"}\n{"name": 7}\n')
+    assert list(iter_entries_from_file(path, "name")) == [
+        (1, "Harold"),
+        (3, "Jim"),
+        (4, "7"),
+    ]
+
+    path = tmp_path / "staff.jsonl"
+    path.write_text('"Harold"\n"Jim"\n{"name": "Margaret"\n')
+    with pytest.raises(ValueError, match="Invalid JSON in .* on line 3"):
+        list(iter_json_lines_entries(path))
+    with pytest.raises(ValueError, match="can't select an array"):
+        list(iter_json_lines_entries(path, "staff[*].name"))
+
+
+def test_get_path_suffix_ignores_compression():
+    assert get_path_suffix(Path("file.csv.gz")) == ".csv"
+    assert get_path_suffix("file.txt.xz") == ".txt"
+    assert get_path_suffix("file.gz") == ""
+    assert get_path_suffix("-") == ""
+
+
+def test_iter_csv_columns(temp_csv_file):
+    temp_csv_file.write_text(
+        "id,name,email\n1,Harold,h@example.com\n2,Jim,j@example.com\n"
+    )
+    header = []
+    rows = list(
+        iter_csv_columns(filepath=temp_csv_file, columns=["email", 0], header=header)
+    )
+    assert rows == [(2, ["h@example.com", "1"]), (3, ["j@example.com", "2"])]
+    assert header == ["id", "name", "email"]
+
+
+def test_write_result_with_metadata(tmp_path: Path):
+    result = {"Harold": "Chiefs", "Jim": "Bengals"}
+    metadata = ColumnTable(
+        ["Jim", "Harold"], {"email": StringColumn.from_strings(["j@x.com", "h@x.com"])}
+    )
+    csv_file = tmp_path / "test_result.csv"
+    write_result_to_csv(result=result, path=csv_file, metadata=metadata)
+    assert csv_file.read_text() == (
+        "entrant,pick,email\nHarold,Chiefs,h@x.com\nJim,Bengals,j@x.com\n"
+    )
+
+    json_file = tmp_path / "test_result.json"
+    write_result_to_json(result=result, path=json_file, metadata=metadata)
+    with open(json_file, "r") as in_file:
+        assert json.load(in_file) == {
+            "Harold": {"pick": "Chiefs", "email": "h@x.com"},
+            "Jim": {"pick": "Bengals", "email": "j@x.com"},
+        }
+
+
+class UpperFormat(EntriesFormat):
+    def iter_entries(self, path, column=None):
+        for line_number, line in enumerate(Path(path).read_text().splitlines(), 1):
+            yield line_number, line.upper()
+
+
+@pytest.fixture
+def formats(monkeypatch):
+    """
+    Let a test register formats without changing those of other tests.
+    """
+    monkeypatch.setattr(sweeper.io, "FORMATS", dict(sweeper.io.FORMATS))
+    sweeper.io.load_format.cache_clear()
+    sweeper.io.load_format_entry_points.cache_clear()
+    yield sweeper.io.FORMATS
+    sweeper.io.load_format.cache_clear()
+    sweeper.io.load_format_entry_points.cache_clear()
+
+
+def test_get_format_for_suffix_and_uri():
+    assert isinstance(get_format("entrants.txt"), TextFormat)
+    assert get_format("entrants.txt") is get_format("picks.txt.gz")
+    assert get_format("sqlite:///draws.db?table=results").writes_results
+    assert get_format("script.py") is None
+
+
+def test_register_format_class(formats, tmp_path: Path):
+    register_format(".upper", UpperFormat)
+    path = tmp_path / "entrants.upper"
+    path.write_text("alpha\nbravo")
+    assert list(iter_entries_from_file(path)) == [(1, "ALPHA"), (2, "BRAVO")]
+    assert describe_formats("reads_entries") == ".csv, .json, .jsonl, .txt or .upper"
+
+
+def test_formats_must_implement_their_capabilities():
+    class NoEntriesFormat(EntriesFormat):
+        pass
+
+    class WriteOnlyFormat(ResultsFormat):
+        def write_result(self, result, path, metadata=None):
+            pass
+
+    for format_class in [NoEntriesFormat, WriteOnlyFormat]:
+        with pytest.raises(TypeError, match="abstract"):
+            format_class()
+    assert UpperFormat.reads_entries and not UpperFormat.appends_results
+
+
+def test_register_format_string_is_imported_lazily(
+    formats, tmp_path: Path, monkeypatch
+):
+    (tmp_path / "lazy_format.py").write_text(
+        "from sweeper.io import TextFormat\n\nclass LazyFormat(TextFormat):\n    pass\n"
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+    register_format(".lazy", "lazy_format:LazyFormat")
+    assert "lazy_format" not in sys.modules
+    try:
+        assert type(get_format("entrants.lazy")).__name__ == "LazyFormat"
+        assert "lazy_format" in sys.modules
+    finally:
+        sys.modules.pop("lazy_format", None)
+
+
+def test_format_entry_points(formats, mocker, tmp_path: Path):
+    entry_point = mocker.Mock(value="sweeper_upper:UpperFormat")
+    entry_point.name = ".upper"
+    entry_point.load.return_value = UpperFormat
+    entry_points = mocker.patch(
+        "importlib.metadata.entry_points", return_value=[entry_point]
+    )
+
+    assert isinstance(get_format("entrants.upper"), UpperFormat)
+    entry_points.assert_called_once_with(group="sweeper.formats")
+    entry_point.load.assert_called_once()
+    # Read once, then cached
+    assert get_format("entrants.unknown") is None
+    entry_points.assert_called_once()
+
+
+def test_entry_points_do_not_replace_built_in_formats(formats, mocker):
+    entry_point = mocker.Mock(value="sweeper_upper:UpperFormat")
+    entry_point.name = ".txt"
+    mocker.patch("importlib.metadata.entry_points", return_value=[entry_point])
+    get_format("entrants.unknown")
+    assert isinstance(get_format("entrants.txt"), TextFormat)
+    entry_point.load.assert_not_called()
@@ -0,0 +1,148 @@
+import json
+import random
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from sweeper.draw import draw, draw_command
+from sweeper.journal import DrawJournal
+
+
+ENTRANTS = ["Harold", "Jim", "Margaret", "John", "Tony", "Gordon"]
+PICKS = ["Bengals", "Bills", "Chiefs", "Dolphins", "Eagles", "Falcons"]
+
+
+def read_records(path: Path) -> list[dict]:
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+def test_draw_writes_journal(tmp_path: Path):
+    path = tmp_path / "draw.journal"
+    result = draw(
+        entrants=ENTRANTS, picks=PICKS, delay=0, quiet=True, journal=DrawJournal(path)
+    )
+
+    records = read_records(path)
+    assert records[0]["type"] == "header"
+    assert records[0]["entrants"] == ENTRANTS
+    assert records[-1] == {"type": "complete"}
+    rounds = [(r["entrant"], r["pick"]) for r in records if r["type"] == "round"]
+    assert rounds == list(result.items())
+
+
+def test_draw_resumes_from_last_checkpoint(mocker, tmp_path: Path):
+    path = tmp_path / "draw.journal"
+    expected = draw(
+        entrants=ENTRANTS, picks=PICKS, delay=0, quiet=True, rng=random.Random(1)
+    )
+
+    # Crash while presenting the fourth round
+    mock_present = mocker.patch("sweeper.draw.present_round")
+    mock_present.side_effect = [None, None, None, KeyboardInterrupt]
+    with pytest.raises(KeyboardInterrupt):
+        draw(
+            entrants=ENTRANTS,
+            picks=PICKS,
+            delay=0,
+            rng=random.Random(1),
+            journal=DrawJournal(path, sync_every=1),
+        )
+
+    journal = DrawJournal.load(path)
+    assert len(journal.assignments) == 3
+    assert not journal.complete
+
+    mock_present.reset_mock(side_effect=True)
+    result = draw(
+        entrants=ENTRANTS,
+        picks=PICKS,
+        delay=0,
+        rng=random.Random(),
+        journal=journal,
+    )
+    assert result == expected
+    assert list(result) == ENTRANTS
+    # Only the rounds after the last checkpoint are presented
+    assert [call.args[0] for call in mock_present.call_args_list] == [3, 4, 5]
+    assert read_records(path)[-1] == {"type": "complete"}
+
+
+def test_draw_resumes_journal_without_draw_algorithm(mocker, tmp_path: Path):
+    # Journals written before draw algorithms were recorded resume with algorithm 1
+    path = tmp_path / "draw.journal"
+    mocker.patch("sweeper.draw.DRAW_ALGORITHM", 1)
+    expected = draw(
+        entrants=ENTRANTS, picks=PICKS, delay=0, quiet=True, rng=random.Random(1)
+    )
+    mock_present = mocker.patch("sweeper.draw.present_round")
+    mock_present.side_effect = [None, None, KeyboardInterrupt]
+    with pytest.raises(KeyboardInterrupt):
+        draw(
+            entrants=ENTRANTS,
+            picks=PICKS,
+            delay=0,
+            rng=random.Random(1),
+            journal=DrawJournal(path, sync_every=1),
+        )
+    records = read_records(path)
+    del records[0]["draw_algorithm"]
+    path.write_text("".join(json.dumps(record) + "\n" for record in records))
+    mocker.stopall()
+
+    journal = DrawJournal.load(path)
+    assert journal.draw_algorithm == 1
+    result = draw(entrants=ENTRANTS, picks=PICKS, delay=0, quiet=True, journal=journal)
+    assert result == expected
+
+
+def test_journal_load_discards_uncommitted_rounds(tmp_path: Path):
+    path = tmp_path / "draw.journal"
+    draw(
+        entrants=ENTRANTS,
+        picks=PICKS,
+        delay=0,
+        quiet=True,
+        journal=DrawJournal(path, sync_every=2, sync_interval=3600),
+    )
+    # Simulate a crash after round 5 was written but before it was committed
+    lines = path.read_text().splitlines()
+    round_lines = [i for i, line in enumerate(lines) if '"type": "round"' in line]
+    path.write_text("\n".join(lines[: round_lines[4] + 1]) + "\n" + '{"type": "rou')
+
+    journal = DrawJournal.load(path)
+    assert len(journal.assignments) == 4
+    assert read_records(path)[-1]["type"] == "checkpoint"
+
+
+def test_draw_command_resume(
+    tmp_path: Path, temp_entrants_txt_file, temp_picks_txt_file
+):
+    path = tmp_path / "draw.journal"
+    runner = CliRunner()
+    result = runner.invoke(
+        draw_command,
+        [
+            "--entrants",
+            temp_entrants_txt_file,
+            "--picks",
+            temp_picks_txt_file,
+            "--delay",
+            0,
+            "--journal",
+            path,
+        ],
+    )
+    assert result.exit_code == 0
+
+    result = runner.invoke(draw_command, ["--resume", path, "--delay", 0])
+    assert result.exit_code == 0
+    assert "Draw complete" in result.output
+    assert "Harold" in result.output
+
+
+def test_draw_command_requires_inputs_without_resume():
+    runner = CliRunner()
+    result = runner.invoke(draw_command, ["--delay", 0])
+    assert result.exit_code != 0
+    assert "--entrants and --picks are required" in result.output
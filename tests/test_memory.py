@@ -0,0 +1,130 @@
+from pathlib import Path
+
+from click.testing import CliRunner
+
+from sweeper.draw import draw_command
+from sweeper.memory import (
+    INPUT_MEMORY_FACTOR,
+    MemoryBudget,
+    estimate_draw_memory,
+    estimate_result_memory,
+    format_size,
+    get_current_memory,
+    get_peak_memory,
+)
+
+
+def test_get_peak_memory():
+    peak = get_peak_memory()
+    assert peak is None or peak > 0
+
+
+def test_get_current_memory():
+    current = get_current_memory()
+    assert current is None or current > 0
+
+
+def test_format_size():
+    assert format_size(None) == "unknown"
+    assert format_size(512) == "512 B"
+    assert format_size(512 * 1024**2) == "512.0 MiB"
+    assert format_size(3 * 1024**3) == "3.0 GiB"
+
+
+def test_estimate_result_memory():
+    assert estimate_result_memory(0, 1) == 0
+    assert 0 < estimate_result_memory(10, 20) < estimate_result_memory(1000, 1000)
+
+
+def test_estimate_draw_memory(tmp_path: Path):
+    entrants = tmp_path / "entrants.txt"
+    entrants.write_text("a\nb\n")
+    picks = tmp_path / "picks.txt.gz"
+    picks.write_bytes(b"0123")
+    assert estimate_draw_memory([entrants]) == 4 * INPUT_MEMORY_FACTOR
+    # Compressed inputs are scaled up to their rough decompressed size
+    assert estimate_draw_memory([entrants, picks]) > 8 * INPUT_MEMORY_FACTOR
+    # The size of a table or stdin isn't known up front
+    assert estimate_draw_memory([entrants, "sqlite:///roster.db?table=staff"]) is None
+    assert estimate_draw_memory(["-", picks]) is None
+
+
+def test_memory_budget():
+    assert not MemoryBudget().exceeds(10**15)
+    assert MemoryBudget(max_memory=1).exceeds(0)
+    assert not MemoryBudget(max_memory=10**15).exceeds(0)
+
+
+def test_memory_budget_records_phases():
+    budget = MemoryBudget()
+    budget.record("loading")
+    assert list(budget.phases) == ["loading"]
+
+
+def test_draw_command_over_memory_budget_draws_out_of_core(
+    temp_entrants_txt_file: Path, temp_picks_txt_file: Path
+):
+    result = CliRunner().invoke(
+        draw_command,
+        [
+            "--entrants",
+            temp_entrants_txt_file,
+            "--picks",
+            temp_picks_txt_file,
+            "--quiet",
+            "--max-memory",
+            "1K",
+        ],
+    )
+    assert result.exit_code == 0, result.output
+    assert "drawing out of core" in result.output
+    # No results table is built; results are streamed as CSV instead
+    assert "+----" not in result.output
+    assert "entrant,pick" in result.output
+    assert "results out of core" in result.output
+    assert "Peak memory:" in result.output
+
+
+def test_draw_command_over_memory_budget_in_memory_streams_results(
+    temp_entrants_txt_file: Path, temp_picks_txt_file: Path, tmp_path: Path
+):
+    # A journal needs the inputs in memory, so the draw can't go out of core
+    result = CliRunner().invoke(
+        draw_command,
+        [
+            "--entrants",
+            temp_entrants_txt_file,
+            "--picks",
+            temp_picks_txt_file,
+            "--quiet",
+            "--journal",
+            tmp_path / "draw.journal",
+            "--max-memory",
+            "1K",
+        ],
+    )
+    assert result.exit_code == 0, result.output
+    assert "out of core" not in result.output
+    assert "+----" not in result.output
+    assert "entrant,pick" in result.output
+    assert "Peak memory:" in result.output
+
+
+def test_draw_command_within_memory_budget_prints_table(
+    temp_entrants_txt_file: Path, temp_picks_txt_file: Path
+):
+    result = CliRunner().invoke(
+        draw_command,
+        [
+            "--entrants",
+            temp_entrants_txt_file,
+            "--picks",
+            temp_picks_txt_file,
+            "--quiet",
+            "--max-memory",
+            "1T",
+        ],
+    )
+    assert result.exit_code == 0, result.output
+    assert "+----" in result.output
+    assert "Peak memory:" in result.output
@@ -0,0 +1,112 @@
+import csv
+from pathlib import Path
+
+import pytest
+
+import sweeper.parallel
+from sweeper.column import StringColumn
+from sweeper.io import iter_csv_column
+from sweeper.parallel import (
+    can_parse_in_parallel,
+    get_process_context,
+    find_record_ranges,
+    load_csv_column_parallel,
+)
+from sweeper.validate import load_validated_entries, normalise_entries
+
+
+@pytest.fixture
+def quoted_csv_file(tmp_path: Path) -> Path:
+    path = tmp_path / "entrants.csv"
+    with open(path, "w", newline="") as csv_file:
+        writer = csv.writer(csv_file)
+        writer.writerow(["id", "name", "note"])
+        for index in range(500):
+            # Quoted fields with newlines and escaped quotes, blanks and padding
+            note = f'said "hi"\nover\ntwo lines {index}' if index % 3 == 0 else "x"
+            name = "" if index % 17 == 0 else f" name{index} "
+            writer.writerow([index, name, note])
+    return path
+
+
+def test_load_csv_column_parallel_matches_serial(quoted_csv_file: Path):
+    expected = list(
+        normalise_entries(iter_csv_column(filepath=quoted_csv_file, column_name="name"))
+    )
+    for column in ["name", "1"]:
+        values, line_numbers = load_csv_column_parallel(
+            quoted_csv_file, column, workers=2, chunk_size=256
+        )
+        assert list(zip(line_numbers, values)) == expected
+
+    notes, _ = load_csv_column_parallel(
+        quoted_csv_file, "note", workers=2, chunk_size=256
+    )
+    assert notes[0] == 'said "hi"\nover\ntwo lines 0'
+
+
+def test_record_ranges_are_aligned(quoted_csv_file: Path):
+    with open(quoted_csv_file, "rb") as in_file:
+        header_end = len(in_file.readline())
+
+    class SerialPool:
+        map = staticmethod(map)
+
+    ranges = find_record_ranges(quoted_csv_file, header_end, 1, 100, SerialPool())
+    assert len(ranges) > 10
+    data = quoted_csv_file.read_bytes()
+    rows = 0
+    for start, end, _ in ranges:
+        text = data[start:end].decode()
+        rows += len(list(csv.reader(text.splitlines(keepends=True))))
+    assert ranges[-1][1] == len(data)
+    assert rows == 500
+
+
+def test_record_longer_than_chunk(tmp_path: Path):
+    path = tmp_path / "entrants.csv"
+    long_value = "a\n" * 1000
+    path.write_text(f'name\n"{long_value}"\nbravo\ncharlie\n')
+    values, line_numbers = load_csv_column_parallel(
+        path, "name", workers=2, chunk_size=64
+    )
+    assert list(values) == [long_value.strip(), "bravo", "charlie"]
+    assert list(line_numbers) == [1002, 1003, 1004]
+
+
+def test_load_csv_column_parallel_errors(tmp_path: Path):
+    path = tmp_path / "entrants.csv"
+    path.write_text("name,team\nHarold,Red\nJim\n")
+    with pytest.raises(ValueError, match="Column 'email' not found"):
+        load_csv_column_parallel(path, "email", workers=2)
+    with pytest.raises(IndexError, match="out of range on line 3"):
+        load_csv_column_parallel(path, "team", workers=2)
+
+
+def test_can_parse_in_parallel(tmp_path: Path, quoted_csv_file: Path):
+    assert can_parse_in_parallel(quoted_csv_file, workers=2, threshold=0)
+    assert not can_parse_in_parallel(quoted_csv_file, workers=1, threshold=0)
+    assert not can_parse_in_parallel(quoted_csv_file, workers=2)
+    compressed = tmp_path / "entrants.csv.gz"
+    compressed.write_bytes(b"")
+    assert not can_parse_in_parallel(compressed, workers=2, threshold=0)
+
+
+def test_get_process_context_does_not_fork():
+    # Loads run on threads, and forking a threaded process can deadlock the child
+    assert get_process_context().get_start_method() in ["forkserver", "spawn"]
+
+
+def test_load_validated_entries_in_parallel(quoted_csv_file: Path, mocker):
+    mocker.patch("sweeper.parallel.can_parse_in_parallel", return_value=True)
+    load = mocker.spy(sweeper.parallel, "load_csv_column_parallel")
+    entries = load_validated_entries(quoted_csv_file, "name", "Entrants", workers=2)
+    load.assert_called_once()
+    # The merged column is returned as it is, not copied to a list
+    assert isinstance(entries, StringColumn)
+    assert entries[:2] == ["name1", "name2"]
+
+    duplicate = quoted_csv_file.with_name("duplicate.csv")
+    duplicate.write_text("name\nHarold\nJim\nHarold\n")
+    with pytest.raises(ValueError, match="'Harold' on lines 2, 4"):
+        load_validated_entries(duplicate, "name", "Entrants", workers=2)
@@ -0,0 +1,89 @@
+import io
+from pathlib import Path
+
+from click.testing import CliRunner
+
+from sweeper.draw import draw, draw_command
+from sweeper.presentation import (
+    CURSOR_UP,
+    ProgressPresenter,
+    format_assignment,
+    format_duration,
+)
+
+
+class FakeTerminal(io.StringIO):
+    def isatty(self) -> bool:
+        return True
+
+
+def test_format_duration():
+    assert format_duration(None) == "--:--:--"
+    assert format_duration(3725.5) == "1:02:05"
+
+
+def test_format_assignment():
+    assert format_assignment("Jim", "Bills", "entrants") == "Jim ... draws ... Bills"
+    assert format_assignment("Jim", "Bills", "picks") == "Bills ... drawn by ... Jim"
+
+
+def test_progress_presenter_is_rate_limited():
+    stream = io.StringIO()
+    presenter = ProgressPresenter(total=1000, interval=3600, stream=stream)
+    for index in range(1000):
+        presenter.update(index, f"entrant {index}", f"pick {index}")
+    presenter.close()
+
+    lines = stream.getvalue().splitlines()
+    # First round and the final redraw only
+    assert len(lines) == 2
+    assert "1/1000 rounds" in lines[0]
+    assert "100.0% 1000/1000 rounds" in lines[1]
+
+
+def test_progress_presenter_redraws_in_place_on_terminal():
+    stream = FakeTerminal()
+    presenter = ProgressPresenter(total=3, window=2, interval=0, stream=stream)
+    for index, (entrant, pick) in enumerate([("a", "1"), ("b", "2"), ("c", "3")]):
+        presenter.update(index, entrant, pick)
+
+    output = stream.getvalue()
+    assert CURSOR_UP.format(3) in output
+    last_frame = output.split(CURSOR_UP.format(3))[-1]
+    assert "c ... draws ... 3" in last_frame
+    assert "b ... draws ... 2" in last_frame
+    assert "a ... draws ... 1" not in last_frame
+
+
+def test_draw_with_presenter_skips_round_reveals(capsys):
+    presenter = ProgressPresenter(total=3, interval=0)
+    draw(
+        ["Harold", "Jim", "Margaret"],
+        ["Bengals", "Bills", "Chiefs"],
+        delay=0,
+        presenter=presenter,
+    )
+    output = capsys.readouterr().out
+    assert "Drawing..." not in output
+    assert "3/3 rounds" in output
+
+
+def test_draw_command_progress_presentation(
+    temp_entrants_txt_file: Path, temp_picks_txt_file: Path
+):
+    result = CliRunner().invoke(
+        draw_command,
+        [
+            "--entrants",
+            temp_entrants_txt_file,
+            "--picks",
+            temp_picks_txt_file,
+            "--delay",
+            "0",
+            "--presentation",
+            "progress",
+        ],
+    )
+    assert result.exit_code == 0, result.output
+    assert "3/3 rounds" in result.output
+    assert "Drawing..." not in result.output
@@ -0,0 +1,77 @@
+import json
+from array import array
+from pathlib import Path
+
+import pytest
+
+from sweeper.io import load_result_from_csv, write_result_to_csv, write_result_to_json
+from sweeper.result import DrawResult, get_rounds
+from sweeper.sweepstake import Sweepstake
+
+
+ENTRANTS = ["Harold", "Jim", "Margaret"]
+PICKS = ["Bengals", "Bills", "Chiefs", "Dolphins"]
+
+
+@pytest.fixture
+def result() -> DrawResult:
+    # Jim draws Dolphins, then Harold draws Bengals; Margaret has not drawn yet
+    return DrawResult(ENTRANTS, PICKS, array("L", [1, 0]), array("L", [3, 0]))
+
+
+def test_get_rounds():
+    assert list(get_rounds(array("L", [2, 0]), 4)) == [1, -1, 0, -1]
+
+
+def test_draw_result_iterates_in_draw_order(result: DrawResult):
+    assert list(result) == [("Jim", "Dolphins"), ("Harold", "Bengals")]
+    assert len(result) == 2
+
+
+def test_draw_result_bidirectional_lookup(result: DrawResult):
+    assert result.pick_for("Jim") == "Dolphins"
+    assert result.entrant_for("Bengals") == "Harold"
+    with pytest.raises(KeyError):
+        result.pick_for("Margaret")
+    with pytest.raises(KeyError):
+        result.entrant_for("Chiefs")
+    with pytest.raises(KeyError):
+        result.pick_for("Nobody")
+
+
+def test_draw_result_mapping_views(result: DrawResult):
+    mapping = result.as_mapping()
+    assert mapping == {"Jim": "Dolphins", "Harold": "Bengals"}
+    assert list(mapping) == ["Jim", "Harold"]
+    assert mapping["Harold"] == "Bengals"
+    assert "Margaret" not in mapping
+    assert mapping.get("Margaret") is None
+    assert list(result.by_pick().items()) == [
+        ("Dolphins", "Jim"),
+        ("Bengals", "Harold"),
+    ]
+
+
+def test_draw_result_from_pairs(result: DrawResult):
+    rebuilt = DrawResult.from_pairs(ENTRANTS, PICKS, result.to_dict().items())
+    assert rebuilt == result
+    assert rebuilt.entrant_for("Dolphins") == "Jim"
+
+
+def test_draw_result_writes_with_io_writers(result: DrawResult, tmp_path: Path):
+    csv_path = tmp_path / "results.csv"
+    json_path = tmp_path / "results.json"
+    write_result_to_csv(result.as_mapping(), csv_path)
+    write_result_to_json(result.as_mapping(), json_path)
+    assert load_result_from_csv(csv_path) == result.to_dict()
+    assert json.loads(json_path.read_text()) == result.to_dict()
+
+
+def test_sweepstake_results_share_lookup_tables():
+    sweepstake = Sweepstake(ENTRANTS, PICKS)
+    first, second = sweepstake.draw_many(2, seed=1)
+    for draw_result in [first, second]:
+        for entrant, pick in draw_result:
+            assert draw_result.pick_for(entrant) == pick
+            assert draw_result.entrant_for(pick) == entrant
+    assert first._entrant_positions is second._entrant_positions
@@ -0,0 +1,109 @@
+import json
+import random
+from collections import Counter
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from sweeper.commitment import get_commitment_path
+from sweeper.draw import draw_command
+from sweeper.journal import DrawJournal
+from sweeper.rng import BufferedSecureRandom, get_rng
+from sweeper.sweepstake import Sweepstake
+
+
+def test_buffered_secure_random_reads_os_urandom_in_blocks(mocker):
+    urandom = mocker.patch("sweeper.rng.os.urandom", side_effect=lambda n: bytes(n))
+    rng = BufferedSecureRandom(block_size=1024)
+    for _ in range(100):
+        rng.getrandbits(32)
+    urandom.assert_called_once_with(1024)
+
+
+def test_buffered_secure_random_getrandbits_range():
+    rng = BufferedSecureRandom(block_size=16)
+    for k in [1, 7, 8, 9, 53, 200]:
+        assert all(0 <= rng.getrandbits(k) < 2**k for _ in range(200))
+    assert rng.getrandbits(0) == 0
+    assert len(rng.randbytes(100)) == 100
+    assert 0 <= rng.random() < 1
+
+
+def test_buffered_secure_random_bounded_integers_are_unbiased():
+    rng = BufferedSecureRandom()
+    # 3 doesn't divide a power of two, so taking random bits modulo 3 would be
+    # biased towards 0
+    counts = Counter(rng.randint(0, 2) for _ in range(30_000))
+    assert set(counts) == {0, 1, 2}
+    assert all(9_400 < count < 10_600 for count in counts.values())
+
+
+def test_buffered_secure_random_has_no_state():
+    rng = BufferedSecureRandom()
+    with pytest.raises(NotImplementedError):
+        rng.getstate()
+
+
+def test_get_rng():
+    assert get_rng("default", 1).random() == random.Random(1).random()
+    assert isinstance(get_rng("secure"), BufferedSecureRandom)
+    with pytest.raises(ValueError, match="can't be seeded"):
+        get_rng("secure", 1)
+    with pytest.raises(ValueError, match="rng must be one of"):
+        get_rng("mersenne")
+
+
+def test_sweepstake_draw_with_secure_rng():
+    sweepstake = Sweepstake(["Harold", "Jim"], ["Bengals", "Bills", "Chiefs"])
+    result = sweepstake.draw(rng=BufferedSecureRandom())
+    assert result.seed is None
+    assert len(set(result.to_dict().values())) == 2
+
+
+def test_draw_command_secure_rng(
+    tmp_path: Path, temp_entrants_txt_file: Path, temp_picks_txt_file: Path
+):
+    output = tmp_path / "results.csv"
+    journal = tmp_path / "draw.journal"
+    runner = CliRunner()
+    result = runner.invoke(
+        draw_command,
+        [
+            "--entrants",
+            temp_entrants_txt_file,
+            "--picks",
+            temp_picks_txt_file,
+            "--rng",
+            "secure",
+            "--quiet",
+            "--output-file",
+            output,
+            "--journal",
+            journal,
+        ],
+    )
+    assert result.exit_code == 0, result.output
+    assert json.loads(get_commitment_path(output).read_text())["seed"] is None
+    assert DrawJournal.load(journal).rng_name == "secure"
+
+
+def test_draw_command_secure_rng_cannot_be_seeded(
+    temp_entrants_txt_file: Path, temp_picks_txt_file: Path
+):
+    runner = CliRunner()
+    result = runner.invoke(
+        draw_command,
+        [
+            "--entrants",
+            temp_entrants_txt_file,
+            "--picks",
+            temp_picks_txt_file,
+            "--rng",
+            "secure",
+            "--seed",
+            "1",
+        ],
+    )
+    assert result.exit_code != 0
+    assert "--seed cannot be used with --rng secure" in result.output
@@ -0,0 +1,134 @@
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from sweeper.commitment import build_commitment, get_commitment_path, load_commitment
+from sweeper.io import load_result_from_csv
+from sweeper.main import sweeper
+from sweeper.sealed import SealedDraw, write_sealed
+
+
+RESULT = {
+    "Harold": "Bengals",
+    "Jim": "Bills",
+    "Märgaret\nThatcher": "Chiefs",
+}
+
+
+@pytest.fixture
+def sealed_file(tmp_path: Path) -> Path:
+    path = tmp_path / "draw.sealed"
+    commitment = build_commitment(
+        entrants=list(RESULT),
+        picks=list(RESULT.values()) + ["Dolphins"],
+        draw_order="entrants",
+        seed=42,
+        result=RESULT,
+    )
+    write_sealed(path, RESULT, "entrants", commitment, undrawn=1)
+    return path
+
+
+def test_sealed_draw_reads_rounds_lazily(sealed_file: Path):
+    with SealedDraw(sealed_file) as sealed:
+        sealed.verify()
+        assert len(sealed) == 3
+        assert sealed.draw_order == "entrants"
+        assert sealed.undrawn == 1
+        assert sealed[2] == ("Märgaret\nThatcher", "Chiefs")
+        assert sealed[-3] == ("Harold", "Bengals")
+        assert list(sealed.iter_rounds(1)) == [
+            (1, "Jim", "Bills"),
+            (2, "Märgaret\nThatcher", "Chiefs"),
+        ]
+        assert list(sealed.iter_rounds(1, 2)) == [(1, "Jim", "Bills")]
+        assert list(sealed.iter_rounds(5)) == []
+        with pytest.raises(IndexError):
+            sealed[3]
+
+
+def test_sealed_draw_detects_tampering(sealed_file: Path):
+    data = bytearray(sealed_file.read_bytes())
+    data[-1:] = b"X"
+    sealed_file.write_bytes(bytes(data))
+    with SealedDraw(sealed_file) as sealed:
+        with pytest.raises(ValueError, match="does not match its draw commitment"):
+            sealed.verify()
+
+
+def test_sealed_draw_rejects_other_files(tmp_path: Path):
+    path = tmp_path / "results.csv"
+    path.write_text("entrant,pick\nHarold,Bengals\n")
+    with pytest.raises(ValueError, match="not a supported sealed draw file"):
+        SealedDraw(path)
+
+
+def test_draw_sealed_then_reveal(
+    temp_entrants_txt_file: Path, temp_picks_txt_file: Path, tmp_path: Path
+):
+    sealed_path = tmp_path / "draw.sealed"
+    output = tmp_path / "results.csv"
+    runner = CliRunner()
+    result = runner.invoke(
+        sweeper,
+        [
+            "--log-file",
+            str(tmp_path / "sweeper.log"),
+            "draw",
+            "--entrants",
+            str(temp_entrants_txt_file),
+            "--picks",
+            str(temp_picks_txt_file),
+            "--sealed",
+            str(sealed_path),
+            "--output-file",
+            str(output),
+        ],
+    )
+    assert result.exit_code == 0, result.output
+    # Nothing about the result is shown until it is revealed
+    assert "draws" not in result.output
+    assert f"Sealed 3 rounds in {sealed_path}" in result.output
+    results = load_result_from_csv(output)
+    with SealedDraw(sealed_path) as sealed:
+        assert sealed.commitment == load_commitment(get_commitment_path(output))
+        assert dict((entrant, pick) for _, entrant, pick in sealed.iter_rounds()) == (
+            results
+        )
+
+    result = runner.invoke(
+        sweeper,
+        [
+            "--log-file",
+            str(tmp_path / "sweeper.log"),
+            "reveal",
+            str(sealed_path),
+            "--delay",
+            "0",
+            "--start-round",
+            "2",
+        ],
+    )
+    assert result.exit_code == 0, result.output
+    entrants = list(results)
+    assert f"Entrant 1: {entrants[0]}" not in result.output
+    assert f"Entrant 2: {entrants[1]}" in result.output
+    assert f"{entrants[2]} ... draws ... {results[entrants[2]]}" in result.output
+    assert "Revealed rounds 2 to 3 of 3." in result.output
+
+
+def test_reveal_rejects_bad_rounds(sealed_file: Path, tmp_path: Path):
+    result = CliRunner().invoke(
+        sweeper,
+        [
+            "--log-file",
+            str(tmp_path / "sweeper.log"),
+            "reveal",
+            str(sealed_file),
+            "--start-round",
+            "4",
+        ],
+    )
+    assert result.exit_code != 0
+    assert "--start-round must be at most 3" in result.output
@@ -0,0 +1,146 @@
+import sqlite3
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from sweeper.column import ColumnTable
+from sweeper.draw import draw_command
+from sweeper.io import iter_entries_from_file, load_result_from_file
+from sweeper.sqlite import (
+    append_result_to_sqlite,
+    iter_result_from_sqlite,
+    iter_sqlite_column,
+    parse_sqlite_uri,
+    write_result_to_sqlite,
+)
+
+
+@pytest.fixture
+def roster_db(tmp_path: Path) -> Path:
+    path = tmp_path / "roster.db"
+    with sqlite3.connect(path) as connection:
+        connection.execute("CREATE TABLE staff (name TEXT, team TEXT)")
+        connection.executemany(
+            "INSERT INTO staff VALUES (?, ?)",
+            [("Harold", "Bengals"), ("Jim", "Bills"), ("Margaret", None)],
+        )
+    connection.close()
+    return path
+
+
+def test_parse_sqlite_uri():
+    assert parse_sqlite_uri("sqlite:///roster.db?table=staff&column=name") == (
+        Path("roster.db"),
+        {"table": "staff", "column": "name"},
+    )
+    assert parse_sqlite_uri("sqlite:////data/roster.db")[0] == Path("/data/roster.db")
+
+
+def test_parse_sqlite_uri_without_path_raises_error():
+    with pytest.raises(ValueError, match="has no database path"):
+        parse_sqlite_uri("sqlite:///?table=staff")
+
+
+def test_iter_sqlite_column(roster_db: Path):
+    uri = f"sqlite:///{roster_db}?table=staff&column=name"
+    assert list(iter_sqlite_column(uri, batch_size=2)) == [
+        (1, "Harold"),
+        (2, "Jim"),
+        (3, "Margaret"),
+    ]
+
+
+def test_iter_sqlite_column_null_values_are_empty(roster_db: Path):
+    uri = f"sqlite:///{roster_db}?table=staff"
+    values = [value for _, value in iter_sqlite_column(uri, column="team")]
+    assert values == ["Bengals", "Bills", ""]
+
+
+def test_iter_sqlite_column_requires_table_and_column(roster_db: Path):
+    with pytest.raises(ValueError, match="must name a table and column"):
+        list(iter_sqlite_column(f"sqlite:///{roster_db}?table=staff"))
+
+
+def test_iter_entries_from_file_dispatches_sqlite_uri(roster_db: Path):
+    uri = f"sqlite:///{roster_db}?table=staff&column=name"
+    assert [value for _, value in iter_entries_from_file(uri)] == [
+        "Harold",
+        "Jim",
+        "Margaret",
+    ]
+
+
+def test_write_append_and_load_sqlite_results(tmp_path: Path):
+    uri = f"sqlite:///{tmp_path / 'results.db'}?table=draw"
+    write_result_to_sqlite({"Harold": "Bills", "Jim": "Chiefs"}, uri)
+    # Writing again replaces the table
+    write_result_to_sqlite({"Jim": "Chiefs", "Harold": "Bills"}, uri)
+    append_result_to_sqlite({"Margaret": "Bengals"}, uri)
+
+    assert list(iter_result_from_sqlite(uri)) == [
+        ("Jim", "Chiefs"),
+        ("Harold", "Bills"),
+        ("Margaret", "Bengals"),
+    ]
+    assert load_result_from_file(uri) == {
+        "Jim": "Chiefs",
+        "Harold": "Bills",
+        "Margaret": "Bengals",
+    }
+    with sqlite3.connect(tmp_path / "results.db") as connection:
+        indexes = connection.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index'"
+        ).fetchall()
+    connection.close()
+    assert sorted(indexes) == [("draw_entrant_index",), ("draw_pick_index",)]
+
+
+def test_write_result_to_sqlite_with_metadata(tmp_path: Path):
+    uri = f"sqlite:///{tmp_path / 'results.db'}"
+    metadata = ColumnTable(["Harold"], {"email": ["harold@example.com"]})
+    write_result_to_sqlite({"Harold": "Bills"}, uri, metadata=metadata)
+    with sqlite3.connect(tmp_path / "results.db") as connection:
+        rows = connection.execute("SELECT * FROM results").fetchall()
+    connection.close()
+    assert rows == [("Harold", "Bills", "harold@example.com")]
+
+
+def test_load_missing_sqlite_results_is_empty(tmp_path: Path):
+    assert load_result_from_file(f"sqlite:///{tmp_path / 'missing.db'}") == {}
+
+
+def test_draw_command_sqlite_input_and_output(
+    roster_db: Path, temp_picks_txt_file: Path
+):
+    result = CliRunner().invoke(
+        draw_command,
+        [
+            "--entrants",
+            f"sqlite:///{roster_db}?table=staff&column=name",
+            "--picks",
+            temp_picks_txt_file,
+            "--quiet",
+            "--output-file",
+            f"sqlite:///{roster_db}?table=results",
+        ],
+    )
+    assert result.exit_code == 0, result.output
+    results = dict(iter_result_from_sqlite(f"sqlite:///{roster_db}?table=results"))
+    assert sorted(results) == ["Harold", "Jim", "Margaret"]
+
+
+def test_draw_command_missing_database_raises_error(
+    tmp_path: Path, temp_picks_txt_file: Path
+):
+    result = CliRunner().invoke(
+        draw_command,
+        [
+            "--entrants",
+            f"sqlite:///{tmp_path / 'missing.db'}?table=staff&column=name",
+            "--picks",
+            temp_picks_txt_file,
+        ],
+    )
+    assert result.exit_code == 2
+    assert "does not exist" in result.output
@@ -0,0 +1,109 @@
+import random
+from pathlib import Path
+
+import pytest
+
+from sweeper.draw import draw
+from sweeper.sweepstake import Sweepstake, iter_draw_rounds, remove_drawn
+
+
+ENTRANTS = ["Harold", "Jim", "Margaret", "John", "Tony"]
+PICKS = ["Bengals", "Bills", "Chiefs", "Dolphins", "Eagles", "Falcons"]
+
+
+@pytest.mark.parametrize("draw_order", ["entrants", "picks", "shuffle"])
+def test_sweepstake_draw_matches_draw(draw_order: str):
+    sweepstake = Sweepstake(ENTRANTS, PICKS, draw_order=draw_order)
+    expected = draw(
+        ENTRANTS,
+        PICKS,
+        draw_order=draw_order,
+        delay=0,
+        quiet=True,
+        rng=random.Random(11),
+    )
+    assert sweepstake.draw(seed=11).to_dict() == expected
+    assert list(sweepstake.draw(seed=11)) == list(expected.items())
+
+
+def test_sweepstake_draw_is_reproducible_from_recorded_seed():
+    sweepstake = Sweepstake(ENTRANTS, PICKS)
+    result = sweepstake.draw()
+    assert result.seed is not None
+    assert sweepstake.draw(seed=result.seed) == result
+    assert len(result) == len(ENTRANTS)
+
+
+def test_sweepstake_validates_once():
+    with pytest.raises(ValueError, match="Entrants must be unique"):
+        Sweepstake(["Jim", "Jim"], PICKS)
+    with pytest.raises(ValueError, match="not enough picks"):
+        Sweepstake(ENTRANTS, PICKS[:2])
+    with pytest.raises(ValueError, match="draw_order must be one of"):
+        Sweepstake(ENTRANTS, PICKS, draw_order="random")
+
+
+def test_sweepstake_does_not_print(capsys):
+    Sweepstake(ENTRANTS, PICKS).draw_many(3, seed=1)
+    assert capsys.readouterr().out == ""
+
+
+def test_sweepstake_draw_many_is_reproducible():
+    sweepstake = Sweepstake(ENTRANTS, PICKS, draw_order="shuffle")
+    results = sweepstake.draw_many(5, seed=3)
+    assert len(results) == 5
+    assert results == sweepstake.draw_many(5, seed=3)
+    assert len({tuple(result) for result in results}) > 1
+    for result in results:
+        assert sweepstake.draw(seed=result.seed) == result
+
+
+def test_sweepstake_iter_rounds_yields_indexes():
+    sweepstake = Sweepstake(ENTRANTS, PICKS)
+    rounds = list(sweepstake.iter_rounds(seed=5))
+    assert [entrant_index for entrant_index, _ in rounds] == list(range(len(ENTRANTS)))
+    pick_indexes = [pick_index for _, pick_index in rounds]
+    assert len(set(pick_indexes)) == len(ENTRANTS)
+    assert all(0 <= pick_index < len(PICKS) for pick_index in pick_indexes)
+
+
+def test_sweepstake_from_files(temp_entrants_txt_file: Path, temp_picks_txt_file: Path):
+    sweepstake = Sweepstake.from_files(temp_entrants_txt_file, temp_picks_txt_file)
+    assert sweepstake.entrants == ("Harold", "Jim", "Margaret")
+    assert sorted(sweepstake.draw(seed=1).to_dict().values()) == [
+        "Bengals",
+        "Bills",
+        "Chiefs",
+    ]
+
+
+def test_sweepstake_draw_algorithm_1_pops_from_the_pool():
+    # Draws committed before swap removal shifted the pool down on every round
+    rng = random.Random(11)
+    pool = list(PICKS)
+    expected = {
+        entrant: pool.pop(rng.randint(0, len(pool) - 1)) for entrant in ENTRANTS
+    }
+    sweepstake = Sweepstake(ENTRANTS, PICKS, draw_algorithm=1)
+    assert sweepstake.draw(seed=11).to_dict() == expected
+    with pytest.raises(ValueError, match="draw_algorithm must be 1 or 2"):
+        Sweepstake(ENTRANTS, PICKS, draw_algorithm=3)
+
+
+@pytest.mark.parametrize("draw_algorithm", [1, 2])
+@pytest.mark.parametrize("debug", [False, True])
+def test_remove_drawn_matches_draw_rounds(draw_algorithm: int, debug: bool):
+    pool = list(range(20))
+    rounds = iter_draw_rounds(
+        list(range(7)),
+        pool,
+        draw_order="entrants",
+        rng=random.Random(5),
+        debug=debug,
+        draw_algorithm=draw_algorithm,
+    )
+    drawn = [pick for _, _, pick in rounds]
+    replayed = list(range(20))
+    remove_drawn(replayed, drawn, draw_algorithm=draw_algorithm, debug=debug)
+    assert replayed == pool
+    assert sorted(pool + drawn) == list(range(20))
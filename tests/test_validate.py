@@ -0,0 +1,277 @@
+import random
+import threading
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+import sweeper.validate
+from sweeper.validate import (
+    DuplicateTracker,
+    SpillingDuplicateTracker,
+    find_duplicates,
+    load_validated_csv_columns,
+    load_validated_entries,
+    load_validated_inputs,
+    normalise_entries,
+    validate_command,
+)
+
+
+def test_normalise_entries_strips_and_skips_blanks():
+    entries = [(1, " Harold "), (2, ""), (3, "   "), (4, "Jim\t")]
+    assert list(normalise_entries(entries)) == [(1, "Harold"), (4, "Jim")]
+
+
+def test_find_duplicates_reports_line_numbers():
+    entries = enumerate(["Harold", "Jim", "Harold", "Margaret", "Harold"], start=1)
+    duplicates, count = find_duplicates(entries)
+    assert duplicates == {"Harold": [1, 3, 5]}
+    assert count == 1
+
+
+def test_find_duplicates_casefold():
+    entries = list(enumerate(["Harold", "harold", "Jim"], start=1))
+    assert find_duplicates(entries) == ({}, 0)
+    duplicates, count = find_duplicates(entries, casefold=True)
+    assert duplicates == {"harold": [1, 2]}
+    assert count == 1
+
+
+def test_find_duplicates_bounds_report():
+    entries = enumerate([f"entry{i % 5}" for i in range(20)], start=1)
+    duplicates, count = find_duplicates(entries, max_reported=2)
+    assert len(duplicates) == 2
+    assert count == 5
+
+
+def test_find_duplicates_collects_entries():
+    collected = []
+    find_duplicates(enumerate(["a", "b", "a"], start=1), collect=collected)
+    assert collected == ["a", "b", "a"]
+
+
+@pytest.mark.parametrize("max_memory", [10**9, 65536, 4096])
+def test_spilling_duplicate_tracker_matches_in_memory(max_memory: int, tmp_path: Path):
+    rng = random.Random(7)
+    entries = [f"ticket{rng.randrange(3000)}" for _ in range(2000)]
+    expected = DuplicateTracker(casefold=True)
+    spilling = SpillingDuplicateTracker(
+        max_memory, casefold=True, partitions=4, directory=tmp_path
+    )
+    for line_number, entry in enumerate(entries, start=1):
+        expected.add(line_number, entry)
+        spilling.add(line_number, entry)
+    spilling.finish()
+    assert spilling.count == expected.count
+    assert spilling.duplicates == expected.duplicates
+    # Spill files are removed once checked
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_spilling_duplicate_tracker_check(tmp_path: Path):
+    tracker = SpillingDuplicateTracker(1, directory=tmp_path)
+    for line_number, entry in enumerate(["Harold", "Jim", "Harold"], start=1):
+        tracker.add(line_number, entry)
+    with pytest.raises(ValueError, match="'Harold' on lines 1, 3"):
+        tracker.check("Entrants")
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_load_validated_entries_normalises(temp_txt_file: Path):
+    temp_txt_file.write_text(" Harold\n\nJim \nMargaret\n")
+    entries = load_validated_entries(temp_txt_file, None, label="Entrants")
+    assert entries == ["Harold", "Jim", "Margaret"]
+
+
+def test_load_validated_entries_duplicates_raise_error(temp_txt_file: Path):
+    temp_txt_file.write_text("Harold\n\nJim\nHarold\n")
+    with pytest.raises(ValueError, match="'Harold' on lines 1, 4"):
+        load_validated_entries(temp_txt_file, None, label="Entrants")
+
+
+def test_load_validated_entries_csv(temp_entrants_csv_file: Path):
+    entries = load_validated_entries(temp_entrants_csv_file, "name", label="Entrants")
+    assert entries == ["Harold", "Jim", "Margaret"]
+
+
+def test_load_validated_inputs_too_few_picks(temp_entrants_txt_file, temp_txt_file):
+    temp_txt_file.write_text("Bengals\n")
+    with pytest.raises(ValueError, match="not enough picks"):
+        load_validated_inputs(entrants=temp_entrants_txt_file, picks=temp_txt_file)
+
+
+def test_validate_command(temp_entrants_txt_file: Path, temp_picks_txt_file: Path):
+    runner = CliRunner()
+    result = runner.invoke(
+        validate_command,
+        ["--entrants", temp_entrants_txt_file, "--picks", temp_picks_txt_file],
+    )
+    assert result.exit_code == 0
+    assert "Validation passed: 3 entrants, 3 picks" in result.output
+
+
+def test_validate_command_reports_duplicates(
+    temp_entrants_txt_file: Path, temp_txt_file: Path
+):
+    temp_txt_file.write_text("Bengals\nbengals\nBills")
+    runner = CliRunner()
+    result = runner.invoke(
+        validate_command,
+        ["--entrants", temp_entrants_txt_file, "--picks", temp_txt_file, "--casefold"],
+    )
+    assert result.exit_code != 0
+    assert "'bengals' on lines 1, 2" in result.output
+
+
+def test_validate_command_with_cache(
+    tmp_path: Path, temp_entrants_txt_file: Path, temp_picks_txt_file: Path
+):
+    cache_dir = tmp_path / "cache"
+    args = [
+        "--entrants",
+        temp_entrants_txt_file,
+        "--picks",
+        temp_picks_txt_file,
+        "--cache-dir",
+        cache_dir,
+        "--cache-max-size",
+        "10M",
+    ]
+    runner = CliRunner()
+    for _ in range(2):
+        result = runner.invoke(validate_command, args)
+        assert result.exit_code == 0
+        assert "Validation passed: 3 entrants, 3 picks" in result.output
+    assert len(list(cache_dir.glob("*.col"))) == 2
+
+
+def test_load_validated_csv_columns(temp_csv_file: Path):
+    temp_csv_file.write_text(
+        "name,team,email\n"
+        "Harold,Bengals,harold@example.com\n"
+        " Jim ,,jim@example.com\n"
+        "Margaret,Bills,margaret@example.com\n"
+    )
+    entrants, picks, metadata = load_validated_csv_columns(
+        temp_csv_file,
+        entrants_column="name",
+        picks_column="1",
+        metadata_columns=["email"],
+    )
+    assert entrants == ["Harold", "Jim", "Margaret"]
+    assert picks == ["Bengals", "Bills"]
+    assert metadata.names == ["email"]
+    assert metadata.row("Jim") == {"email": "jim@example.com"}
+
+
+def test_load_validated_inputs_same_csv_file_is_read_once(mocker, temp_csv_file):
+    temp_csv_file.write_text("name,team\nHarold,Bengals\nJim,Bills\n")
+    spy = mocker.spy(sweeper.validate, "iter_csv_columns")
+    entrants, picks, metadata = load_validated_inputs(
+        entrants=temp_csv_file,
+        entrants_column="name",
+        picks=temp_csv_file,
+        picks_column="team",
+    )
+    assert entrants == ["Harold", "Jim"]
+    assert picks == ["Bengals", "Bills"]
+    assert metadata is None
+    assert spy.call_count == 1
+
+
+def test_load_validated_inputs_metadata_needs_csv(
+    temp_entrants_txt_file, temp_picks_txt_file
+):
+    with pytest.raises(ValueError, match="Metadata columns can only be read"):
+        load_validated_inputs(
+            entrants=temp_entrants_txt_file,
+            picks=temp_picks_txt_file,
+            metadata_columns=["email"],
+        )
+
+
+def test_load_validated_inputs_loads_files_concurrently(
+    mocker, temp_entrants_txt_file, temp_picks_txt_file
+):
+    # Each load waits for the other to start, so this only passes if they overlap
+    barrier = threading.Barrier(2, timeout=5)
+    load_entries = sweeper.validate.load_validated_entries
+
+    def wait_then_load(*args, **kwargs):
+        barrier.wait()
+        return load_entries(*args, **kwargs)
+
+    mocker.patch("sweeper.validate.load_validated_entries", wait_then_load)
+    entrants, picks, _ = load_validated_inputs(
+        entrants=temp_entrants_txt_file, picks=temp_picks_txt_file
+    )
+    assert entrants == ["Harold", "Jim", "Margaret"]
+    assert picks == ["Bengals", "Bills", "Chiefs"]
+
+
+def test_load_validated_inputs_propagates_errors(temp_entrants_txt_file, temp_txt_file):
+    temp_txt_file.write_text("Bills\nBills\nChiefs\nChiefs")
+    with pytest.raises(ValueError, match="Picks must be unique"):
+        load_validated_inputs(entrants=temp_entrants_txt_file, picks=temp_txt_file)
+
+
+def test_load_validated_inputs_reports_error_without_waiting(
+    mocker, temp_entrants_txt_file, temp_picks_txt_file
+):
+    # The entrants load only finishes once released, after the picks load failed
+    released, finished = threading.Event(), threading.Event()
+    load_entries = sweeper.validate.load_validated_entries
+
+    def load_or_fail(*args, label, **kwargs):
+        if label == "Picks":
+            raise ValueError("Picks must be unique")
+        released.wait(timeout=5)
+        finished.set()
+        return load_entries(*args, label=label, **kwargs)
+
+    mocker.patch("sweeper.validate.load_validated_entries", load_or_fail)
+    with pytest.raises(ValueError, match="Picks must be unique"):
+        load_validated_inputs(
+            entrants=temp_entrants_txt_file, picks=temp_picks_txt_file
+        )
+    assert not finished.is_set()
+    released.set()
+
+
+def test_load_validated_inputs_splits_max_memory_and_workers(
+    mocker, temp_entrants_txt_file, temp_picks_txt_file
+):
+    spy = mocker.spy(sweeper.validate, "load_validated_entries")
+    load_validated_inputs(
+        entrants=temp_entrants_txt_file, picks=temp_picks_txt_file, max_memory=1024
+    )
+    load_validated_inputs(
+        entrants=temp_entrants_txt_file,
+        picks=temp_picks_txt_file,
+        max_memory=1024,
+        workers=8,
+    )
+    assert [call.kwargs["max_memory"] for call in spy.call_args_list] == [512] * 4
+    assert [call.kwargs["workers"] for call in spy.call_args_list][2:] == [4, 4]
+
+
+def test_validate_command_with_max_memory(tmp_path: Path):
+    entrants = tmp_path / "entrants.txt"
+    entrants.write_text("\n".join(f"ticket{i}" for i in range(500)) + "\nticket7\n")
+    picks = tmp_path / "picks.txt"
+    picks.write_text("\n".join(f"prize{i}" for i in range(600)) + "\n")
+    runner = CliRunner()
+    result = runner.invoke(
+        validate_command,
+        ["--entrants", picks, "--picks", picks, "--max-memory", "1K"],
+    )
+    assert result.exit_code == 0, result.output
+    assert "Validation passed: 600 entrants, 600 picks" in result.output
+
+    result = runner.invoke(
+        validate_command,
+        ["--entrants", entrants, "--picks", picks, "--max-memory", "1K"],
+    )
+    assert result.exit_code != 0
+    assert "'ticket7' on lines 8, 501" in result.output